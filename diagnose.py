@@ -6,8 +6,14 @@ This module converts ranked match candidates into a final `Diagnosis`.
 
 from __future__ import annotations
 
+import logging
+from operator import attrgetter
+from typing import Any, Callable
+
+import numpy as np
+
 from logging_config import get_logger
-from models import Diagnosis, MatchCandidate, MismatchType, ReceiptData
+from models import LOW_CONFIDENCE_WARNING_TEMPLATE, Diagnosis, MatchCandidate, MismatchType, ReceiptData
 
 logger = get_logger(__name__)
 
@@ -50,6 +56,44 @@ DATE_CLOSE_THRESHOLD = 0
 # If you change this to 1, then 1-day differences won't trigger
 # SETTLEMENT_DELAY (they'll be considered "matching").
 
+# -- Rule bitmask --
+# Each archetype check sets one bit; the combined index selects the label
+# tuple directly, so labels are assembled in one lookup instead of appends.
+_VENDOR_MISMATCH_BIT = 0b100
+_SETTLEMENT_DELAY_BIT = 0b010
+_TIP_TAX_VARIANCE_BIT = 0b001
+
+_LABEL_DISPATCH: tuple[tuple[MismatchType, ...], ...] = tuple(
+    tuple(
+        label
+        for bit, label in (
+            (_VENDOR_MISMATCH_BIT, MismatchType.VENDOR_MISMATCH),
+            (_SETTLEMENT_DELAY_BIT, MismatchType.SETTLEMENT_DELAY),
+            (_TIP_TAX_VARIANCE_BIT, MismatchType.TIP_TAX_VARIANCE),
+        )
+        if rule_index & bit
+    )
+    for rule_index in range(8)
+)
+
+# -- Partial-match contributing factors --
+# (predicate, template) pairs checked in order when a candidate falls back to
+# PARTIAL_MATCH. Both read the same context dict built once per diagnosis.
+_PARTIAL_MATCH_FACTORS: tuple[tuple[Callable[[dict[str, Any]], bool], str], ...] = (
+    (
+        lambda ctx: VENDOR_MATCH_THRESHOLD <= ctx["vendor_score"] < 95.0,
+        "vendor similarity is moderate ({vendor_score:.1f}/100)",
+    ),
+    (
+        lambda ctx: ctx["amount_pct_diff"] > AMOUNT_CLOSE_THRESHOLD and ctx["amount_pct_diff"] > TIP_TAX_MAX_PCT,
+        "amount difference ({amount_pct_diff:.1f}%) exceeds the {tip_tax_max_pct}% tip/tax threshold",
+    ),
+    (
+        lambda ctx: ctx["date_diff"] > SETTLEMENT_MAX_DAYS and ctx["date_diff"] != 999,
+        "date gap ({date_diff} days) exceeds the {settlement_max_days}-day settlement window",
+    ),
+)
+
 
 def _safe_float(value: object, fallback: float = 0.0) -> float:
     """Safely coerce a value to float for defensive calculations."""
@@ -66,305 +110,446 @@ def _calibrate_confidence(
     labels: list[MismatchType],
 ) -> float:
     """Calibrate final confidence with extraction quality and ambiguity signals."""
+    # Checked per call (logging caches the answer and resets it on reconfiguration)
+    # so debug-only arguments are never built when DEBUG is off.
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     adjusted = _safe_float(match_confidence, 0.0)
 
     if receipt and receipt.is_low_confidence:
         extraction_penalty = (0.8 - receipt.confidence) * 30.0
         extraction_penalty = max(0.0, min(extraction_penalty, 15.0))
         adjusted -= extraction_penalty
-        logger.debug(
-            "confidence_calibration | factor=extraction_quality | penalty=%.1f | receipt_confidence=%.2f",
-            extraction_penalty,
-            receipt.confidence,
-        )
+        if debug_enabled:
+            logger.debug(
+                "confidence_calibration | factor=extraction_quality | penalty=%.1f | receipt_confidence=%.2f",
+                extraction_penalty,
+                receipt.confidence,
+            )
 
     if num_matches >= 3:
         adjusted -= 5.0
-        logger.debug("confidence_calibration | factor=ambiguity | num_matches=%s | penalty=5.0", num_matches)
+        if debug_enabled:
+            logger.debug("confidence_calibration | factor=ambiguity | num_matches=%s | penalty=5.0", num_matches)
     elif num_matches == 2:
         adjusted -= 2.0
-        logger.debug("confidence_calibration | factor=ambiguity | num_matches=%s | penalty=2.0", num_matches)
+        if debug_enabled:
+            logger.debug("confidence_calibration | factor=ambiguity | num_matches=%s | penalty=2.0", num_matches)
 
     if len(labels) >= 3:
         adjusted -= 3.0
-        logger.debug("confidence_calibration | factor=compound_complexity | labels=%s | penalty=3.0", len(labels))
+        if debug_enabled:
+            logger.debug("confidence_calibration | factor=compound_complexity | labels=%s | penalty=3.0", len(labels))
     elif len(labels) == 2:
         adjusted -= 1.0
-        logger.debug("confidence_calibration | factor=compound_complexity | labels=%s | penalty=1.0", len(labels))
+        if debug_enabled:
+            logger.debug("confidence_calibration | factor=compound_complexity | labels=%s | penalty=1.0", len(labels))
 
     if receipt is not None and not labels and adjusted >= 80.0:
         adjusted += 3.0
-        logger.debug("confidence_calibration | factor=clean_bonus | bonus=3.0")
+        if debug_enabled:
+            logger.debug("confidence_calibration | factor=clean_bonus | bonus=3.0")
 
     calibrated = max(0.0, min(100.0, round(adjusted, 1)))
-    logger.debug(
-        "confidence_calibration | raw=%.1f | calibrated=%.1f | num_matches=%s | labels=%s",
-        _safe_float(match_confidence, 0.0),
-        calibrated,
-        num_matches,
-        [label.value for label in labels],
-    )
+    if debug_enabled:
+        logger.debug(
+            "confidence_calibration | raw=%.1f | calibrated=%.1f | num_matches=%s | labels=%s",
+            _safe_float(match_confidence, 0.0),
+            calibrated,
+            num_matches,
+            [label.value for label in labels],
+        )
     return calibrated
 
 
+_GET_SIGNALS = attrgetter("vendor_score", "amount_pct_diff", "date_diff", "overall_confidence")
+
+
+def _candidates_to_soa(
+    matches: list[MatchCandidate],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split candidate signals into column arrays for vectorized rule checks.
+
+    Returns (vendor_score, amount_pct_diff, date_diff, overall_confidence).
+    Expects validated `MatchCandidate` objects; values are not coerced here.
+
+    Scores are stored as float32 and day gaps as int16. MatchCandidate rounds
+    scores to 1 decimal, so float32 keeps every value on the same side of the
+    integer thresholds. A day gap beyond int16 range raises OverflowError,
+    which `diagnose_batch` treats as "use the per-receipt path".
+    """
+    count = len(matches)
+    if not count:
+        empty = np.empty(0, dtype=np.float32)
+        return empty, empty, np.empty(0, dtype=np.int16), empty
+
+    vendor_scores, amount_pct_diffs, date_diffs, overall_confidences = zip(*map(_GET_SIGNALS, matches))
+    return (
+        np.fromiter(vendor_scores, dtype=np.float32, count=count),
+        np.fromiter(amount_pct_diffs, dtype=np.float32, count=count),
+        np.fromiter(date_diffs, dtype=np.int16, count=count),
+        np.fromiter(overall_confidences, dtype=np.float32, count=count),
+    )
+
+
 def diagnose(
     matches: list[MatchCandidate] | None,
     receipt: ReceiptData | None = None,
 ) -> Diagnosis:
     """Classify mismatch type based on match candidates."""
     try:
-        if matches is None:
-            matches = []
-
-        matches = [match for match in matches if match is not None]
-
-        # ==========================================================
-        # CASE 1: No matches found at all
-        # ==========================================================
-        if not matches:
-            logger.info("diagnosis_case | type=no_match | reason='no candidates available'")
-            evidence = [
-                "No transactions in the CSV scored above the 30% confidence threshold.",
-            ]
-            if receipt and receipt.date:
-                evidence.append(
-                    f"Receipt dated {receipt.date} - verify that transactions "
-                    f"from this date range are included in the CSV."
-                )
-            evidence.append(
-                "Possible causes: transaction not yet posted by the bank, "
-                "transaction in a different account, or receipt doesn't "
-                "belong to this transaction set."
+        return _diagnose(matches, receipt)
+    except Exception as exc:
+        return _failed_diagnosis(matches, receipt, exc)
+
+
+def diagnose_batch(
+    matches_list: list[list[MatchCandidate] | None],
+    receipts: list[ReceiptData | None] | None = None,
+) -> list[Diagnosis]:
+    """Diagnose many receipts at once.
+
+    The vendor/amount/date threshold checks for every top candidate are computed
+    in one vectorized pass; evidence and the final `Diagnosis` are still built per
+    receipt. Results are identical to calling `diagnose()` on each pair.
+    """
+    if receipts is None:
+        receipts = [None] * len(matches_list)
+    if len(receipts) != len(matches_list):
+        raise ValueError(
+            f"diagnose_batch needs one receipt per match list "
+            f"(got {len(matches_list)} match lists, {len(receipts)} receipts)"
+        )
+
+    cleaned = [[match for match in (matches or []) if match is not None] for matches in matches_list]
+    # Only validated candidates take the vectorized path; anything duck-typed
+    # goes through the per-receipt path and its defensive coercion.
+    scored_rows = [row for row, matches in enumerate(cleaned) if matches and isinstance(matches[0], MatchCandidate)]
+
+    signals: dict[int, tuple[bool, bool, bool]] = {}
+    if scored_rows:
+        try:
+            vendor_scores, amount_pct_diffs, date_diffs, _ = _candidates_to_soa(
+                [cleaned[row][0] for row in scored_rows]
             )
-            return Diagnosis(
-                labels=[MismatchType.NO_MATCH],
-                confidence=95.0,
-                evidence=evidence,
-                top_match=None,
-                receipt=receipt,
-                explanation="",
+        except Exception as exc:
+            # Malformed candidates fall back to the per-receipt path, which owns
+            # error handling and the safe NO_MATCH fallback.
+            logger.warning(
+                "diagnosis_batch_warning | error_type=%s | error=%s | fallback='per-receipt signals'",
+                type(exc).__name__,
+                exc,
             )
+        else:
+            vendor_mask = vendor_scores >= VENDOR_MATCH_THRESHOLD
+            amount_mask = amount_pct_diffs <= AMOUNT_CLOSE_THRESHOLD
+            date_mask = date_diffs == DATE_CLOSE_THRESHOLD
+            for position, row in enumerate(scored_rows):
+                signals[row] = (
+                    bool(vendor_mask[position]),
+                    bool(amount_mask[position]),
+                    bool(date_mask[position]),
+                )
 
-        top = matches[0]
-        if not hasattr(top, "vendor_score") or not hasattr(top, "overall_confidence"):
-            logger.error(
-                "diagnosis_input_error | reason='top candidate missing required fields' | fallback=no_match"
-            )
-            return Diagnosis(
-                labels=[MismatchType.NO_MATCH],
-                confidence=0.0,
-                evidence=["Internal error: match candidate has invalid structure."],
-                top_match=None,
-                receipt=receipt,
-                explanation="",
+    diagnoses: list[Diagnosis] = []
+    for row, (matches, receipt) in enumerate(zip(cleaned, receipts)):
+        try:
+            diagnoses.append(_diagnose(matches, receipt, signals.get(row)))
+        except Exception as exc:
+            diagnoses.append(_failed_diagnosis(matches, receipt, exc))
+    logger.info("diagnosis_batch_complete | receipts=%s | vectorized=%s", len(diagnoses), len(signals))
+    return diagnoses
+
+
+def _failed_diagnosis(
+    matches: list[MatchCandidate] | None,
+    receipt: ReceiptData | None,
+    exc: Exception,
+) -> Diagnosis:
+    """Safe NO_MATCH fallback returned when the diagnosis rules raise."""
+    logger.error(
+        "diagnosis_error | error_type=%s | error=%s | fallback=no_match",
+        type(exc).__name__,
+        exc,
+        exc_info=True,
+    )
+    top_match = next((match for match in (matches or []) if match is not None), None)
+    return Diagnosis(
+        labels=[MismatchType.NO_MATCH],
+        confidence=0.0,
+        evidence=[
+            f"Diagnosis failed due to {type(exc).__name__}: {exc}",
+            "Returning safe fallback diagnosis; review input data manually.",
+        ],
+        top_match=top_match,
+        receipt=receipt,
+        explanation="",
+    )
+
+
+def _diagnose(
+    matches: list[MatchCandidate] | None,
+    receipt: ReceiptData | None,
+    signals: tuple[bool, bool, bool] | None = None,
+) -> Diagnosis:
+    """Shared body of `diagnose` and `diagnose_batch`.
+
+    `signals` carries precomputed (vendor_matches, amount_matches, date_matches)
+    flags for the top candidate; when None they are computed here.
+
+    Exceptions propagate; the public callers wrap this once and turn any
+    failure into `_failed_diagnosis`.
+    """
+    if matches is None:
+        matches = []
+
+    matches = [match for match in matches if match is not None]
+
+    # ==========================================================
+    # CASE 1: No matches found at all
+    # ==========================================================
+    if not matches:
+        logger.info("diagnosis_case | type=no_match | reason='no candidates available'")
+        evidence = [
+            "No transactions in the CSV scored above the 30% confidence threshold.",
+        ]
+        if receipt and receipt.date:
+            evidence.append(
+                f"Receipt dated {receipt.date} - verify that transactions "
+                f"from this date range are included in the CSV."
             )
+        evidence.append(
+            "Possible causes: transaction not yet posted by the bank, "
+            "transaction in a different account, or receipt doesn't "
+            "belong to this transaction set."
+        )
+        return Diagnosis(
+            labels=[MismatchType.NO_MATCH],
+            confidence=95.0,
+            evidence=evidence,
+            top_match=None,
+            receipt=receipt,
+            explanation="",
+        )
 
-        labels: list[MismatchType] = []
-        diagnosis_evidence: list[str] = []
+    top = matches[0]
+    if not hasattr(top, "vendor_score") or not hasattr(top, "overall_confidence"):
+        logger.error(
+            "diagnosis_input_error | reason='top candidate missing required fields' | fallback=no_match"
+        )
+        return Diagnosis(
+            labels=[MismatchType.NO_MATCH],
+            confidence=0.0,
+            evidence=["Internal error: match candidate has invalid structure."],
+            top_match=None,
+            receipt=receipt,
+            explanation="",
+        )
 
-        vendor_matches = _safe_float(top.vendor_score) >= VENDOR_MATCH_THRESHOLD
-        amount_pct_diff = _safe_float(top.amount_pct_diff)
+    diagnosis_evidence: list[str] = []
+
+    # Coerce the candidate's numeric signals once; everything below reads locals.
+    vendor_score = _safe_float(top.vendor_score)
+    amount_diff = _safe_float(getattr(top, "amount_diff", 0.0))
+    amount_pct_diff = _safe_float(top.amount_pct_diff)
+    overall_confidence = _safe_float(top.overall_confidence)
+    date_diff = int(getattr(top, "date_diff", 999))
+    if signals is None:
+        vendor_matches = vendor_score >= VENDOR_MATCH_THRESHOLD
         amount_matches = amount_pct_diff <= AMOUNT_CLOSE_THRESHOLD
-        date_diff = int(getattr(top, "date_diff", 999))
         date_matches = date_diff == DATE_CLOSE_THRESHOLD
+    else:
+        vendor_matches, amount_matches, date_matches = signals
 
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug(
             "diagnosis_signals | vendor_matches=%s | vendor_score=%.1f | amount_matches=%s | amount_pct_diff=%.1f | date_matches=%s | date_diff=%s",
             vendor_matches,
-            _safe_float(top.vendor_score),
+            vendor_score,
             amount_matches,
             amount_pct_diff,
             date_matches,
             date_diff,
         )
 
-        # -- Check 1: VENDOR_MISMATCH --
-        if not vendor_matches:
-            labels.append(MismatchType.VENDOR_MISMATCH)
-            receipt_vendor = receipt.vendor if receipt else "unknown"
-            bank_merchant = top.transaction.merchant
+    rule_index = (
+        (not vendor_matches) << 2
+        | (not date_matches and 1 <= date_diff <= SETTLEMENT_MAX_DAYS) << 1
+        | (not amount_matches and amount_pct_diff <= TIP_TAX_MAX_PCT)
+    )
+    labels: list[MismatchType] = list(_LABEL_DISPATCH[rule_index])
+
+    # -- Check 1: VENDOR_MISMATCH --
+    if rule_index & _VENDOR_MISMATCH_BIT:
+        receipt_vendor = receipt.vendor if receipt else "unknown"
+        bank_merchant = top.transaction.merchant
+        diagnosis_evidence.append(
+            f"Vendor descriptor mismatch: names scored {vendor_score:.1f}/100 "
+            f"(threshold: {VENDOR_MATCH_THRESHOLD}). Receipt vendor '{receipt_vendor}' "
+            f"does not closely match bank descriptor '{bank_merchant}' - likely "
+            "abbreviated or coded by payment processor."
+        )
+        logger.info(
+            "diagnosis_rule_fired | rule=vendor_mismatch | vendor_score=%.1f | threshold=%s",
+            vendor_score,
+            VENDOR_MATCH_THRESHOLD,
+        )
+
+    # -- Check 2: SETTLEMENT_DELAY --
+    if rule_index & _SETTLEMENT_DELAY_BIT:
+        diagnosis_evidence.append(
+            f"Settlement delay: {date_diff} day(s) between receipt date and bank "
+            f"posting date. Credit card transactions typically settle in 1-{SETTLEMENT_MAX_DAYS} "
+            "business days, so this delay is within the normal range."
+        )
+        logger.info(
+            "diagnosis_rule_fired | rule=settlement_delay | date_diff=%s | threshold_max=%s",
+            date_diff,
+            SETTLEMENT_MAX_DAYS,
+        )
+
+    # -- Check 3: TIP_TAX_VARIANCE --
+    if rule_index & _TIP_TAX_VARIANCE_BIT:
+        base_evidence = (
+            f"Amount variance of ${amount_diff:.2f} ({amount_pct_diff:.1f}%) "
+            f"is within the {TIP_TAX_MAX_PCT}% threshold for tip/tax variance."
+        )
+        context_parts: list[str] = []
+
+        if receipt and receipt.has_tip and receipt.tip is not None:
+            context_parts.append(f"Receipt includes a ${receipt.tip:.2f} tip.")
+
+        if receipt and receipt.has_tax and receipt.tax is not None:
+            if abs(amount_diff - receipt.tax) < 1.0:
+                context_parts.append(
+                    f"Difference (${amount_diff:.2f}) is close to the receipt tax amount (${receipt.tax:.2f})."
+                )
+
+        if receipt is not None:
+            bank_amount = _safe_float(top.transaction.amount)
+            if bank_amount > receipt.total:
+                context_parts.append(
+                    "Bank charged more than receipt total - consistent with tip added after receipt was printed."
+                )
+            elif bank_amount < receipt.total:
+                context_parts.append(
+                    "Bank charged less than receipt total - possible discount, partial refund, or pre-tip authorization."
+                )
+
+        if context_parts:
+            diagnosis_evidence.append(base_evidence + " " + " ".join(context_parts))
+        else:
             diagnosis_evidence.append(
-                f"Vendor descriptor mismatch: names scored {top.vendor_score:.1f}/100 "
-                f"(threshold: {VENDOR_MATCH_THRESHOLD}). Receipt vendor '{receipt_vendor}' "
-                f"does not closely match bank descriptor '{bank_merchant}' - likely "
-                "abbreviated or coded by payment processor."
-            )
-            logger.info(
-                "diagnosis_rule_fired | rule=vendor_mismatch | vendor_score=%.1f | threshold=%s",
-                top.vendor_score,
-                VENDOR_MATCH_THRESHOLD,
+                base_evidence + " Consistent with tip, tax adjustment, or rounding difference."
             )
 
-        # -- Check 2: SETTLEMENT_DELAY --
-        if not date_matches and 1 <= date_diff <= SETTLEMENT_MAX_DAYS:
-            labels.append(MismatchType.SETTLEMENT_DELAY)
+        logger.info(
+            "diagnosis_rule_fired | rule=tip_tax_variance | amount_diff=%.2f | amount_pct_diff=%.1f | threshold_max=%s",
+            amount_diff,
+            amount_pct_diff,
+            TIP_TAX_MAX_PCT,
+        )
+
+    # ==========================================================
+    # POST-CHECK: Handle cases where no archetype triggered
+    # ==========================================================
+    if not labels:
+        if overall_confidence >= 80.0:
             diagnosis_evidence.append(
-                f"Settlement delay: {date_diff} day(s) between receipt date and bank "
-                f"posting date. Credit card transactions typically settle in 1-{SETTLEMENT_MAX_DAYS} "
-                "business days, so this delay is within the normal range."
+                "All signals align - vendor, amount, and date all match within thresholds. "
+                "This appears to be a clean match with no accounting exception."
             )
             logger.info(
-                "diagnosis_rule_fired | rule=settlement_delay | date_diff=%s | threshold_max=%s",
+                "diagnosis_case | type=clean_match | confidence=%.1f | vendor_score=%.1f | amount_pct_diff=%.1f | date_diff=%s",
+                overall_confidence,
+                vendor_score,
+                amount_pct_diff,
                 date_diff,
-                SETTLEMENT_MAX_DAYS,
             )
+        else:
+            labels.append(MismatchType.PARTIAL_MATCH)
+            factor_context = {
+                "vendor_score": vendor_score,
+                "amount_pct_diff": amount_pct_diff,
+                "date_diff": date_diff,
+                "tip_tax_max_pct": TIP_TAX_MAX_PCT,
+                "settlement_max_days": SETTLEMENT_MAX_DAYS,
+            }
+            contributing_factors = [
+                template.format_map(factor_context)
+                for applies, template in _PARTIAL_MATCH_FACTORS
+                if applies(factor_context)
+            ]
 
-        # -- Check 3: TIP_TAX_VARIANCE --
-        if not amount_matches and amount_pct_diff <= TIP_TAX_MAX_PCT:
-            labels.append(MismatchType.TIP_TAX_VARIANCE)
-            base_evidence = (
-                f"Amount variance of ${top.amount_diff:.2f} ({amount_pct_diff:.1f}%) "
-                f"is within the {TIP_TAX_MAX_PCT}% threshold for tip/tax variance."
-            )
-            context_parts: list[str] = []
-
-            if receipt and receipt.has_tip and receipt.tip is not None:
-                context_parts.append(f"Receipt includes a ${receipt.tip:.2f} tip.")
-
-            if receipt and receipt.has_tax and receipt.tax is not None:
-                if abs(_safe_float(top.amount_diff) - receipt.tax) < 1.0:
-                    context_parts.append(
-                        f"Difference (${top.amount_diff:.2f}) is close to the receipt tax amount (${receipt.tax:.2f})."
-                    )
-
-            if receipt is not None:
-                if _safe_float(top.transaction.amount) > receipt.total:
-                    context_parts.append(
-                        "Bank charged more than receipt total - consistent with tip added after receipt was printed."
-                    )
-                elif _safe_float(top.transaction.amount) < receipt.total:
-                    context_parts.append(
-                        "Bank charged less than receipt total - possible discount, partial refund, or pre-tip authorization."
-                    )
-
-            if context_parts:
-                diagnosis_evidence.append(base_evidence + " " + " ".join(context_parts))
+            if contributing_factors:
+                diagnosis_evidence.append(
+                    f"Partial match: overall confidence is {overall_confidence:.1f}% "
+                    f"(below 80% clean match threshold). Contributing factors: "
+                    f"{'; '.join(contributing_factors)}."
+                )
             else:
                 diagnosis_evidence.append(
-                    base_evidence + " Consistent with tip, tax adjustment, or rounding difference."
+                    f"Partial match: overall confidence is {overall_confidence:.1f}% "
+                    "(below 80% clean match threshold). Some signals align but the combined "
+                    "evidence is not strong enough for a confident diagnosis."
                 )
 
             logger.info(
-                "diagnosis_rule_fired | rule=tip_tax_variance | amount_diff=%.2f | amount_pct_diff=%.1f | threshold_max=%s",
-                _safe_float(top.amount_diff),
-                amount_pct_diff,
-                TIP_TAX_MAX_PCT,
+                "diagnosis_rule_fired | rule=partial_match | confidence=%.1f",
+                overall_confidence,
             )
 
-        # ==========================================================
-        # POST-CHECK: Handle cases where no archetype triggered
-        # ==========================================================
-        if not labels:
-            if _safe_float(top.overall_confidence) >= 80.0:
-                diagnosis_evidence.append(
-                    "All signals align - vendor, amount, and date all match within thresholds. "
-                    "This appears to be a clean match with no accounting exception."
-                )
-                logger.info(
-                    "diagnosis_case | type=clean_match | confidence=%.1f | vendor_score=%.1f | amount_pct_diff=%.1f | date_diff=%s",
-                    _safe_float(top.overall_confidence),
-                    _safe_float(top.vendor_score),
-                    amount_pct_diff,
-                    date_diff,
-                )
-            else:
-                labels.append(MismatchType.PARTIAL_MATCH)
-                contributing_factors: list[str] = []
-
-                if VENDOR_MATCH_THRESHOLD <= _safe_float(top.vendor_score) < 95.0:
-                    contributing_factors.append(
-                        f"vendor similarity is moderate ({top.vendor_score:.1f}/100)"
-                    )
-                if amount_pct_diff > AMOUNT_CLOSE_THRESHOLD and amount_pct_diff > TIP_TAX_MAX_PCT:
-                    contributing_factors.append(
-                        f"amount difference ({amount_pct_diff:.1f}%) exceeds the {TIP_TAX_MAX_PCT}% tip/tax threshold"
-                    )
-                if date_diff > SETTLEMENT_MAX_DAYS and date_diff != 999:
-                    contributing_factors.append(
-                        f"date gap ({date_diff} days) exceeds the {SETTLEMENT_MAX_DAYS}-day settlement window"
-                    )
-
-                if contributing_factors:
-                    diagnosis_evidence.append(
-                        f"Partial match: overall confidence is {top.overall_confidence:.1f}% "
-                        f"(below 80% clean match threshold). Contributing factors: "
-                        f"{'; '.join(contributing_factors)}."
-                    )
-                else:
-                    diagnosis_evidence.append(
-                        f"Partial match: overall confidence is {top.overall_confidence:.1f}% "
-                        "(below 80% clean match threshold). Some signals align but the combined "
-                        "evidence is not strong enough for a confident diagnosis."
-                    )
-
-                logger.info(
-                    "diagnosis_rule_fired | rule=partial_match | confidence=%.1f",
-                    _safe_float(top.overall_confidence),
-                )
+    # -- Extraction confidence warning --
+    low_confidence_warning = None
+    if receipt and receipt.is_low_confidence:
+        low_confidence_warning = LOW_CONFIDENCE_WARNING_TEMPLATE.format(confidence=receipt.confidence)
+        diagnosis_evidence.append(
+            f"WARNING: {low_confidence_warning}. "
+            "The receipt image may be blurry, damaged, or partially illegible. "
+            "Extracted values should be verified manually before acting on this diagnosis."
+        )
+        logger.warning(
+            "diagnosis_warning | type=low_extraction_confidence | confidence=%.0f%%",
+            receipt.confidence * 100.0,
+        )
 
-        # -- Extraction confidence warning --
-        if receipt and receipt.is_low_confidence:
+    # -- Multiple candidates notice --
+    has_close_runner_up = False
+    if len(matches) > 1:
+        runner_up = matches[1]
+        confidence_gap = overall_confidence - _safe_float(runner_up.overall_confidence)
+        if confidence_gap < 15.0:
+            has_close_runner_up = True
             diagnosis_evidence.append(
-                f"WARNING: Low extraction confidence ({receipt.confidence:.0%}). "
-                "The receipt image may be blurry, damaged, or partially illegible. "
-                "Extracted values should be verified manually before acting on this diagnosis."
-            )
-            logger.warning(
-                "diagnosis_warning | type=low_extraction_confidence | confidence=%.0f%%",
-                receipt.confidence * 100.0,
+                f"Note: A second candidate ('{runner_up.transaction.merchant}', "
+                f"${runner_up.transaction.amount:.2f}) scored {runner_up.overall_confidence:.1f}% - "
+                f"only {confidence_gap:.1f} points below the top match. Manual review recommended."
             )
 
-        # -- Multiple candidates notice --
-        if len(matches) > 1:
-            runner_up = matches[1]
-            confidence_gap = _safe_float(top.overall_confidence) - _safe_float(runner_up.overall_confidence)
-            if confidence_gap < 15.0:
-                diagnosis_evidence.append(
-                    f"Note: A second candidate ('{runner_up.transaction.merchant}', "
-                    f"${runner_up.transaction.amount:.2f}) scored {runner_up.overall_confidence:.1f}% - "
-                    f"only {confidence_gap:.1f} points below the top match. Manual review recommended."
-                )
-
-        complete_evidence = list(getattr(top, "evidence", []) or []) + diagnosis_evidence
-        calibrated_confidence = _calibrate_confidence(
-            _safe_float(top.overall_confidence),
-            receipt,
-            len(matches),
-            labels,
-        )
+    # top is a MatchCandidate here (Diagnosis validation rejects anything else),
+    # so its evidence is always a list.
+    complete_evidence = [*top.evidence, *diagnosis_evidence]
+    calibrated_confidence = _calibrate_confidence(
+        overall_confidence,
+        receipt,
+        len(matches),
+        labels,
+    )
 
-        diagnosis = Diagnosis(
-            labels=labels,
-            confidence=calibrated_confidence,
-            evidence=complete_evidence,
-            top_match=top,
-            receipt=receipt,
-            explanation="",
-        )
+    diagnosis = Diagnosis(
+        labels=labels,
+        confidence=calibrated_confidence,
+        evidence=complete_evidence,
+        top_match=top,
+        receipt=receipt,
+        explanation="",
+        has_close_runner_up=has_close_runner_up,
+    )
 
-        logger.info(
-            "diagnosis_complete | labels=%s | confidence=%.1f%% | evidence_count=%s | receipt_vendor=%r",
-            [label.value for label in labels],
-            diagnosis.confidence,
-            len(complete_evidence),
-            receipt.vendor if receipt else "unknown",
-        )
-        return diagnosis
-    except Exception as exc:
-        logger.error(
-            "diagnosis_error | error_type=%s | error=%s | fallback=no_match",
-            type(exc).__name__,
-            exc,
-            exc_info=True,
-        )
-        return Diagnosis(
-            labels=[MismatchType.NO_MATCH],
-            confidence=0.0,
-            evidence=[
-                f"Diagnosis failed due to {type(exc).__name__}: {exc}",
-                "Returning safe fallback diagnosis; review input data manually.",
-            ],
-            top_match=matches[0] if matches else None,
-            receipt=receipt,
-            explanation="",
-        )
+    logger.info(
+        "diagnosis_complete | labels=%s | confidence=%.1f%% | evidence_count=%s | receipt_vendor=%r",
+        diagnosis.label_values,
+        diagnosis.confidence,
+        len(complete_evidence),
+        receipt.vendor if receipt else "unknown",
+    )
+    return diagnosis
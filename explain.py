@@ -8,23 +8,38 @@ This module converts a structured `Diagnosis` object into:
 
 from __future__ import annotations
 
+from grounding import extract_grounding, grounding_coverage, has_grounding
 from logging_config import get_logger
-from models import Diagnosis, MismatchType
+from models import LABEL_NAMES, Diagnosis, MismatchType  # noqa: F401 - LABEL_NAMES re-exported
 
 logger = get_logger(__name__)
 
-LABEL_NAMES: dict[MismatchType, str] = {
-    MismatchType.VENDOR_MISMATCH: "Vendor Descriptor Mismatch",
-    MismatchType.SETTLEMENT_DELAY: "Settlement Delay",
-    MismatchType.TIP_TAX_VARIANCE: "Tip/Tax Variance",
-    MismatchType.PARTIAL_MATCH: "Partial Match",
-    MismatchType.NO_MATCH: "No Match Found",
-}
-
 OUTPUT_WIDTH = 56
 SEPARATOR = "=" * OUTPUT_WIDTH
 MAX_EVIDENCE_DISPLAY = 8
 
+# Layout of the text explanation. Optional sections (best match, grounding,
+# warnings) are pre-rendered blocks that carry their own leading blank line,
+# so the whole report is produced by one format_map call.
+_EXPLANATION_TEMPLATE = (
+    "\n" + SEPARATOR + "\n"
+    "  {header}\n"
+    + SEPARATOR + "\n"
+    "\n"
+    "{receipt_block}{match_block}\n"
+    "\n"
+    "  Evidence:\n"
+    "{evidence_block}{grounding_block}\n"
+    "\n"
+    "  Diagnosis: {diagnosis_line}{warning_block}\n"
+    "\n"
+    + SEPARATOR + "\n"
+)
+_RUNNER_UP_WARNING_BLOCK = (
+    "\n\n  WARNING: Multiple close candidates detected"
+    "\n    Runner-up candidate scored close to top match. Review manually."
+)
+
 
 def format_explanation(diagnosis: Diagnosis | None) -> str:
     """Format a Diagnosis into a clean, human-readable text block."""
@@ -40,70 +55,61 @@ def format_explanation(diagnosis: Diagnosis | None) -> str:
         )
 
     try:
-        diagnosis_labels = list(diagnosis.labels) if diagnosis.labels is not None else []
-        lines: list[str] = [""]
+        diagnosis_labels = diagnosis.labels or []
+        is_no_match = MismatchType.NO_MATCH in diagnosis_labels
+        is_clean = diagnosis.is_clean_match
+        confidence = diagnosis.confidence
 
-        if MismatchType.NO_MATCH in diagnosis_labels:
+        if is_no_match:
             header = "NO MATCH FOUND"
-        elif diagnosis.is_clean_match:
-            header = f"Match Found - {diagnosis.confidence:.0f}%"
+        elif is_clean:
+            header = f"Match Found - {confidence:.0f}%"
         else:
-            if diagnosis.confidence >= 80:
+            if confidence >= 80:
                 status = "Probable Match"
-            elif diagnosis.confidence >= 50:
+            elif confidence >= 50:
                 status = "Possible Match"
             else:
                 status = "Weak Match"
-            header = f"{status} - {diagnosis.confidence:.0f}%"
-
-        lines.append(SEPARATOR)
-        lines.append(f"  {header}")
-        lines.append(SEPARATOR)
+            header = f"{status} - {confidence:.0f}%"
 
-        lines.append("")
         if diagnosis.receipt:
-            lines.append(f"  Receipt:      {diagnosis.receipt.vendor}")
-            lines.append(
+            receipt_block = (
+                f"  Receipt:      {diagnosis.receipt.vendor}\n"
                 f"                ${diagnosis.receipt.total:.2f}  |  "
                 f"{diagnosis.receipt.date or 'date unknown'}"
             )
         else:
-            lines.append("  Receipt:      (no receipt data available)")
+            receipt_block = "  Receipt:      (no receipt data available)"
 
-        if diagnosis.top_match and MismatchType.NO_MATCH not in diagnosis_labels:
+        match_block = ""
+        if diagnosis.top_match and not is_no_match:
             tm = diagnosis.top_match
-            lines.append("")
-            lines.append(f"  Best Match:   {tm.transaction.merchant}")
-            lines.append(
+            match_block = (
+                f"\n\n  Best Match:   {tm.transaction.merchant}\n"
                 f"                ${tm.transaction.amount:.2f}  |  "
                 f"{tm.transaction.date or 'date unknown'}"
             )
 
-        lines.append("")
-        lines.append("  Evidence:")
-
-        evidence_items = list(diagnosis.evidence) if diagnosis.evidence else []
+        evidence_items = diagnosis.evidence or []
         if not evidence_items:
-            lines.append("    • (no evidence recorded)")
+            evidence_block = "    • (no evidence recorded)"
         elif len(evidence_items) <= MAX_EVIDENCE_DISPLAY:
-            for evidence in evidence_items:
-                lines.append(f"    • {evidence}")
+            evidence_block = "\n".join(f"    • {evidence}" for evidence in evidence_items)
         else:
-            for evidence in evidence_items[: MAX_EVIDENCE_DISPLAY - 1]:
-                lines.append(f"    • {evidence}")
             remaining = len(evidence_items) - (MAX_EVIDENCE_DISPLAY - 1)
-            lines.append(f"    • ... and {remaining} more evidence item(s)")
+            evidence_block = "\n".join(
+                f"    • {evidence}" for evidence in evidence_items[: MAX_EVIDENCE_DISPLAY - 1]
+            ) + f"\n    • ... and {remaining} more evidence item(s)"
 
+        grounding_block = ""
         if diagnosis.receipt:
             try:
-                from grounding import grounding_coverage, has_grounding
-
                 if has_grounding(diagnosis.receipt):
                     coverage = grounding_coverage(diagnosis.receipt)
                     if coverage > 0:
-                        lines.append("")
-                        lines.append(
-                            f"  Grounding: {coverage:.0%} of fields traced to receipt image"
+                        grounding_block = (
+                            f"\n\n  Grounding: {coverage:.0%} of fields traced to receipt image"
                         )
             except Exception as exc:
                 logger.debug(
@@ -111,32 +117,34 @@ def format_explanation(diagnosis: Diagnosis | None) -> str:
                     exc,
                 )
 
-        lines.append("")
-        if diagnosis.is_clean_match:
-            lines.append("  Diagnosis: Clean Match - No Exception")
+        if is_clean:
+            diagnosis_line = "Clean Match - No Exception"
         elif diagnosis_labels:
-            lines.append(f"  Diagnosis: {diagnosis.label_summary}")
+            diagnosis_line = diagnosis.label_summary
         else:
-            lines.append("  Diagnosis: Unclassified")
+            diagnosis_line = "Unclassified"
 
-        if diagnosis.receipt and diagnosis.receipt.is_low_confidence:
-            lines.append("")
-            lines.append(
-                f"  WARNING: Low extraction confidence ({diagnosis.receipt.confidence:.0%})"
+        warning_block = ""
+        if diagnosis.low_confidence_warning:
+            warning_block += (
+                f"\n\n  WARNING: {diagnosis.low_confidence_warning}"
+                "\n    Receipt may be blurry or damaged. Verify extracted values manually."
             )
-            lines.append(
-                "    Receipt may be blurry or damaged. Verify extracted values manually."
-            )
-
-        if any("second candidate" in evidence.lower() for evidence in evidence_items):
-            lines.append("")
-            lines.append("  WARNING: Multiple close candidates detected")
-            lines.append("    Runner-up candidate scored close to top match. Review manually.")
 
-        lines.append("")
-        lines.append(SEPARATOR)
-        lines.append("")
-        return "\n".join(lines)
+        if diagnosis.has_close_runner_up:
+            warning_block += _RUNNER_UP_WARNING_BLOCK
+
+        return _EXPLANATION_TEMPLATE.format_map(
+            {
+                "header": header,
+                "receipt_block": receipt_block,
+                "match_block": match_block,
+                "evidence_block": evidence_block,
+                "grounding_block": grounding_block,
+                "diagnosis_line": diagnosis_line,
+                "warning_block": warning_block,
+            }
+        )
     except Exception as exc:
         logger.error(
             "explain_format_error | error_type=%s | error=%s",
@@ -177,21 +185,22 @@ def format_explanation_json(diagnosis: Diagnosis | None) -> dict:
             "warnings": ["Diagnosis object was None"],
         }
 
-    diagnosis_labels = list(diagnosis.labels) if diagnosis.labels is not None else []
+    diagnosis_labels = diagnosis.labels or []
 
+    is_clean = diagnosis.is_clean_match
     if MismatchType.NO_MATCH in diagnosis_labels:
         status = "no_match"
-    elif diagnosis.is_clean_match:
+    elif is_clean:
         status = "clean_match"
     else:
         status = "match_found"
 
     diagnosis_section = {
-        "labels": [label.value for label in diagnosis_labels],
+        "labels": diagnosis.label_values,
         "label_names": diagnosis.label_names,
         "label_summary": diagnosis.label_summary,
         "is_compound": diagnosis.is_compound,
-        "is_clean_match": diagnosis.is_clean_match,
+        "is_clean_match": is_clean,
     }
 
     receipt_section = None
@@ -209,8 +218,6 @@ def format_explanation_json(diagnosis: Diagnosis | None) -> dict:
         }
 
         try:
-            from grounding import extract_grounding, grounding_coverage
-
             receipt_section["grounding_coverage"] = round(
                 grounding_coverage(diagnosis.receipt), 2
             )
@@ -234,20 +241,19 @@ def format_explanation_json(diagnosis: Diagnosis | None) -> dict:
             "transaction_id": diagnosis.top_match.transaction.transaction_id,
             "description": diagnosis.top_match.transaction.description,
             "scores": {
-                "vendor_score": round(diagnosis.top_match.vendor_score, 1),
-                "amount_diff": round(diagnosis.top_match.amount_diff, 2),
-                "amount_pct_diff": round(diagnosis.top_match.amount_pct_diff, 1),
+                # MatchCandidate quantizes these at construction.
+                "vendor_score": diagnosis.top_match.vendor_score,
+                "amount_diff": diagnosis.top_match.amount_diff,
+                "amount_pct_diff": diagnosis.top_match.amount_pct_diff,
                 "date_diff": diagnosis.top_match.date_diff,
-                "overall_confidence": round(diagnosis.top_match.overall_confidence, 1),
+                "overall_confidence": diagnosis.top_match.overall_confidence,
             },
             "evidence": list(diagnosis.top_match.evidence),
         }
 
     warnings: list[str] = []
-    if diagnosis.receipt and diagnosis.receipt.is_low_confidence:
-        warnings.append(
-            f"Low extraction confidence ({diagnosis.receipt.confidence:.0%}). Verify extracted values manually."
-        )
+    if diagnosis.low_confidence_warning:
+        warnings.append(f"{diagnosis.low_confidence_warning}. Verify extracted values manually.")
 
     return {
         "status": status,
@@ -20,23 +20,96 @@ Design notes:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
 import os
 import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Final, Iterator, Mapping, NamedTuple, Optional
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional; stdlib json produces the same bytes
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # optional; `_MOCK_PATTERN` regex scan is the fallback
+
 from logging_config import get_logger
 from models import ReceiptData
 
 logger = get_logger(__name__)
 
-try:
-    load_dotenv()
-except UnicodeDecodeError:
-    # Fallback for legacy Windows-encoded .env files.
-    load_dotenv(encoding="cp1252")
+
+class _Config(NamedTuple):
+    """Settings resolved from the environment and .env (see `load_config`)."""
+
+    # LandingAI key. Empty string means mock extraction.
+    api_key: str
+    # Worker threads for batch extraction (ADE_CONCURRENCY).
+    ade_concurrency: int
+    # Persistent ADE result cache directory (ADE_CACHE_DIR); "" means off.
+    ade_cache_dir: str
+    # RECON_TIERED_EXTRACT=1 runs a local Tesseract pass before ADE and skips
+    # the ADE call when that pass is confident. Needs the optional pytesseract
+    # and Pillow packages; without them every receipt goes straight to ADE.
+    tiered_extract: bool
+    # Persistent load_transactions cache directory (TRANSACTIONS_CACHE_DIR); "" means off.
+    transactions_cache_dir: str
+    # RECON_CACHE_DISABLE=1 bypasses the persistent caches even when configured.
+    cache_disabled: bool
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    try:
+        load_dotenv()
+    except UnicodeDecodeError:
+        # Fallback for legacy Windows-encoded .env files.
+        load_dotenv(encoding="cp1252")
+
+
+@lru_cache(maxsize=1)
+def load_config() -> _Config:
+    """Load .env on first use and return the cached settings.
+
+    Nothing is read at import; the first extraction (or an explicit call, as
+    in phase9_api startup) parses .env once per process. Every setting is read
+    here, after .env, so values from .env and the environment both apply.
+    """
+    _load_dotenv_once()
+    return _Config(
+        api_key=os.getenv("VISION_AGENT_API_KEY", "").strip(),
+        ade_concurrency=_env_int("ADE_CONCURRENCY", 8),
+        ade_cache_dir=os.getenv("ADE_CACHE_DIR", "").strip(),
+        tiered_extract=os.getenv("RECON_TIERED_EXTRACT", "").strip() == "1",
+        transactions_cache_dir=os.getenv("TRANSACTIONS_CACHE_DIR", "").strip(),
+        cache_disabled=os.getenv("RECON_CACHE_DISABLE", "").strip().lower() in {"1", "true", "yes", "on"},
+    )
+
+
+def reload_config() -> None:
+    """Re-read the settings from the environment.
+
+    They are cached on first use; call this after changing the environment
+    (tests toggle the API key to force mock extraction). .env is not parsed
+    again. The extraction pool keeps the size it started with.
+    """
+    load_config.cache_clear()
+
 
 # -- Configuration --
 
@@ -49,16 +122,144 @@ MIN_CONFIDENCE_THRESHOLD = 0.8
 # Maximum file size (bytes) before warning
 MAX_FILE_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
 
+# Vendor values that mean extraction did not find a usable vendor name
+# (compared after strip().upper()).
+_BAD_VENDOR_SENTINELS = frozenset({"", "UNKNOWN", "EXTRACTION_FAILED", "EXTRACTION_ERROR"})
+
+# Characters of parsed markdown kept in ReceiptData.raw_text
+RAW_TEXT_PREVIEW_CHARS = 1000
+
+# Parsed markdown larger than this (characters) is logged as unusually large
+LARGE_MARKDOWN_WARNING_CHARS = 64 * 1024
+
+# Buffer size for local reads of receipt files (hashing, OCR)
+_READ_BUFFER_BYTES = 1 << 20
+
 # Supported image formats
 SUPPORTED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".pdf", ".tiff", ".tif", ".bmp", ".webp"}
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw.strip()))
+    except ValueError:
+        logger.warning("env_int_parse_warning | key=%s | value=%s | fallback=%s", name, raw, default)
+        return default
+
+
+# Shared pool for batch extraction, created on first use with
+# `load_config().ade_concurrency` workers. ADE calls are network-bound, so
+# threads overlap the round-trips.
+_EXTRACT_POOL: Optional[ThreadPoolExecutor] = None
+_EXTRACT_POOL_LOCK = threading.Lock()
+
+# Directory for the persistent ADE result cache, set by --cache-dir. None
+# defers to ADE_CACHE_DIR from the environment/.env; "" turns the cache off,
+# which is the default. Entries are keyed on file content + ADE model +
+# schema, so an identical receipt is never sent to ADE twice.
+ADE_CACHE_DIR: Optional[str] = None
+
+# Receipts kept by the in-process result cache used by `extract_receipt`.
+# Entries are keyed on resolved path + mtime + size, so an edited file is
+# re-extracted.
+MEMORY_CACHE_SIZE = 256
+
+_MEMORY_CACHE: OrderedDict[tuple, ReceiptData] = OrderedDict()
+_MEMORY_CACHE_LOCK = threading.Lock()
+
+# Minimum local OCR confidence accepted without escalating to ADE
+CHEAP_CONFIDENCE_THRESHOLD = 0.9
+
+# Extraction schema sent to ADE. ADE uses field descriptions as extraction
+# guidance - rich, explicit descriptions improve field selection. Read-only:
+# the cache key hash below is computed from it once at import.
+_RECEIPT_SCHEMA: Final[Mapping[str, Any]] = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "vendor": {
+            "type": "string",
+            "description": (
+                "The vendor, merchant, or store name as printed on the "
+                "receipt, usually at the top in large text. This is the "
+                "business name, not the address or phone number. "
+                "Examples: 'Starbucks', 'The Home Depot', 'El Agave Mexican Restaurant'. "
+                "If multiple names appear (e.g., a franchise name and parent company), "
+                "use the most prominent one."
+            ),
+        },
+        "total": {
+            "type": "number",
+            "description": (
+                "The final total amount paid, including tax and tip. "
+                "Look for labels like 'Total', 'Grand Total', 'Amount Due', "
+                "'Balance Due', or 'Total Charged'. This is typically the "
+                "largest dollar amount on the receipt and appears near the bottom. "
+                "If multiple totals appear, use the one labeled 'Total' or "
+                "the largest amount. Include cents (e.g., 47.50 not 47)."
+            ),
+        },
+        "date": {
+            "type": "string",
+            "description": (
+                "The transaction date as printed on the receipt. May appear "
+                "in various formats: '01/15/2026', 'Jan 15, 2026', "
+                "'2026-01-15', '1/15/26'. Usually near the top or bottom "
+                "of the receipt. Return exactly as printed - do not reformat. "
+                "If both a date and time appear, return only the date portion."
+            ),
+        },
+        "tax": {
+            "type": "number",
+            "description": (
+                "Tax amount if listed as a separate line item. "
+                "Look for labels like 'Tax', 'Sales Tax', 'VAT', 'HST', 'GST'. "
+                "Return the dollar amount, not the percentage. "
+                "Return null if tax is not listed separately."
+            ),
+        },
+        "tip": {
+            "type": "number",
+            "description": (
+                "Tip or gratuity amount if present on the receipt. "
+                "Look for labels like 'Tip', 'Gratuity', 'Service Charge'. "
+                "Common on restaurant receipts. May be handwritten. "
+                "Return null if no tip is listed or if the tip line is blank."
+            ),
+        },
+        "subtotal": {
+            "type": "number",
+            "description": (
+                "Subtotal before tax and tip, if listed separately. "
+                "Look for labels like 'Subtotal', 'Sub-total', 'Items Total'. "
+                "This is typically smaller than the total. "
+                "Return null if not listed separately."
+            ),
+        },
+    },
+    "required": ["vendor", "total"],
+})
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Compact, key-sorted JSON bytes; identical with or without orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+_RECEIPT_SCHEMA_HASH: Final[str] = hashlib.sha256(_json_dumps(dict(_RECEIPT_SCHEMA))).hexdigest()
+
+
 def extract_receipt(image_path: str) -> ReceiptData:
     """Extract structured data from a receipt image.
 
-    This is the ONLY public function in this module. The rest of the
-    pipeline calls this function and receives a ReceiptData object.
-    It never needs to know which extraction engine was used.
+    This is the main public function in this module (`extract_receipts_async`
+    is its batch counterpart). The rest of the pipeline calls this function
+    and receives a ReceiptData object. It never needs to know which
+    extraction engine was used.
 
     Extraction paths:
         1. ADE (when VISION_AGENT_API_KEY is set in .env):
@@ -66,6 +267,9 @@ def extract_receipt(image_path: str) -> ReceiptData:
            the receipt image and extract vendor, total, date, tax, tip.
            Provides visual grounding via chunk_ids.
 
+           With RECON_TIERED_EXTRACT=1, a local Tesseract pass runs first
+           and ADE is only called when that pass is not confident.
+
         2. Mock (when no API key):
            Returns hardcoded test data based on the receipt filename.
            Designed for development and testing. The mock data exactly
@@ -115,25 +319,90 @@ def extract_receipt(image_path: str) -> ReceiptData:
         >>> receipt.is_low_confidence
         True
     """
+    return _extract_receipt_cached(image_path)
+
+
+def _extract_receipt_cached(image_path: str, prefetched: Optional[ReceiptData] = None) -> ReceiptData:
+    """Run `_extract_receipt` behind the in-process result cache.
+
+    Shared by `extract_receipt` and the batch paths, so a receipt extracted
+    once is served from memory whichever entry point sees it next.
+    """
+    key = _memory_cache_key(image_path)
+    if key is None:
+        return _extract_receipt(image_path, prefetched)
+
+    with _MEMORY_CACHE_LOCK:
+        cached = _MEMORY_CACHE.get(key)
+        if cached is not None:
+            _MEMORY_CACHE.move_to_end(key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    result = _extract_receipt(image_path, prefetched)
+    if result.vendor not in ("EXTRACTION_ERROR", "EXTRACTION_FAILED"):
+        with _MEMORY_CACHE_LOCK:
+            _MEMORY_CACHE[key] = result.model_copy(deep=True)
+            if len(_MEMORY_CACHE) > MEMORY_CACHE_SIZE:
+                _MEMORY_CACHE.popitem(last=False)
+    return result
+
+
+def _memory_cache_key(image_path: str) -> Optional[tuple]:
+    """Key for the in-process result cache, or None to bypass it.
+
+    Bad paths bypass the cache so `_extract_receipt` reports them as usual.
+    The extraction mode is part of the key because tests toggle the API key.
+    """
+    if image_path is None:
+        return None
     try:
-        # -- Input validation (Phase 8 hardening) --
-        if image_path is None:
-            raise ValueError("image_path cannot be None")
-
-        image_path = str(image_path).strip()
-        if not image_path:
-            raise ValueError("image_path cannot be empty")
-
-        path = Path(image_path)
-        if not path.is_absolute():
-            path = Path.cwd() / path
-
-        if not path.exists():
-            raise FileNotFoundError(
-                f"Receipt image not found: {image_path}\n"
-                f"Resolved path: {path}\n"
-                f"Current directory: {Path.cwd()}"
-            )
+        path = Path(str(image_path).strip()).resolve()
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+    config = load_config()
+    return (str(path), stat.st_mtime_ns, stat.st_size, bool(config.api_key), config.tiered_extract)
+
+
+def _resolve_receipt_path(image_path: str) -> tuple[str, Path, os.stat_result]:
+    """Validate `image_path` and return (cleaned path string, absolute Path, stat).
+
+    The stat result is the only filesystem call made here, so callers reuse
+    it for size checks. Raises ValueError for a None/empty path and
+    FileNotFoundError when the file does not exist (Phase 8 hardening).
+    """
+    if image_path is None:
+        raise ValueError("image_path cannot be None")
+
+    image_path = str(image_path).strip()
+    if not image_path:
+        raise ValueError("image_path cannot be empty")
+
+    path = Path(image_path)
+    if not path.is_absolute():
+        path = Path.cwd() / path
+
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(
+            f"Receipt image not found: {image_path}\n"
+            f"Resolved path: {path}\n"
+            f"Current directory: {Path.cwd()}"
+        ) from None
+    return image_path, path, stat
+
+
+def _extract_receipt(image_path: str, prefetched: Optional[ReceiptData] = None) -> ReceiptData:
+    """Body of `extract_receipt`.
+
+    `prefetched` is an ADE result already obtained by a batch parse (see
+    `_prefetch_ade_batch`); it replaces the per-file ADE call but still goes
+    through validation, caching and the post-extraction checks.
+    """
+    try:
+        image_path, path, stat = _resolve_receipt_path(image_path)
 
         if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
             logger.warning(
@@ -143,7 +412,7 @@ def extract_receipt(image_path: str) -> ReceiptData:
                 ", ".join(sorted(SUPPORTED_EXTENSIONS)),
             )
 
-        file_size = path.stat().st_size
+        file_size = stat.st_size
         if file_size == 0:
             raise ValueError(f"Receipt image is empty (0 bytes): {image_path}")
 
@@ -154,14 +423,20 @@ def extract_receipt(image_path: str) -> ReceiptData:
                 image_path,
             )
 
-        api_key = os.getenv("VISION_AGENT_API_KEY", "").strip()
-        if api_key:
+        config = load_config()
+        api_key = config.api_key
+        mode = "ade" if api_key else "mock"
+        cheap = _extract_cheap(path) if api_key and config.tiered_extract and prefetched is None else None
+        if cheap is not None:
+            mode = "cheap"
+            result = cheap
+        elif api_key:
             logger.info(
                 "extract_start | mode=ade | file=%s | path=%s",
                 path.name,
                 str(path),
             )
-            result = _extract_with_ade(str(path), api_key)
+            result = _extract_with_ade_cached(path, api_key, prefetched)
             if result.confidence < 0.5:
                 logger.warning(
                     "extract_low_confidence | mode=ade | file=%s | confidence=%.0f%% | fallback=continue",
@@ -178,7 +453,7 @@ def extract_receipt(image_path: str) -> ReceiptData:
             )
             result = _extract_mock(str(path))
 
-        if not result.vendor or result.vendor in ("", "UNKNOWN", "EXTRACTION_FAILED"):
+        if not result.vendor or result.vendor in _BAD_VENDOR_SENTINELS:
             logger.warning(
                 "extract_vendor_warning | file=%s | vendor=%r | fallback=continue",
                 path.name, 
@@ -202,7 +477,7 @@ def extract_receipt(image_path: str) -> ReceiptData:
             result.total,
             result.date,
             result.confidence * 100.0,
-            "ade" if api_key else "mock",
+            mode,
             path.name,
         )
         return result
@@ -244,6 +519,403 @@ def extract_receipt(image_path: str) -> ReceiptData:
         )
 
 
+async def extract_receipts_async(image_paths: list[str]) -> list[ReceiptData | BaseException]:
+    """Extract many receipts concurrently.
+
+    Each path runs through `extract_receipt` on a shared thread pool capped at
+    ADE_CONCURRENCY workers (default 8), so a batch of N receipts costs
+    roughly ceil(N / ADE_CONCURRENCY) ADE round-trips of wall time instead of N.
+
+    When the installed ADE SDK exposes a multi-document parse call, the
+    uncached receipts are parsed in one request first, and each per-file
+    worker only runs the remaining extract step.
+
+    Results are returned in input order. Exceptions that `extract_receipt`
+    propagates (FileNotFoundError, ImportError) are returned in place of the
+    receipt rather than aborting the whole batch.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _extract_pool()
+    prefetched: dict[str, ReceiptData] = {}
+    api_key = load_config().api_key
+    if _use_batch_prefetch(api_key, image_paths):
+        prefetched = await loop.run_in_executor(pool, _prefetch_ade_batch, image_paths, api_key)
+
+    return await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _extract_receipt_cached, image_path, prefetched.get(image_path))
+            for image_path in image_paths
+        ),
+        return_exceptions=True,
+    )
+
+
+def iter_extract_receipts(image_paths: list[str]) -> Iterator[ReceiptData | BaseException]:
+    """Extract many receipts on the shared pool and yield them in input order.
+
+    The streaming counterpart of `extract_receipts_async` for synchronous
+    callers: every path is submitted up front, and each result is yielded as
+    soon as it and all earlier ones are ready, so the caller can process
+    receipt i while receipts i+1.. are still being extracted. Exceptions are
+    yielded in place of the receipt, as in `extract_receipts_async`.
+    """
+    api_key = load_config().api_key
+    prefetched = _prefetch_ade_batch(image_paths, api_key) if _use_batch_prefetch(api_key, image_paths) else {}
+    pool = _extract_pool()
+    futures = [
+        pool.submit(_extract_receipt_cached, image_path, prefetched.get(image_path))
+        for image_path in image_paths
+    ]
+    try:
+        for future in futures:
+            try:
+                yield future.result()
+            except Exception as exc:
+                yield exc
+    finally:
+        # A caller that stops early should not leave queued extractions behind.
+        for future in futures:
+            future.cancel()
+
+
+def _use_batch_prefetch(api_key: Optional[str], image_paths: list[str]) -> bool:
+    """Whether a batch should start with one multi-document ADE parse.
+
+    Tiered mode decides per receipt whether ADE is needed at all, so the
+    batch parse (which would send every receipt to ADE) is skipped.
+    """
+    return bool(api_key) and not load_config().tiered_extract and len(image_paths) > 1
+
+
+def _extract_pool() -> ThreadPoolExecutor:
+    """Return the shared extraction pool, creating it on first use."""
+    global _EXTRACT_POOL
+    with _EXTRACT_POOL_LOCK:
+        if _EXTRACT_POOL is None:
+            _EXTRACT_POOL = ThreadPoolExecutor(
+                max_workers=load_config().ade_concurrency,
+                thread_name_prefix="recon-extract",
+            )
+        return _EXTRACT_POOL
+
+
+def _ade_cache_dir() -> str:
+    """Active ADE cache directory: the --cache-dir override, else the config."""
+    return ADE_CACHE_DIR if ADE_CACHE_DIR is not None else load_config().ade_cache_dir
+
+
+def _prefetch_ade_batch(image_paths: list[str], api_key: str) -> dict[str, ReceiptData]:
+    """Parse every valid, uncached receipt in one ADE batch call.
+
+    Returns {input path: ReceiptData}. Returns an empty dict when the SDK has
+    no batch call, when fewer than two receipts need ADE, or when the batch
+    call fails. In all of those cases each receipt falls back to the regular
+    per-file path, which also reports invalid paths.
+    """
+    to_parse: dict[str, Path] = {}
+    for image_path in image_paths:
+        try:
+            _, path, _ = _resolve_receipt_path(image_path)
+        except (ValueError, FileNotFoundError):
+            continue
+        memory_key = _memory_cache_key(image_path)
+        if memory_key is not None:
+            with _MEMORY_CACHE_LOCK:
+                if memory_key in _MEMORY_CACHE:
+                    continue
+        cache_dir = _ade_cache_dir()
+        cache_key = _ade_cache_key(path) if cache_dir else None
+        if cache_key and (Path(cache_dir) / f"{cache_key}.json").exists():
+            continue
+        to_parse[image_path] = path
+
+    if len(to_parse) < 2:
+        return {}
+    receipts = _extract_with_ade_batch([str(path) for path in to_parse.values()], api_key)
+    if receipts is None:
+        return {}
+    return dict(zip(to_parse, receipts))
+
+
+_CHEAP_TOTAL_PATTERN = re.compile(
+    r"\b(?:grand\s+total|total|amount\s+due|balance\s+due)\b[^0-9\n]*?\$?\s*(\d[\d,]*\.\d{2})",
+    re.IGNORECASE,
+)
+_CHEAP_DATE_PATTERN = re.compile(r"\b(\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2})\b")
+
+
+def _extract_cheap(path: Path) -> Optional[ReceiptData]:
+    """Local Tesseract pass used by tiered extraction (RECON_TIERED_EXTRACT=1).
+
+    Returns a ReceiptData only when the result is good enough to skip ADE:
+    confidence >= CHEAP_CONFIDENCE_THRESHOLD, a usable vendor and a non-zero
+    total. Returns None otherwise, including when pytesseract/Pillow are not
+    installed or OCR fails, so the caller escalates to ADE.
+    """
+    if path.suffix.lower() == ".pdf":
+        return None
+    try:
+        import pytesseract
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with _open_buffered(path) as handle, Image.open(handle) as image:
+            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+    except Exception as exc:
+        logger.warning(
+            "cheap_extract_error | file=%s | error_type=%s | error=%s | fallback=ade",
+            path.name,
+            type(exc).__name__,
+            exc,
+        )
+        return None
+
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    confidences: list[float] = []
+    for text, conf, block, par, line in zip(
+        data["text"], data["conf"], data["block_num"], data["par_num"], data["line_num"]
+    ):
+        word = str(text).strip()
+        conf_value = _safe_float(conf)
+        if not word or conf_value is None or conf_value < 0:
+            continue
+        lines.setdefault((block, par, line), []).append(word)
+        confidences.append(conf_value)
+    if not confidences:
+        return None
+
+    result = _parse_cheap_text(
+        [" ".join(words) for words in lines.values()],
+        sum(confidences) / len(confidences) / 100.0,
+    )
+    if (
+        result.confidence < CHEAP_CONFIDENCE_THRESHOLD
+        or result.vendor.strip().upper() in _BAD_VENDOR_SENTINELS
+        or result.total <= 0
+    ):
+        logger.info(
+            "cheap_extract_escalate | file=%s | confidence=%.0f%% | vendor=%r | total=%.2f",
+            path.name,
+            result.confidence * 100.0,
+            result.vendor,
+            result.total,
+        )
+        return None
+    return result
+
+
+def _parse_cheap_text(lines: list[str], confidence: float) -> ReceiptData:
+    """Pull vendor, total and date out of OCR text lines.
+
+    Vendor is the first line containing letters (the store name usually tops
+    the receipt); total is the last labelled total, so "Total" after
+    "Subtotal"/"Tax" wins.
+    """
+    vendor = next((line for line in lines if any(ch.isalpha() for ch in line)), "UNKNOWN")
+    text = "\n".join(lines)
+
+    total = 0.0
+    for match in _CHEAP_TOTAL_PATTERN.finditer(text):
+        total = _safe_float(match.group(1).replace(",", "")) or 0.0
+
+    date_match = _CHEAP_DATE_PATTERN.search(text)
+    return ReceiptData(
+        vendor=vendor,
+        total=total,
+        date=date_match.group(1) if date_match else None,
+        confidence=max(0.0, min(1.0, confidence)),
+        raw_text=text[:RAW_TEXT_PREVIEW_CHARS],
+    )
+
+
+def _extract_with_ade_cached(path: Path, api_key: str, prefetched: Optional[ReceiptData] = None) -> ReceiptData:
+    """Run `_extract_with_ade` behind the persistent content-addressed cache.
+
+    `prefetched` (from a batch parse) stands in for the ADE call on a miss.
+
+    Failed extractions are never cached, so a transient ADE outage does not
+    pin a receipt to `EXTRACTION_FAILED`. Cache I/O problems are logged and
+    treated as a miss; they never fail the extraction.
+    """
+    cache_key = _ade_cache_key(path) if _ade_cache_dir() else None
+    if cache_key:
+        cached = _load_cached_extraction(cache_key)
+        if cached is not None:
+            logger.info("ade_cache_hit | file=%s | key=%s", path.name, cache_key[:12])
+            return cached
+
+    result = prefetched if prefetched is not None else _extract_with_ade(str(path), api_key)
+    if cache_key and result.vendor != "EXTRACTION_FAILED":
+        _store_cached_extraction(cache_key, result)
+    return result
+
+
+def _open_buffered(path: Path) -> BinaryIO:
+    """Open a receipt for local inspection with a large read buffer.
+
+    Use this instead of `path.read_bytes()` so concurrent extractions of
+    20 MB files never hold whole files in memory.
+    """
+    return path.open("rb", buffering=_READ_BUFFER_BYTES)
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file, streamed without loading it into memory.
+
+    Content hash behind the ADE and transactions-CSV cache keys. Receipts can
+    be up to MAX_FILE_SIZE_BYTES, so the working set stays at one read buffer.
+    `hashlib.file_digest` (3.11+) reads an unbuffered handle straight into its
+    own buffer and releases the GIL while hashing.
+    """
+    if hasattr(hashlib, "file_digest"):
+        with path.open("rb", buffering=0) as handle:
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+
+    digest = hashlib.sha256()
+    with _open_buffered(path) as handle:
+        for block in iter(lambda: handle.read(_READ_BUFFER_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _ade_cache_key(path: Path) -> Optional[str]:
+    """Build the cache key: sha256(file bytes) + ADE model + schema hash."""
+    try:
+        file_hash = file_sha256(path)
+    except OSError as exc:
+        logger.warning("ade_cache_key_warning | file=%s | error=%s | fallback='no cache'", path.name, exc)
+        return None
+    return hashlib.sha256(f"{file_hash}|{ADE_MODEL}|{_RECEIPT_SCHEMA_HASH}".encode("utf-8")).hexdigest()
+
+
+def _load_cached_extraction(cache_key: str) -> Optional[ReceiptData]:
+    """Return the cached `ReceiptData` for `cache_key`, or None on a miss."""
+    cache_file = Path(_ade_cache_dir()) / f"{cache_key}.json"
+    try:
+        return ReceiptData.model_validate_json(cache_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning(
+            "ade_cache_read_warning | key=%s | error_type=%s | error=%s | fallback='cache miss'",
+            cache_key[:12],
+            type(exc).__name__,
+            exc,
+        )
+        return None
+
+
+def _store_cached_extraction(cache_key: str, receipt: ReceiptData) -> None:
+    """Atomically write `receipt` to the cache via temp-file + replace."""
+    cache_dir = Path(_ade_cache_dir())
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            dir=str(cache_dir),
+            delete=False,
+            prefix=f"{cache_key[:12]}-",
+            suffix=".tmp",
+        ) as tmp_file:
+            tmp_file.write(receipt.model_dump_json())
+            tmp_path = Path(tmp_file.name)
+        os.replace(tmp_path, cache_dir / f"{cache_key}.json")
+    except OSError as exc:
+        logger.warning(
+            "ade_cache_write_warning | key=%s | error=%s | fallback='not cached'",
+            cache_key[:12],
+            exc,
+        )
+
+
+class _ADEBackend(NamedTuple):
+    """Resolved ADE SDK entry points (see `_get_ade_backend`)."""
+
+    # vision_agent.tools.agentic_document_extraction, or None on FrameSet installs.
+    module: Any
+    # landingai FrameSet class, or None when `module` is available.
+    frame_set_cls: Any
+    # Module-level callables; None when the module is missing or lacks them.
+    parse_fn: Optional[Callable[..., Any]]
+    extract_fn: Optional[Callable[..., Any]]
+    batch_parse_fn: Optional[Callable[..., Any]]
+
+
+@lru_cache(maxsize=1)
+def _get_ade_backend() -> _ADEBackend:
+    """Import the ADE SDK and probe its capabilities once per process.
+
+    Version compatibility: newer installs often expose helper functions via
+    vision_agent.tools.agentic_document_extraction, while some older
+    environments expose FrameSet APIs under landingai.pipeline.frameset.
+    ImportError is not cached, so installing the SDK mid-process still works.
+    """
+    try:
+        from vision_agent.tools import agentic_document_extraction as ade_module  # type: ignore
+    except ImportError:
+        try:
+            from landingai.pipeline.frameset import FrameSet as frame_set_cls  # type: ignore
+        except ImportError as import_exc:
+            raise ImportError(
+                "ADE requires the vision-agent package. "
+                "Install with: pip install vision-agent\n"
+                "Then set VISION_AGENT_API_KEY in your .env file."
+            ) from import_exc
+        return _ADEBackend(None, frame_set_cls, None, None, None)
+
+    def _callable_attr(*names: str) -> Optional[Callable[..., Any]]:
+        for name in names:
+            candidate = getattr(ade_module, name, None)
+            if callable(candidate):
+                return candidate
+        return None
+
+    return _ADEBackend(
+        module=ade_module,
+        frame_set_cls=None,
+        parse_fn=_callable_attr("parse_document"),
+        extract_fn=_callable_attr("extract_data"),
+        batch_parse_fn=_callable_attr("parse_documents", "batch_parse"),
+    )
+
+
+@lru_cache(maxsize=32)
+def _accepted_kwargs(fn: Callable[..., Any], names: tuple[str, ...]) -> frozenset[str]:
+    """Subset of `names` that `fn` accepts as keyword arguments.
+
+    The ADE SDK signatures differ across releases; reading them once replaces
+    probing each call with TypeError retries. Callables whose signature
+    cannot be read, or that take **kwargs, are assumed to accept everything.
+    """
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return frozenset(names)
+    if any(param.kind is inspect.Parameter.VAR_KEYWORD for param in params.values()):
+        return frozenset(names)
+    keyword_kinds = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    return frozenset(name for name in names if name in params and params[name].kind in keyword_kinds)
+
+
+def _call_ade(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call an ADE SDK function, dropping keyword arguments it does not take."""
+    # Bound methods are recreated per FrameSet instance; key on the function.
+    accepted = _accepted_kwargs(getattr(fn, "__func__", fn), tuple(kwargs))
+    return fn(*args, **{name: value for name, value in kwargs.items() if name in accepted})
+
+
+def _call_ade_extract(fn: Callable[..., Any], markdown: str, **kwargs: Any) -> Any:
+    """Call an ADE extract function by keyword, or positionally on old SDKs."""
+    # SDKs serialize the schema with json, which rejects the read-only proxy.
+    schema = dict(_RECEIPT_SCHEMA)
+    if _accepted_kwargs(getattr(fn, "__func__", fn), ("markdown", "schema")) == {"markdown", "schema"}:
+        return _call_ade(fn, markdown=markdown, schema=schema, **kwargs)
+    return _call_ade(fn, markdown, schema, **kwargs)
+
+
 def _extract_with_ade(image_path: str, api_key: str) -> ReceiptData:
     """Extract receipt fields with LandingAI ADE using Parse -> Extract.
 
@@ -279,253 +951,217 @@ def _extract_with_ade(image_path: str, api_key: str) -> ReceiptData:
         ReceiptData: Structured extraction result with grounding metadata.
     """
     try:
-        # Version compatibility: newer installs often expose helper functions
-        # via vision_agent.tools.agentic_document_extraction, while some older
-        # environments expose FrameSet APIs under landingai.pipeline.frameset.
-        ade_module = None
-        frame_set_cls = None
-        try:
-            from vision_agent.tools import agentic_document_extraction as ade_module  # type: ignore
-        except ImportError:
-            try:
-                from landingai.pipeline.frameset import FrameSet as frame_set_cls  # type: ignore
-            except ImportError as import_exc:
-                raise ImportError(
-                    "ADE requires the vision-agent package. "
-                    "Install with: pip install vision-agent\n"
-                    "Then set VISION_AGENT_API_KEY in your .env file."
-                ) from import_exc
-
-        receipt_schema = {
-            "type": "object",
-            "properties": {
-                "vendor": {
-                    "type": "string",
-                    "description": (
-                        "The vendor, merchant, or store name as printed on the "
-                        "receipt, usually at the top in large text. This is the "
-                        "business name, not the address or phone number. "
-                        "Examples: 'Starbucks', 'The Home Depot', 'El Agave Mexican Restaurant'. "
-                        "If multiple names appear (e.g., a franchise name and parent company), "
-                        "use the most prominent one."
-                    ),
-                },
-                "total": {
-                    "type": "number",
-                    "description": (
-                        "The final total amount paid, including tax and tip. "
-                        "Look for labels like 'Total', 'Grand Total', 'Amount Due', "
-                        "'Balance Due', or 'Total Charged'. This is typically the "
-                        "largest dollar amount on the receipt and appears near the bottom. "
-                        "If multiple totals appear, use the one labeled 'Total' or "
-                        "the largest amount. Include cents (e.g., 47.50 not 47)."
-                    ),
-                },
-                "date": {
-                    "type": "string",
-                    "description": (
-                        "The transaction date as printed on the receipt. May appear "
-                        "in various formats: '01/15/2026', 'Jan 15, 2026', "
-                        "'2026-01-15', '1/15/26'. Usually near the top or bottom "
-                        "of the receipt. Return exactly as printed - do not reformat. "
-                        "If both a date and time appear, return only the date portion."
-                    ),
-                },
-                "tax": {
-                    "type": "number",
-                    "description": (
-                        "Tax amount if listed as a separate line item. "
-                        "Look for labels like 'Tax', 'Sales Tax', 'VAT', 'HST', 'GST'. "
-                        "Return the dollar amount, not the percentage. "
-                        "Return null if tax is not listed separately."
-                    ),
-                },
-                "tip": {
-                    "type": "number",
-                    "description": (
-                        "Tip or gratuity amount if present on the receipt. "
-                        "Look for labels like 'Tip', 'Gratuity', 'Service Charge'. "
-                        "Common on restaurant receipts. May be handwritten. "
-                        "Return null if no tip is listed or if the tip line is blank."
-                    ),
-                },
-                "subtotal": {
-                    "type": "number",
-                    "description": (
-                        "Subtotal before tax and tip, if listed separately. "
-                        "Look for labels like 'Subtotal', 'Sub-total', 'Items Total'. "
-                        "This is typically smaller than the total. "
-                        "Return null if not listed separately."
-                    ),
-                },
-            },
-            "required": ["vendor", "total"],
-        }
+        backend = _get_ade_backend()
+        frame_set_cls = backend.frame_set_cls
 
         logger.info("ade_parse_start | file=%s | model=%s", os.path.basename(image_path), ADE_MODEL)
         parse_result: Any = None
 
-        if ade_module is not None:
-            parse_fn = getattr(ade_module, "parse_document", None)
-            if callable(parse_fn):
-                try:
-                    parse_result = parse_fn(image_path, model=ADE_MODEL, api_key=api_key)
-                except TypeError:
-                    try:
-                        parse_result = parse_fn(image_path, model=ADE_MODEL)
-                    except TypeError:
-                        parse_result = parse_fn(image_path)
-            else:
+        if backend.module is not None:
+            if backend.parse_fn is None:
                 raise RuntimeError("ADE module does not expose parse_document()")
+            parse_result = _call_ade(backend.parse_fn, image_path, model=ADE_MODEL, api_key=api_key)
         else:
-            frame_set = None
-            try:
-                frame_set = frame_set_cls(api_key=api_key)  # type: ignore[misc]
-            except TypeError:
-                frame_set = frame_set_cls()  # type: ignore[misc]
-
+            frame_set = _call_ade(frame_set_cls, api_key=api_key)
             parse_fn = getattr(frame_set, "parse_document", None)
+            parse_fn_cls = getattr(frame_set_cls, "parse_document", None)
             if callable(parse_fn):
-                try:
-                    parse_result = parse_fn(image_path, model=ADE_MODEL)
-                except TypeError:
-                    parse_result = parse_fn(image_path)
-            else:
-                parse_fn_cls = getattr(frame_set_cls, "parse_document", None)
-                parse_fn = getattr(frame_set_cls, "parse_document")
-                if callable(parse_fn_cls):
-                    try:
-                
-                        parse_result = parse_fn_cls(image_path, model=ADE_MODEL, api_key=api_key)
-                    except TypeError:
-                        parse_result = parse_fn_cls(image_path, model=ADE_MODEL)
-                else:
-                    raise RuntimeError("FrameSet API does not expose parse_document()")
-
-        if not parse_result:
-            raise RuntimeError("ADE parse returned no result")
-
-        if isinstance(parse_result, dict):
-            markdown = parse_result.get("markdown", "")
-            chunks = parse_result.get("chunks", []) or []
-        else:
-            markdown = getattr(parse_result, "markdown", "") or ""
-            chunks = getattr(parse_result, "chunks", []) or []
-
-        logger.info("ade_parse_complete | chunk_count=%s | file=%s", len(chunks), os.path.basename(image_path))
-        logger.debug("ade_parse_preview | markdown_head=%r", markdown[:200])
-
-        logger.info("ade_extract_start | file=%s", os.path.basename(image_path))
-        extract_result: Any = None
-
-        if ade_module is not None:
-            extract_fn = getattr(ade_module, "extract_data", None)
-            if callable(extract_fn):
-                try:
-                    extract_result = extract_fn(markdown=markdown, schema=receipt_schema, api_key=api_key)
-                except TypeError:
-                    try:
-                        extract_result = extract_fn(markdown=markdown, schema=receipt_schema)
-                    except TypeError:
-                        extract_result = extract_fn(markdown, receipt_schema)
+                parse_result = _call_ade(parse_fn, image_path, model=ADE_MODEL)
+            elif callable(parse_fn_cls):
+                parse_result = _call_ade(parse_fn_cls, image_path, model=ADE_MODEL, api_key=api_key)
             else:
-                raise RuntimeError("ADE module does not expose extract_data()")
-        else:
-            frame_set = None
-            try:
-                frame_set = frame_set_cls(api_key=api_key)  # type: ignore[misc]
-            except TypeError:
-                frame_set = frame_set_cls()  # type: ignore[misc]
-
-            extract_fn = getattr(frame_set, "extract_data", None)
-            if callable(extract_fn):
-                try:
-                    extract_result = extract_fn(markdown=markdown, schema=receipt_schema)
-                except TypeError:
-                    extract_result = extract_fn(markdown, receipt_schema)
-            else:
-                extract_fn_cls = getattr(frame_set_cls, "extract_data", None)
-                if callable(extract_fn_cls):
-                    try:
-                        extract_result = extract_fn_cls(markdown=markdown, schema=receipt_schema, api_key=api_key)
-                    except TypeError:
-                        extract_result = extract_fn_cls(markdown=markdown, schema=receipt_schema)
-                else:
-                    raise RuntimeError("FrameSet API does not expose extract_data()")
-
-        if extract_result is None:
-            raise RuntimeError("ADE extract returned no result")
-
-        if not isinstance(extract_result, dict):
-            # Support objects that expose field-like attributes.
-            extract_result = {
-                "vendor": getattr(extract_result, "vendor", None),
-                "total": getattr(extract_result, "total", None),
-                "date": getattr(extract_result, "date", None),
-                "tax": getattr(extract_result, "tax", None),
-                "tip": getattr(extract_result, "tip", None),
-                "subtotal": getattr(extract_result, "subtotal", None),
-            }
-
-        vendor_value = extract_result.get("vendor")
-        if not vendor_value:
-            logger.warning("ade_extract_warning | field=vendor | reason='missing' | fallback='UNKNOWN'")
-            vendor_value = "UNKNOWN"
-
-        total_raw = extract_result.get("total")
-        total_value = _safe_float(total_raw)
-        if total_value is None:
-            logger.warning("ade_extract_warning | field=total | reason='missing_or_invalid' | fallback=0.0")
-            total_value = 0.0
-
-        chunk_ids: list[str] = []
-        for chunk in chunks:
-            if isinstance(chunk, dict):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-            else:
-                chunk_id = getattr(chunk, "chunk_id", None) or getattr(chunk, "id", None)
-            if chunk_id:
-                chunk_ids.append(str(chunk_id))
-
-        confidence = _compute_confidence(extract_result=extract_result, chunks=chunks)
-        receipt = ReceiptData(
-            vendor=str(vendor_value),
-            total=float(total_value),
-            date=extract_result.get("date"),
-            tax=_safe_float(extract_result.get("tax")),
-            tip=_safe_float(extract_result.get("tip")),
-            subtotal=_safe_float(extract_result.get("subtotal")),
-            currency="USD",
-            confidence=confidence,
-            chunk_ids=chunk_ids,
-            raw_text=markdown[:1000] if markdown else None,
-        )
-        logger.info(
-            "ade_extract_complete | vendor=%r | total=%.2f | confidence=%.0f%% | chunk_ids=%s | file=%s",
-            receipt.vendor,
-            receipt.total,
-            receipt.confidence * 100,
-            len(chunk_ids),
-            os.path.basename(image_path),
-        )
-        return receipt
+                raise RuntimeError("FrameSet API does not expose parse_document()")
+
+        return _receipt_from_parse_result(parse_result, image_path, api_key, backend)
     except ImportError:
         raise
     except Exception as exc:
-        logger.error(
-            "ade_extract_error | file=%s | error_type=%s | error=%s",
-            image_path,
+        return _ade_failure(image_path, exc)
+
+
+def _extract_with_ade_batch(image_paths: list[str], api_key: str) -> Optional[list[ReceiptData]]:
+    """Parse several receipts with one ADE batch call, then extract each.
+
+    Newer SDK builds expose a multi-document parse (`parse_documents` or
+    `batch_parse`), which saves the per-request HTTP/TLS and setup cost for
+    every file after the first. Returns None when no batch call is
+    available or the batch parse fails, so callers fall back to the
+    per-file `_extract_with_ade` path. Per-file extract failures become
+    `EXTRACTION_FAILED` payloads just like the single-file path.
+    """
+    try:
+        backend = _get_ade_backend()
+    except ImportError:
+        return None
+    batch_fn = backend.batch_parse_fn
+    if batch_fn is None:
+        return None
+
+    logger.info("ade_batch_parse_start | files=%s | model=%s", len(image_paths), ADE_MODEL)
+    try:
+        parse_results = _call_ade(batch_fn, image_paths, model=ADE_MODEL, api_key=api_key)
+        parse_results = list(parse_results or [])
+        if len(parse_results) != len(image_paths):
+            raise RuntimeError(f"ADE batch parse returned {len(parse_results)} results for {len(image_paths)} files")
+    except Exception as exc:
+        logger.warning(
+            "ade_batch_parse_warning | files=%s | error_type=%s | error=%s | fallback='per-file parse'",
+            len(image_paths),
             type(exc).__name__,
             exc,
-            exc_info=True,
         )
-        return ReceiptData(
-            vendor="EXTRACTION_FAILED",
-            total=0.0,
-            confidence=0.1,
-            raw_text=f"ADE extraction failed: {exc}",
+        return None
+
+    receipts: list[ReceiptData] = []
+    for index, image_path in enumerate(image_paths):
+        # Drop each parse result as it is consumed so at most one full
+        # markdown document is alive at a time.
+        parse_result, parse_results[index] = parse_results[index], None
+        try:
+            receipts.append(_receipt_from_parse_result(parse_result, image_path, api_key, backend))
+        except ImportError:
+            raise
+        except Exception as exc:
+            receipts.append(_ade_failure(image_path, exc))
+    return receipts
+
+
+def _receipt_from_parse_result(
+    parse_result: Any,
+    image_path: str,
+    api_key: str,
+    backend: _ADEBackend,
+) -> ReceiptData:
+    """Run the ADE extract step on a parse result and build `ReceiptData`.
+
+    Raises on ADE failures; callers turn the exception into `_ade_failure`.
+    """
+    if not parse_result:
+        raise RuntimeError("ADE parse returned no result")
+    filename = os.path.basename(image_path)
+
+    if isinstance(parse_result, dict):
+        markdown = parse_result.get("markdown", "")
+        chunks = parse_result.get("chunks", []) or []
+    else:
+        markdown = getattr(parse_result, "markdown", "") or ""
+        chunks = getattr(parse_result, "chunks", []) or []
+    chunks = list(chunks)
+
+    # Keep only a bounded prefix beyond the extract call; the full markdown is
+    # released as soon as ADE has seen it.
+    raw_text_preview = markdown[:RAW_TEXT_PREVIEW_CHARS] if markdown else None
+    if len(markdown) > LARGE_MARKDOWN_WARNING_CHARS:
+        logger.warning(
+            "ade_parse_large_markdown | chars=%s | file=%s | note='only first %s chars kept'",
+            len(markdown),
+            filename,
+            RAW_TEXT_PREVIEW_CHARS,
         )
 
+    logger.info("ade_parse_complete | chunk_count=%s | file=%s", len(chunks), filename)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("ade_parse_preview | markdown_head=%r", (raw_text_preview or "")[:200])
+
+    logger.info("ade_extract_start | file=%s", filename)
+    extract_result: Any = None
+
+    frame_set_cls = backend.frame_set_cls
+    if backend.module is not None:
+        if backend.extract_fn is None:
+            raise RuntimeError("ADE module does not expose extract_data()")
+        extract_result = _call_ade_extract(backend.extract_fn, markdown, api_key=api_key)
+    else:
+        frame_set = _call_ade(frame_set_cls, api_key=api_key)
+        extract_fn = getattr(frame_set, "extract_data", None)
+        extract_fn_cls = getattr(frame_set_cls, "extract_data", None)
+        if callable(extract_fn):
+            extract_result = _call_ade_extract(extract_fn, markdown)
+        elif callable(extract_fn_cls):
+            extract_result = _call_ade_extract(extract_fn_cls, markdown, api_key=api_key)
+        else:
+            raise RuntimeError("FrameSet API does not expose extract_data()")
+
+    del markdown
+    if extract_result is None:
+        raise RuntimeError("ADE extract returned no result")
+
+    if not isinstance(extract_result, dict):
+        # Support objects that expose field-like attributes.
+        extract_result = {
+            "vendor": getattr(extract_result, "vendor", None),
+            "total": getattr(extract_result, "total", None),
+            "date": getattr(extract_result, "date", None),
+            "tax": getattr(extract_result, "tax", None),
+            "tip": getattr(extract_result, "tip", None),
+            "subtotal": getattr(extract_result, "subtotal", None),
+        }
+
+    vendor_value = extract_result.get("vendor")
+    if not vendor_value:
+        logger.warning("ade_extract_warning | field=vendor | reason='missing' | fallback='UNKNOWN'")
+        vendor_value = "UNKNOWN"
+
+    total_raw = extract_result.get("total")
+    total_value = _safe_float(total_raw)
+    if total_value is None:
+        logger.warning("ade_extract_warning | field=total | reason='missing_or_invalid' | fallback=0.0")
+        total_value = 0.0
+
+    # SDKs return either all dicts or all objects; pick the accessor once for
+    # the whole list and only fall back to per-chunk dispatch for mixed lists.
+    if chunks and isinstance(chunks[0], dict) and all(isinstance(chunk, dict) for chunk in chunks):
+        chunk_ids = [str(cid) for chunk in chunks if (cid := chunk.get("chunk_id") or chunk.get("id"))]
+    else:
+        chunk_ids = [str(cid) for chunk in chunks if (cid := _chunk_id(chunk))]
+
+    confidence = _compute_confidence(extract_result=extract_result, chunks=chunks)
+    receipt = ReceiptData(
+        vendor=str(vendor_value),
+        total=float(total_value),
+        date=extract_result.get("date"),
+        tax=_safe_float(extract_result.get("tax")),
+        tip=_safe_float(extract_result.get("tip")),
+        subtotal=_safe_float(extract_result.get("subtotal")),
+        currency="USD",
+        confidence=confidence,
+        chunk_ids=chunk_ids,
+        raw_text=raw_text_preview,
+    )
+    logger.info(
+        "ade_extract_complete | vendor=%r | total=%.2f | confidence=%.0f%% | chunk_ids=%s | file=%s",
+        receipt.vendor,
+        receipt.total,
+        receipt.confidence * 100,
+        len(chunk_ids),
+        filename,
+    )
+    return receipt
+
+
+def _chunk_id(chunk: Any) -> Any:
+    """Return a parsed chunk's identifier from either a dict or an SDK object."""
+    if isinstance(chunk, dict):
+        return chunk.get("chunk_id") or chunk.get("id")
+    return getattr(chunk, "chunk_id", None) or getattr(chunk, "id", None)
+
+
+def _ade_failure(image_path: str, exc: Exception) -> ReceiptData:
+    """Low-confidence `EXTRACTION_FAILED` payload for a runtime ADE failure."""
+    logger.error(
+        "ade_extract_error | file=%s | error_type=%s | error=%s",
+        image_path,
+        type(exc).__name__,
+        exc,
+        exc_info=True,
+    )
+    return ReceiptData(
+        vendor="EXTRACTION_FAILED",
+        total=0.0,
+        confidence=0.1,
+        raw_text=f"ADE extraction failed: {exc}",
+    )
+
 
 def _safe_float(value: Any) -> Optional[float]:
     """Safely convert a value to float, returning None if not possible."""
@@ -543,31 +1179,278 @@ def _compute_confidence(extract_result: dict, chunks: list) -> float:
 
     Heuristic:
     - Start at 1.0
-    - Deduct 0.15 if vendor is missing or "UNKNOWN"
+    - Deduct 0.15 if vendor is missing or a placeholder ("UNKNOWN", ...)
     - Deduct 0.15 if total is missing or 0
     - Deduct 0.10 if date is missing
     - Deduct 0.05 if no chunks found (no grounding possible)
-    - Clamp to [0.1, 1.0]
+    - Floor at 0.1
 
     This is a rough heuristic. ADE may provide its own confidence scores in
     future versions, which would replace this logic.
     """
-    score = 1.0
+    if not isinstance(extract_result, dict):
+        extract_result = {}
+
+    vendor = extract_result.get("vendor")
+    bad_vendor = not vendor or str(vendor).strip().upper() in _BAD_VENDOR_SENTINELS
+    bad_total = not _safe_float(extract_result.get("total"))  # None (missing/invalid) or 0.0
+    missing_date = not extract_result.get("date")
+    no_chunks = not chunks
+
+    # Each flag is a bool (0/1), so every deduction applies without branching.
+    # Deductions only lower the score, so only the 0.1 floor needs a clamp.
+    score = 1.0 - 0.15 * bad_vendor - 0.15 * bad_total - 0.10 * missing_date - 0.05 * no_chunks
+    return max(0.1, score)
+
+
+# -- Mock fixtures --
+# Built once at import; `_extract_mock` returns a shallow copy of the matching
+# fixture with a fresh `chunk_ids` list, so callers can reassign fields or edit
+# chunk_ids without touching the shared instances. Any mutable field added to
+# ReceiptData later must be copied there as well.
+
+_MOCK_RECEIPT_01 = ReceiptData(
+    vendor="Amazon.com",
+    total=89.97,
+    date="2026-01-10",
+    tax=5.97,
+    tip=None,
+    subtotal=84.00,
+    currency="USD",
+    confidence=0.98,
+    chunk_ids=["chunk_001_vendor", "chunk_002_total", "chunk_003_date"],
+    raw_text=(
+        "Amazon.com\nOrder #112-4837264-9182736\n\n"
+        "Items: $84.00\nTax: $5.97\nTotal: $89.97\nDate: 01/10/2026"
+    ),
+)
+
+_MOCK_RECEIPT_02 = ReceiptData(
+    vendor="El Agave Mexican Restaurant",
+    total=47.50,
+    date="2026-01-12",
+    tax=3.50,
+    tip=7.00,
+    subtotal=37.00,
+    currency="USD",
+    confidence=0.95,
+    chunk_ids=["chunk_010_vendor", "chunk_011_total", "chunk_012_date", "chunk_013_tip"],
+    raw_text=(
+        "El Agave Mexican Restaurant\n1847 Rossville Blvd\nChattanooga, TN 37408\n\n"
+        "Chicken Enchiladas  $12.00\nSteak Fajitas       $18.00\nDrinks              $7.00\n\n"
+        "Subtotal: $37.00\nTax:      $3.50\nTip:      $7.00\n\n"
+        "Total:    $47.50\n\nDate: 01/12/2026\nServer: Maria"
+    ),
+)
+
+_MOCK_RECEIPT_03 = ReceiptData(
+    vendor="Starbucks",
+    total=5.25,
+    date="2026-01-14",
+    tax=0.35,
+    tip=None,
+    subtotal=4.90,
+    currency="USD",
+    confidence=0.97,
+    chunk_ids=["chunk_020_vendor", "chunk_021_total"],
+    raw_text=(
+        "Starbucks #14892\nChattanooga, TN\n\n"
+        "Grande Latte    $4.90\nTax             $0.35\n\n"
+        "Total:          $5.25\n\n01/14/2026 08:42 AM"
+    ),
+)
+
+_MOCK_RECEIPT_04 = ReceiptData(
+    vendor="Home Depot",
+    total=234.67,
+    date="2026-01-15",
+    tax=18.67,
+    tip=None,
+    subtotal=216.00,
+    currency="USD",
+    confidence=0.96,
+    chunk_ids=["chunk_030_vendor", "chunk_031_total", "chunk_032_date", "chunk_033_items"],
+    raw_text=(
+        "The Home Depot #4821\n6910 Lee Hwy\nChattanooga, TN 37421\n\n"
+        "2x4x8 Lumber (x20)  $140.00\nDrywall Screws       $24.00\n"
+        "Joint Compound       $32.00\nPaint Roller Kit     $20.00\n\n"
+        "Subtotal: $216.00\nTax:      $18.67\nTotal:    $234.67\n\n01/15/2026 14:23"
+    ),
+)
+
+_MOCK_RECEIPT_05 = ReceiptData(
+    vendor="Fastenal",
+    total=178.23,
+    date="2026-01-18",
+    tax=13.23,
+    tip=None,
+    subtotal=165.00,
+    currency="USD",
+    confidence=0.72,
+    chunk_ids=["chunk_040_vendor"],
+    raw_text=(
+        "Fast3nal\n    Industrial Supp1ies\n\n"
+        "Bolts M8x40    $85.00\nWashers        $45.00\nAnch0r Kit     $35.00\n\n"
+        "Subt0tal: $165.00\nTax:      $13.23\nT0tal:    $178.23\n\n01/18/2026"
+    ),
+)
+
+_MOCK_RECEIPT_06 = ReceiptData(
+    vendor="Bob's Local Hardware",
+    total=45.00,
+    date="2026-01-22",
+    tax=3.00,
+    tip=None,
+    subtotal=42.00,
+    currency="USD",
+    confidence=0.93,
+    chunk_ids=["chunk_050_vendor", "chunk_051_total", "chunk_052_date"],
+    raw_text=(
+        "Bob's Local Hardware\n2847 Brainerd Rd\n\n"
+        "Hammer       $15.00\nNails (1lb)  $8.00\nWD-40        $7.00\nDuct Tape    $12.00\n\n"
+        "Subtotal: $42.00\nTax:      $3.00\nTotal:    $45.00\n\n01/22/2026"
+    ),
+)
+
+_MOCK_RECEIPT_07 = ReceiptData(
+    vendor="Walgreens",
+    total=23.47,
+    date=None,
+    tax=1.47,
+    tip=None,
+    subtotal=22.00,
+    currency="USD",
+    confidence=0.80,
+    chunk_ids=["chunk_060_vendor", "chunk_061_total"],
+    raw_text=(
+        "Walgreens\n\nIbuprofen    $12.00\nBandages     $10.00\n\n"
+        "Subtotal: $22.00\nTax: $1.47\nTotal: $23.47\n\n[date illegible]"
+    ),
+)
+
+_MOCK_RECEIPT_08 = ReceiptData(
+    vendor="unclear",
+    total=67.89,
+    date="2026-01-14",
+    tax=None,
+    tip=None,
+    subtotal=None,
+    currency="USD",
+    confidence=0.35,
+    chunk_ids=[],
+    raw_text="[mostly illegible thermal print]\n...$67.89...\n...01/14...",
+)
+
+_MOCK_RECEIPT_09 = ReceiptData(
+    vendor="Target",
+    total=0.00,
+    date="2026-01-15",
+    tax=0.00,
+    tip=None,
+    subtotal=0.00,
+    currency="USD",
+    confidence=0.90,
+    chunk_ids=["chunk_080_vendor"],
+    raw_text="Target\n\nVOIDED TRANSACTION\n\nTotal: $0.00\n01/15/2026",
+)
+
+_MOCK_RECEIPT_10 = ReceiptData(
+    vendor="Café Résistance",
+    total=18.75,
+    date="2026-01-13",
+    tax=1.25,
+    tip=3.00,
+    subtotal=14.50,
+    currency="USD",
+    confidence=0.92,
+    chunk_ids=["chunk_090_vendor", "chunk_091_total"],
+    raw_text=(
+        "Café Résistance\n2847 Market St\n\nLatte    $5.50\nCroissant $9.00\n\n"
+        "Subtotal: $14.50\nTax: $1.25\nTip: $3.00\nTotal: $18.75\n01/13/2026"
+    ),
+)
+
+_MOCK_RECEIPT_11 = ReceiptData(
+    vendor="Amazon.com",
+    total=89.97,
+    date="2026-01-10",
+    tax=5.97,
+    tip=None,
+    subtotal=84.00,
+    currency="USD",
+    confidence=0.98,
+    chunk_ids=["chunk_100_vendor", "chunk_101_total"],
+    raw_text=(
+        "Amazon.com\nOrder #999-0000000-0000000\n\n"
+        "Items: $84.00\nTax: $5.97\nTotal: $89.97\nDate: 01/10/2026"
+    ),
+)
+
+# Filename key -> fixture for `_extract_mock`, in priority order: when a
+# filename contains several keys, the earliest one wins. Built once at import.
+_MOCK_REGISTRY: Final[Mapping[str, ReceiptData]] = MappingProxyType({
+    "receipt_01": _MOCK_RECEIPT_01,
+    "clean_match": _MOCK_RECEIPT_01,
+    "amazon": _MOCK_RECEIPT_01,
+    "receipt_02": _MOCK_RECEIPT_02,
+    "vendor_mismatch": _MOCK_RECEIPT_02,
+    "agave": _MOCK_RECEIPT_02,
+    "receipt_03": _MOCK_RECEIPT_03,
+    "tip_tax": _MOCK_RECEIPT_03,
+    "starbucks": _MOCK_RECEIPT_03,
+    "receipt_04": _MOCK_RECEIPT_04,
+    "settlement": _MOCK_RECEIPT_04,
+    "home_depot": _MOCK_RECEIPT_04,
+    "homedepot": _MOCK_RECEIPT_04,
+    "receipt_05": _MOCK_RECEIPT_05,
+    "combined": _MOCK_RECEIPT_05,
+    "fastenal": _MOCK_RECEIPT_05,
+    "receipt_06": _MOCK_RECEIPT_06,
+    "no_match": _MOCK_RECEIPT_06,
+    "hardware": _MOCK_RECEIPT_06,
+    "bobs": _MOCK_RECEIPT_06,
+    "receipt_07": _MOCK_RECEIPT_07,
+    "no_date": _MOCK_RECEIPT_07,
+    "receipt_08": _MOCK_RECEIPT_08,
+    "blurry": _MOCK_RECEIPT_08,
+    "receipt_09": _MOCK_RECEIPT_09,
+    "voided": _MOCK_RECEIPT_09,
+    "receipt_10": _MOCK_RECEIPT_10,
+    "unicode": _MOCK_RECEIPT_10,
+    "cafe": _MOCK_RECEIPT_10,
+    "receipt_11": _MOCK_RECEIPT_11,
+    "duplicate": _MOCK_RECEIPT_11,
+})
+_MOCK_KEYS: tuple[str, ...] = tuple(_MOCK_REGISTRY)
+_MOCK_KEY_PRIORITY: dict[str, int] = {key: rank for rank, key in enumerate(_MOCK_KEYS)}
+# Zero-width lookahead so overlapping keys are all reported in one scan; the
+# alternation is in priority order, so at each position the best key wins.
+_MOCK_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, _MOCK_KEYS)) + "))")
+
+
+def _build_mock_automaton() -> Any:
+    """Aho-Corasick automaton over `_MOCK_KEYS` (value = priority rank), or None."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, key in enumerate(_MOCK_KEYS):
+        automaton.add_word(key, rank)
+    automaton.make_automaton()
+    return automaton
+
 
-    vendor = extract_result.get("vendor") if isinstance(extract_result, dict) else None
-    total = extract_result.get("total") if isinstance(extract_result, dict) else None
-    date = extract_result.get("date") if isinstance(extract_result, dict) else None
+# One pass over the filename reports every key it contains, whatever the
+# registry size.
+_MOCK_AUTOMATON = _build_mock_automaton()
 
-    if not vendor or str(vendor).strip().upper() == "UNKNOWN":
-        score -= 0.15
-    if _safe_float(total) in (None, 0.0):
-        score -= 0.15
-    if not date:
-        score -= 0.10
-    if not chunks:
-        score -= 0.05
 
-    return max(0.1, min(1.0, score))
+def _match_mock_key(filename: str) -> Optional[str]:
+    """Highest-priority `_MOCK_KEYS` entry contained in `filename`, if any."""
+    if _MOCK_AUTOMATON is not None:
+        ranks = [rank for _, rank in _MOCK_AUTOMATON.iter(filename)]
+        return _MOCK_KEYS[min(ranks)] if ranks else None
+    matched_keys = {match.group(1) for match in _MOCK_PATTERN.finditer(filename)}
+    return min(matched_keys, key=_MOCK_KEY_PRIORITY.__getitem__) if matched_keys else None
 
 
 def _extract_mock(image_path: str) -> ReceiptData:
@@ -594,7 +1477,9 @@ def _extract_mock(image_path: str) -> ReceiptData:
 
     Matching strategy:
     - Uses lowercase basename from `image_path`.
-    - Searches for known key substrings in the filename.
+    - Scans the filename once for known key substrings (Aho-Corasick when
+      pyahocorasick is installed, else `_MOCK_PATTERN`); if several keys
+      appear, the earliest entry in `_MOCK_KEYS` wins.
     - Supports flexible naming (not restricted to exact canonical filenames).
 
     Fallback behavior:
@@ -619,212 +1504,13 @@ def _extract_mock(image_path: str) -> ReceiptData:
     else:
         filename = os.path.basename(str(image_path)).lower()
 
-    receipt_01 = ReceiptData(
-        vendor="Amazon.com",
-        total=89.97,
-        date="2026-01-10",
-        tax=5.97,
-        tip=None,
-        subtotal=84.00,
-        currency="USD",
-        confidence=0.98,
-        chunk_ids=["chunk_001_vendor", "chunk_002_total", "chunk_003_date"],
-        raw_text=(
-            "Amazon.com\nOrder #112-4837264-9182736\n\n"
-            "Items: $84.00\nTax: $5.97\nTotal: $89.97\nDate: 01/10/2026"
-        ),
-    )
-    receipt_02 = ReceiptData(
-        vendor="El Agave Mexican Restaurant",
-        total=47.50,
-        date="2026-01-12",
-        tax=3.50,
-        tip=7.00,
-        subtotal=37.00,
-        currency="USD",
-        confidence=0.95,
-        chunk_ids=["chunk_010_vendor", "chunk_011_total", "chunk_012_date", "chunk_013_tip"],
-        raw_text=(
-            "El Agave Mexican Restaurant\n1847 Rossville Blvd\nChattanooga, TN 37408\n\n"
-            "Chicken Enchiladas  $12.00\nSteak Fajitas       $18.00\nDrinks              $7.00\n\n"
-            "Subtotal: $37.00\nTax:      $3.50\nTip:      $7.00\n\n"
-            "Total:    $47.50\n\nDate: 01/12/2026\nServer: Maria"
-        ),
-    )
-    receipt_03 = ReceiptData(
-        vendor="Starbucks",
-        total=5.25,
-        date="2026-01-14",
-        tax=0.35,
-        tip=None,
-        subtotal=4.90,
-        currency="USD",
-        confidence=0.97,
-        chunk_ids=["chunk_020_vendor", "chunk_021_total"],
-        raw_text=(
-            "Starbucks #14892\nChattanooga, TN\n\n"
-            "Grande Latte    $4.90\nTax             $0.35\n\n"
-            "Total:          $5.25\n\n01/14/2026 08:42 AM"
-        ),
-    )
-    receipt_04 = ReceiptData(
-        vendor="Home Depot",
-        total=234.67,
-        date="2026-01-15",
-        tax=18.67,
-        tip=None,
-        subtotal=216.00,
-        currency="USD",
-        confidence=0.96,
-        chunk_ids=["chunk_030_vendor", "chunk_031_total", "chunk_032_date", "chunk_033_items"],
-        raw_text=(
-            "The Home Depot #4821\n6910 Lee Hwy\nChattanooga, TN 37421\n\n"
-            "2x4x8 Lumber (x20)  $140.00\nDrywall Screws       $24.00\n"
-            "Joint Compound       $32.00\nPaint Roller Kit     $20.00\n\n"
-            "Subtotal: $216.00\nTax:      $18.67\nTotal:    $234.67\n\n01/15/2026 14:23"
-        ),
-    )
-    receipt_05 = ReceiptData(
-        vendor="Fastenal",
-        total=178.23,
-        date="2026-01-18",
-        tax=13.23,
-        tip=None,
-        subtotal=165.00,
-        currency="USD",
-        confidence=0.72,
-        chunk_ids=["chunk_040_vendor"],
-        raw_text=(
-            "Fast3nal\n    Industrial Supp1ies\n\n"
-            "Bolts M8x40    $85.00\nWashers        $45.00\nAnch0r Kit     $35.00\n\n"
-            "Subt0tal: $165.00\nTax:      $13.23\nT0tal:    $178.23\n\n01/18/2026"
-        ),
-    )
-    receipt_06 = ReceiptData(
-        vendor="Bob's Local Hardware",
-        total=45.00,
-        date="2026-01-22",
-        tax=3.00,
-        tip=None,
-        subtotal=42.00,
-        currency="USD",
-        confidence=0.93,
-        chunk_ids=["chunk_050_vendor", "chunk_051_total", "chunk_052_date"],
-        raw_text=(
-            "Bob's Local Hardware\n2847 Brainerd Rd\n\n"
-            "Hammer       $15.00\nNails (1lb)  $8.00\nWD-40        $7.00\nDuct Tape    $12.00\n\n"
-            "Subtotal: $42.00\nTax:      $3.00\nTotal:    $45.00\n\n01/22/2026"
-        ),
-    )
-    receipt_07 = ReceiptData(
-        vendor="Walgreens",
-        total=23.47,
-        date=None,
-        tax=1.47,
-        tip=None,
-        subtotal=22.00,
-        currency="USD",
-        confidence=0.80,
-        chunk_ids=["chunk_060_vendor", "chunk_061_total"],
-        raw_text=(
-            "Walgreens\n\nIbuprofen    $12.00\nBandages     $10.00\n\n"
-            "Subtotal: $22.00\nTax: $1.47\nTotal: $23.47\n\n[date illegible]"
-        ),
-    )
-    receipt_08 = ReceiptData(
-        vendor="unclear",
-        total=67.89,
-        date="2026-01-14",
-        tax=None,
-        tip=None,
-        subtotal=None,
-        currency="USD",
-        confidence=0.35,
-        chunk_ids=[],
-        raw_text="[mostly illegible thermal print]\n...$67.89...\n...01/14...",
-    )
-    receipt_09 = ReceiptData(
-        vendor="Target",
-        total=0.00,
-        date="2026-01-15",
-        tax=0.00,
-        tip=None,
-        subtotal=0.00,
-        currency="USD",
-        confidence=0.90,
-        chunk_ids=["chunk_080_vendor"],
-        raw_text="Target\n\nVOIDED TRANSACTION\n\nTotal: $0.00\n01/15/2026",
-    )
-    receipt_10 = ReceiptData(
-        vendor="Café Résistance",
-        total=18.75,
-        date="2026-01-13",
-        tax=1.25,
-        tip=3.00,
-        subtotal=14.50,
-        currency="USD",
-        confidence=0.92,
-        chunk_ids=["chunk_090_vendor", "chunk_091_total"],
-        raw_text=(
-            "Café Résistance\n2847 Market St\n\nLatte    $5.50\nCroissant $9.00\n\n"
-            "Subtotal: $14.50\nTax: $1.25\nTip: $3.00\nTotal: $18.75\n01/13/2026"
-        ),
-    )
-    receipt_11 = ReceiptData(
-        vendor="Amazon.com",
-        total=89.97,
-        date="2026-01-10",
-        tax=5.97,
-        tip=None,
-        subtotal=84.00,
-        currency="USD",
-        confidence=0.98,
-        chunk_ids=["chunk_100_vendor", "chunk_101_total"],
-        raw_text=(
-            "Amazon.com\nOrder #999-0000000-0000000\n\n"
-            "Items: $84.00\nTax: $5.97\nTotal: $89.97\nDate: 01/10/2026"
-        ),
-    )
-
-    mock_registry: dict[str, ReceiptData] = {
-        "receipt_01": receipt_01,
-        "clean_match": receipt_01,
-        "amazon": receipt_01,
-        "receipt_02": receipt_02,
-        "vendor_mismatch": receipt_02,
-        "agave": receipt_02,
-        "receipt_03": receipt_03,
-        "tip_tax": receipt_03,
-        "starbucks": receipt_03,
-        "receipt_04": receipt_04,
-        "settlement": receipt_04,
-        "home_depot": receipt_04,
-        "homedepot": receipt_04,
-        "receipt_05": receipt_05,
-        "combined": receipt_05,
-        "fastenal": receipt_05,
-        "receipt_06": receipt_06,
-        "no_match": receipt_06,
-        "hardware": receipt_06,
-        "bobs": receipt_06,
-        "receipt_07": receipt_07,
-        "no_date": receipt_07,
-        "receipt_08": receipt_08,
-        "blurry": receipt_08,
-        "receipt_09": receipt_09,
-        "voided": receipt_09,
-        "receipt_10": receipt_10,
-        "unicode": receipt_10,
-        "cafe": receipt_10,
-        "receipt_11": receipt_11,
-        "duplicate": receipt_11,
-    }
-
     result = None
-    for key, receipt_data in mock_registry.items():
-        if key in filename:
-            result = receipt_data.model_copy(deep=True)
-            break
+    key = _match_mock_key(filename)
+    if key is not None:
+        fixture = _MOCK_REGISTRY[key]
+        # chunk_ids is the only mutable field; copying it is enough to keep
+        # callers from editing the shared fixture, without a deep model walk.
+        result = fixture.model_copy(update={"chunk_ids": list(fixture.chunk_ids)})
 
     if result is None:
         logger.warning(
@@ -857,12 +1543,13 @@ def _extract_mock(image_path: str) -> ReceiptData:
             raw_text=f"Mock validation error: {exc}",
         )
 
-    logger.info(
-        "mock_extract_complete | vendor=%r | total=%.2f | date=%s | confidence=%.0f%% | file=%s",
-        result.vendor,
-        result.total,
-        result.date,
-        result.confidence * 100.0,
-        filename,
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "mock_extract_complete | vendor=%r | total=%.2f | date=%s | confidence=%.0f%% | file=%s",
+            result.vendor,
+            result.total,
+            result.date,
+            result.confidence * 100.0,
+            filename,
+        )
     return result
@@ -6,15 +6,23 @@ Helpers for working with ADE visual grounding metadata.
 
 from __future__ import annotations
 
+import logging
+from collections import defaultdict
+from functools import lru_cache
+
 from models import ReceiptData
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_format_money = "${:.2f}".format
+
 
 class GroundingInfo:
     """Visual grounding information for one extracted field."""
 
+    __slots__ = ("field_name", "value", "chunk_ids", "confidence", "bounding_box")
+
     def __init__(
         self,
         field_name: str,
@@ -25,12 +33,17 @@ class GroundingInfo:
     ) -> None:
         self.field_name = field_name
         self.value = value
-        self.chunk_ids = chunk_ids or []
+        # Immutable: instances are shared through the extract_grounding cache.
+        self.chunk_ids: tuple[str, ...] = tuple(chunk_ids or ())
         self.confidence = confidence
         self.bounding_box = bounding_box
 
     def to_dict(self) -> dict:
-        """Serialize for JSON output."""
+        """Serialize for JSON output.
+
+        Sequences are emitted as fresh lists so the payload survives a JSON
+        round-trip unchanged and callers cannot mutate shared instances.
+        """
         return {
             "field": self.field_name,
             "value": self.value,
@@ -41,46 +54,92 @@ class GroundingInfo:
 
 
 def extract_grounding(receipt: ReceiptData) -> list[GroundingInfo]:
-    """Extract per-field grounding metadata from ReceiptData."""
+    """Extract per-field grounding metadata from ReceiptData.
+
+    Results are cached on the receipt's field values, so repeated calls (for
+    example from `grounding_coverage` and the JSON formatter) parse the chunk
+    ids once. The returned GroundingInfo objects are shared; treat them as
+    read-only.
+    """
     if receipt is None:
         return []
+    groundings, _, _ = _extract_grounding_and_stats(receipt)
+    return list(groundings)
+
+
+def _extract_grounding_and_stats(receipt: ReceiptData) -> tuple[tuple[GroundingInfo, ...], int, int]:
+    """Return (groundings, grounded field count, coverage field count)."""
+    return _extract_grounding_cached(
+        tuple(receipt.chunk_ids),
+        receipt.vendor,
+        receipt.total,
+        receipt.date,
+        receipt.tax,
+        receipt.tip,
+        receipt.subtotal,
+        receipt.confidence,
+    )
 
-    groundings: list[GroundingInfo] = []
-    field_chunks: dict[str, list[str]] = {}
 
-    for chunk_id in receipt.chunk_ids:
-        parts = str(chunk_id).rsplit("_", 1)
-        if len(parts) == 2:
-            field_name = parts[1].strip().lower()
+@lru_cache(maxsize=256)
+def _extract_grounding_cached(
+    chunk_ids: tuple[str, ...],
+    vendor: str,
+    total: float,
+    date: str | None,
+    tax: float | None,
+    tip: float | None,
+    subtotal: float | None,
+    confidence: float,
+) -> tuple[tuple[GroundingInfo, ...], int, int]:
+    # One pass builds the groundings and the counts `grounding_coverage` needs.
+    groundings: list[GroundingInfo] = []
+    grounded_fields = 0
+    total_fields = 0
+    field_chunks: defaultdict[str, list[str]] = defaultdict(list)
+
+    for chunk_id in chunk_ids:
+        chunk_id = chunk_id if isinstance(chunk_id, str) else str(chunk_id)
+        _, sep, suffix = chunk_id.rpartition("_")
+        if sep:
+            field_name = suffix.strip().lower()
             if field_name:
-                field_chunks.setdefault(field_name, []).append(str(chunk_id))
-
-    fields = {
-        "vendor": receipt.vendor,
-        "total": f"${receipt.total:.2f}",
-        "date": receipt.date,
-        "tax": f"${receipt.tax:.2f}" if receipt.tax is not None else None,
-        "tip": f"${receipt.tip:.2f}" if receipt.tip is not None else None,
-        "subtotal": f"${receipt.subtotal:.2f}" if receipt.subtotal is not None else None,
-    }
-
-    for field_name, value in fields.items():
-        if value is not None:
-            groundings.append(
-                GroundingInfo(
-                    field_name=field_name,
-                    value=str(value),
-                    chunk_ids=field_chunks.get(field_name, []),
-                    confidence=receipt.confidence,
-                )
-            )
-
-    logger.debug(
-        "grounding_extracted | count=%s | chunk_count=%s",
-        len(groundings),
-        len(receipt.chunk_ids),
+                field_chunks[field_name].append(chunk_id)
+
+    fields = (
+        ("vendor", vendor, str),
+        ("total", total, _format_money),
+        ("date", date, str),
+        ("tax", tax, _format_money),
+        ("tip", tip, _format_money),
+        ("subtotal", subtotal, _format_money),
     )
-    return groundings
+
+    for field_name, value, formatter in fields:
+        if value is None:
+            continue
+        field_chunk_ids = field_chunks.get(field_name, [])
+        groundings.append(
+            GroundingInfo(
+                field_name=field_name,
+                value=formatter(value),
+                chunk_ids=field_chunk_ids,
+                confidence=confidence,
+            )
+        )
+        if field_chunk_ids:
+            grounded_fields += 1
+        # An empty date string is shown but does not count toward coverage.
+        if field_name != "date" or value:
+            total_fields += 1
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "grounding_extracted | count=%s | chunk_count=%s",
+            len(groundings),
+            len(chunk_ids),
+        )
+    return tuple(groundings), grounded_fields, total_fields
 
 
 def has_grounding(receipt: ReceiptData) -> bool:
@@ -95,21 +154,7 @@ def grounding_coverage(receipt: ReceiptData) -> float:
     if receipt is None or not receipt.chunk_ids:
         return 0.0
 
-    groundings = extract_grounding(receipt)
+    groundings, grounded_fields, total_fields = _extract_grounding_and_stats(receipt)
     if not groundings:
         return 0.0
-
-    grounded_fields = sum(1 for item in groundings if item.chunk_ids)
-
-    total_fields = 2  # vendor + total
-    if receipt.date:
-        total_fields += 1
-    if receipt.tax is not None:
-        total_fields += 1
-    if receipt.tip is not None:
-        total_fields += 1
-    if receipt.subtotal is not None:
-        total_fields += 1
-
     return grounded_fields / max(total_fields, 1)
-
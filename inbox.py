@@ -16,13 +16,18 @@ import shutil
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from logging_config import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional; stdlib json is the fallback
+
 logger = get_logger(__name__)
 
-SUPPORTED_RECEIPT_EXTENSIONS = {
+SUPPORTED_RECEIPT_EXTENSIONS = frozenset({
     ".png",
     ".jpg",
     ".jpeg",
@@ -31,19 +36,41 @@ SUPPORTED_RECEIPT_EXTENSIONS = {
     ".tif",
     ".bmp",
     ".webp",
-}
-SUPPORTED_CSV_EXTENSIONS = {".csv"}
+})
+SUPPORTED_CSV_EXTENSIONS = frozenset({".csv"})
 
+# Archived signatures are appended to a JSONL log; once the log grows past
+# this size it is folded back into manifest.json.
+MANIFEST_LOG_COMPACT_BYTES = 4 * 1024 * 1024
+_INBOX_EXTENSIONS = SUPPORTED_CSV_EXTENSIONS | SUPPORTED_RECEIPT_EXTENSIONS
+
+
+class _InboxEntry(NamedTuple):
+    """One candidate inbox file with the stat fields captured during the scan."""
+
+    path: Path
+    name: str
+    # Lowercased extension, including the dot.
+    ext: str
+    size: int
+    mtime_ns: int
 
-def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
 
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-def _safe_mtime_ns(path: Path) -> int:
-    try:
-        return int(path.stat().st_mtime_ns)
-    except Exception:
-        return 0
+
+def _json_loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 def file_signature(path: Path) -> dict[str, Any]:
@@ -60,25 +87,66 @@ def signature_key(signature: dict[str, Any]) -> str:
     return f"{signature.get('name','')}::{signature.get('size',0)}::{signature.get('mtime_ns',0)}"
 
 
+def _signature_tuples(processed: dict[str, Any]) -> set[tuple[str, int, int]]:
+    """Parse manifest `signature_key` strings into (name, size, mtime_ns) tuples.
+
+    The string form is only the persisted manifest format; scans compare
+    tuples so no key string is built per candidate file.
+    """
+    signatures: set[tuple[str, int, int]] = set()
+    for key in processed:
+        name, _, rest = str(key).rpartition("::")
+        name, _, size = name.rpartition("::")
+        try:
+            signatures.add((name, int(size), int(rest)))
+        except ValueError:
+            continue
+    return signatures
+
+
+def _entry_signature(entry: _InboxEntry) -> dict[str, Any]:
+    """`file_signature` built from the stat captured during the inbox scan."""
+    return {"name": entry.name, "size": entry.size, "mtime_ns": entry.mtime_ns}
+
+
 class InboxScanner:
     """File-system scanner for Recon Inbox folder-drop ingestion."""
 
-    def __init__(self, inbox_path: str, archive_path: str, max_files_per_run: int = 50) -> None:
+    def __init__(
+        self,
+        inbox_path: str,
+        archive_path: str,
+        max_files_per_run: int = 50,
+        durable: bool = False,
+    ) -> None:
         self.inbox_path = Path(inbox_path).resolve()
         self.archive_path = Path(archive_path).resolve()
         self.max_files_per_run = max(1, int(max_files_per_run))
+        # fsync manifest writes. os.replace already makes snapshots atomic;
+        # without fsync a power loss can drop recent entries, so an identical
+        # file dropped again would not be recognized as processed.
+        self.durable = bool(durable)
         self.manifest_path = self.archive_path / "manifest.json"
+        self.manifest_log_path = self.archive_path / "manifest.log.jsonl"
         self.ensure_directories()
+        # Archiving is a plain rename when both folders share a filesystem.
+        self._same_device = self.inbox_path.stat().st_dev == self.archive_path.stat().st_dev
 
     def ensure_directories(self) -> None:
         self.inbox_path.mkdir(parents=True, exist_ok=True)
         self.archive_path.mkdir(parents=True, exist_ok=True)
 
     def load_manifest(self) -> dict[str, Any]:
+        """Return the processed manifest: manifest.json plus the append log."""
+        manifest = self._load_manifest_snapshot()
+        self._replay_manifest_log(manifest)
+        return manifest
+
+    def _load_manifest_snapshot(self) -> dict[str, Any]:
         if not self.manifest_path.exists():
             return {"processed": {}, "updated_at": None}
         try:
-            raw = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            raw = _json_loads(self.manifest_path.read_bytes())
             processed = raw.get("processed")
             if not isinstance(processed, dict):
                 processed = {}
@@ -95,49 +163,106 @@ class InboxScanner:
             )
             return {"processed": {}, "updated_at": None}
 
+    def _replay_manifest_log(self, manifest: dict[str, Any]) -> None:
+        try:
+            raw_lines = self.manifest_log_path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            logger.warning(
+                "inbox_manifest_log_load_warning | path=%s | error_type=%s | error=%s | fallback='snapshot only'",
+                self.manifest_log_path,
+                type(exc).__name__,
+                exc,
+            )
+            return
+
+        processed = manifest["processed"]
+        for line_number, raw_line in enumerate(raw_lines, start=1):
+            if not raw_line.strip():
+                continue
+            try:
+                record = _json_loads(raw_line)
+                signature = record["signature"]
+                processed[signature_key(signature)] = signature
+                manifest["updated_at"] = record.get("updated_at", manifest["updated_at"])
+            except Exception as exc:
+                # A torn final line from an interrupted append is expected.
+                logger.warning(
+                    "inbox_manifest_log_line_warning | path=%s | line=%s | error_type=%s | fallback='skip line'",
+                    self.manifest_log_path,
+                    line_number,
+                    type(exc).__name__,
+                )
+
     def save_manifest(self, manifest: dict[str, Any]) -> None:
+        """Write a full manifest.json snapshot and drop the now-redundant log."""
         self.archive_path.mkdir(parents=True, exist_ok=True)
         normalized = {
             "processed": manifest.get("processed", {}),
             "updated_at": _utc_now_iso(),
         }
+        payload = _json_dumps(normalized, indent=True)
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode="wb",
             dir=str(self.archive_path),
             delete=False,
             prefix="manifest-",
             suffix=".tmp",
         ) as tmp_file:
-            json.dump(normalized, tmp_file, ensure_ascii=False, indent=2)
-            tmp_file.flush()
-            os.fsync(tmp_file.fileno())
+            tmp_file.write(payload)
+            if self.durable:
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
             tmp_path = Path(tmp_file.name)
         os.replace(tmp_path, self.manifest_path)
+        self.manifest_log_path.unlink(missing_ok=True)
 
-    def _iter_inbox_files(self) -> list[Path]:
-        files: list[Path] = []
-        for path in self.inbox_path.iterdir():
-            if path.is_dir():
-                continue
-            if path.name.startswith("."):
-                continue
-            ext = path.suffix.lower()
-            if ext in SUPPORTED_CSV_EXTENSIONS or ext in SUPPORTED_RECEIPT_EXTENSIONS:
-                files.append(path)
-        files.sort(key=lambda item: (_safe_mtime_ns(item), item.name), reverse=True)
-        return files
-
-    def _is_processed(self, path: Path, manifest: dict[str, Any]) -> bool:
-        processed = manifest.get("processed", {})
-        if not isinstance(processed, dict):
-            return False
-        key = signature_key(file_signature(path))
-        return key in processed
+    def _append_manifest_log(self, signatures: list[dict[str, Any]]) -> None:
+        """Append processed signatures to the JSONL log in one write."""
+        if not signatures:
+            return
+        self.archive_path.mkdir(parents=True, exist_ok=True)
+        updated_at = _utc_now_iso()
+        payload = b"".join(
+            _json_dumps({"signature": signature, "updated_at": updated_at}) + b"\n" for signature in signatures
+        )
+        with self.manifest_log_path.open("a+b") as log_file:
+            # Start on a fresh line if an interrupted append left a torn one.
+            if log_file.seek(0, os.SEEK_END) > 0:
+                log_file.seek(-1, os.SEEK_END)
+                if log_file.read(1) != b"\n":
+                    payload = b"\n" + payload
+            log_file.write(payload)
+            if self.durable:
+                log_file.flush()
+                os.fsync(log_file.fileno())
+
+    def _iter_inbox_files(self) -> list[_InboxEntry]:
+        """List supported inbox files, newest first, with one stat per file."""
+        entries: list[_InboxEntry] = []
+        with os.scandir(self.inbox_path) as scan:
+            for entry in scan:
+                if entry.name.startswith("."):
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext not in _INBOX_EXTENSIONS:
+                    continue
+                if entry.is_dir():
+                    continue
+                try:
+                    stat = entry.stat()
+                    size, mtime_ns = int(stat.st_size), int(stat.st_mtime_ns)
+                except OSError:
+                    size, mtime_ns = 0, 0
+                entries.append(_InboxEntry(Path(entry.path), entry.name, ext, size, mtime_ns))
+        entries.sort(key=lambda item: (item.mtime_ns, item.name), reverse=True)
+        return entries
 
     def scan_batch(self) -> dict[str, Any]:
         """Return deterministic inbox scan result with status + optional batch object."""
-        discovered_at = _utc_now_iso()
+        now = datetime.now(timezone.utc)
+        discovered_at = now.isoformat()
         manifest = self.load_manifest()
         candidates = self._iter_inbox_files()
         if not candidates:
@@ -149,8 +274,14 @@ class InboxScanner:
                 "batch": None,
             }
 
-        fresh_files = [path for path in candidates if not self._is_processed(path, manifest)]
-        if not fresh_files:
+        processed = manifest.get("processed", {})
+        processed_signatures = _signature_tuples(processed) if isinstance(processed, dict) else set()
+        fresh_entries = [
+            entry
+            for entry in candidates
+            if (entry.name, entry.size, entry.mtime_ns) not in processed_signatures
+        ]
+        if not fresh_entries:
             return {
                 "status": "NO_BATCH",
                 "reason_code": "EMPTY_INBOX",
@@ -159,44 +290,44 @@ class InboxScanner:
                 "batch": None,
             }
 
-        csv_files = [path for path in fresh_files if path.suffix.lower() in SUPPORTED_CSV_EXTENSIONS]
-        receipt_files = [path for path in fresh_files if path.suffix.lower() in SUPPORTED_RECEIPT_EXTENSIONS]
+        csv_files = [entry for entry in fresh_entries if entry.ext in SUPPORTED_CSV_EXTENSIONS]
+        receipt_files = [entry for entry in fresh_entries if entry.ext in SUPPORTED_RECEIPT_EXTENSIONS]
 
         if not csv_files:
             return {
                 "status": "NO_BATCH",
                 "reason_code": "MISSING_CSV",
                 "discovered_at": discovered_at,
-                "new_files_count": len(fresh_files),
+                "new_files_count": len(fresh_entries),
                 "batch": None,
             }
 
         selected_csv = csv_files[0]  # newest CSV by mtime desc
-        receipts_sorted = sorted(receipt_files, key=lambda item: (_safe_mtime_ns(item), item.name), reverse=True)
+        # `candidates` is already newest-first, and filtering keeps that order.
         max_receipts = max(0, self.max_files_per_run - 1)
-        selected_receipts = receipts_sorted[:max_receipts]
+        selected_receipts = receipt_files[:max_receipts]
 
-        batch_id = f"batch_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}_{secrets.token_hex(2)}"
+        batch_id = f"batch_{now.strftime('%Y%m%dT%H%M%SZ')}_{secrets.token_hex(2)}"
         batch_files = [selected_csv, *selected_receipts]
         batch = {
             "batch_id": batch_id,
-            "csv_path": str(selected_csv),
-            "receipt_paths": [str(path) for path in selected_receipts],
+            "csv_path": str(selected_csv.path),
+            "receipt_paths": [str(entry.path) for entry in selected_receipts],
             "discovered_at": discovered_at,
             "counts": {
                 "csv_files": 1,
                 "receipt_files": len(selected_receipts),
                 "batch_files": len(batch_files),
-                "new_files": len(fresh_files),
+                "new_files": len(fresh_entries),
             },
-            "file_names": [path.name for path in batch_files],
-            "signatures": [file_signature(path) for path in batch_files],
+            "file_names": [entry.name for entry in batch_files],
+            "signatures": [_entry_signature(entry) for entry in batch_files],
         }
         return {
             "status": "BATCH_FOUND",
             "reason_code": None,
             "discovered_at": discovered_at,
-            "new_files_count": len(fresh_files),
+            "new_files_count": len(fresh_entries),
             "batch": batch,
         }
 
@@ -223,28 +354,28 @@ class InboxScanner:
                 continue
             destination = target_dir / safe_name
             if destination.exists():
+                # A random suffix is free on the first probe in practice,
+                # instead of walking _1, _2, ... past every earlier copy.
                 stem = destination.stem
                 suffix = destination.suffix
-                candidate = 1
-                while True:
-                    alt = target_dir / f"{stem}_{candidate}{suffix}"
-                    if not alt.exists():
-                        destination = alt
-                        break
-                    candidate += 1
-            shutil.move(str(source), str(destination))
+                while destination.exists():
+                    destination = target_dir / f"{stem}_{secrets.token_hex(4)}{suffix}"
+            if self._same_device:
+                os.replace(source, destination)
+            else:
+                shutil.move(str(source), str(destination))
             moved_file_names.append(destination.name)
 
         signatures = batch.get("signatures", [])
-        manifest = self.load_manifest()
-        processed = manifest.get("processed")
-        if not isinstance(processed, dict):
-            processed = {}
-        if isinstance(signatures, list):
-            for signature in signatures:
-                if not isinstance(signature, dict):
-                    continue
-                processed[signature_key(signature)] = signature
-        manifest["processed"] = processed
-        self.save_manifest(manifest)
+        if not isinstance(signatures, list):
+            signatures = []
+        # Appending keeps each archive O(batch size); the full manifest is
+        # only rewritten when it does not exist yet or the log has grown large.
+        self._append_manifest_log([signature for signature in signatures if isinstance(signature, dict)])
+        try:
+            log_size = self.manifest_log_path.stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+        if not self.manifest_path.exists() or log_size > MANIFEST_LOG_COMPACT_BYTES:
+            self.save_manifest(self.load_manifest())
         return moved_file_names
@@ -13,6 +13,35 @@ from typing import Callable, TypeVar
 
 T = TypeVar("T")
 
+# Exceptions `graceful` never swallows.
+_PASSTHROUGH_EXCEPTIONS = (KeyboardInterrupt, SystemExit)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders `%(asctime)s` once per second.
+
+    The date formats used here have one-second resolution, so every record
+    within the same second shares the cached string. Without a datefmt the
+    default format includes milliseconds and is not cached.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # (second, datefmt, text); replaced as a whole so threads never see a
+        # half-updated cache.
+        self._cached_time: tuple[int, str | None, str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_datefmt, text = self._cached_time
+        if second == cached_second and datefmt == cached_datefmt:
+            return text
+        text = super().formatTime(record, datefmt)
+        self._cached_time = (second, datefmt, text)
+        return text
+
 
 def setup_logging(level: int = logging.INFO, json_format: bool = False) -> None:
     """Configure root logger with consistent formatting.
@@ -25,14 +54,19 @@ def setup_logging(level: int = logging.INFO, json_format: bool = False) -> None:
     root.setLevel(level)
     root.handlers.clear()
 
+    # None of the formats below use thread/process fields; skip collecting them.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     if json_format:
-        formatter = logging.Formatter(
+        formatter = _CachedTimeFormatter(
             '{"timestamp":"%(asctime)s","level":"%(levelname)s",'
             '"module":"%(name)s","message":"%(message)s"}',
             datefmt="%H:%M:%S",
         )
     else:
-        formatter = logging.Formatter(
+        formatter = _CachedTimeFormatter(
             "%(asctime)s [%(name)-20s] %(levelname)-7s %(message)s",
             datefmt="%H:%M:%S",
         )
@@ -55,14 +89,15 @@ def graceful(default_factory: Callable[[], T], log_level: int = logging.ERROR):
     """
 
     def decorator(func):
+        logger = logging.getLogger(func.__module__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except (KeyboardInterrupt, SystemExit):
+            except _PASSTHROUGH_EXCEPTIONS:
                 raise
             except Exception as exc:  # pragma: no cover - defensive wrapper
-                logger = logging.getLogger(func.__module__)
                 logger.log(
                     log_level,
                     "%s failed: %s: %s",
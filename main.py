@@ -14,23 +14,55 @@ import argparse
 import json
 import logging
 import os
+import pickle
+import re
 import sys
+import tempfile
 import time
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import extract
 from diagnose import diagnose
 from explain import format_explanation, format_explanation_json
-from extract import extract_receipt
+from extract import extract_receipt, file_sha256, iter_extract_receipts, load_config
 from logging_config import get_logger, setup_logging
-from match import find_matches
+from match import DATE_PARSED_COLUMN, find_matches, prepare_transactions_df
 
 logger = get_logger("diagnostic-agent")
 
 REQUIRED_COLUMNS = ["merchant", "amount", "date"]
 OPTIONAL_COLUMNS = ["description", "transaction_id"]
 
+# Directory for the persistent load_transactions cache, set by --cache-dir.
+# None defers to TRANSACTIONS_CACHE_DIR from the environment/.env (read via
+# extract.load_config); "" turns the cache off, which is the default. Entries
+# are keyed on CSV content and named after the cache and pandas versions, so an
+# unchanged CSV is parsed and cleaned only once. RECON_CACHE_DISABLE=1 bypasses
+# the cache even when a directory is set.
+TRANSACTIONS_CACHE_DIR: str | None = None
+
+# Entries kept in the CSV cache directory. Each write drops entries from other
+# cache/pandas versions, then all but the most recently used ones.
+TRANSACTIONS_CACHE_MAX_ENTRIES = 16
+
+# Cache entry file names: "v<cache version>-pandas<version>-<sha256>.pkl", or a
+# bare "<sha256>.pkl" left by releases that did not name the version.
+_CACHE_ENTRY_NAME = re.compile(r"(?:v\d+-pandas.+-)?[0-9a-f]{64}\.pkl")
+
+# Currency symbol and thousands separators stripped from text amounts.
+_AMOUNT_SYMBOLS = re.compile(r"[$,]")
+
+# Bump whenever load_transactions changes the DataFrame it returns.
+TRANSACTIONS_CACHE_VERSION = 5
+
 
 def _configure_output_symbols() -> tuple[str, str]:
     """Configure stdout encoding and return safe line/fail symbols."""
@@ -50,8 +82,12 @@ def _configure_output_symbols() -> tuple[str, str]:
 BOX_CHAR, FAIL_CHAR = _configure_output_symbols()
 
 
-def load_transactions(csv_path: str) -> pd.DataFrame:
-    """Load and validate a bank transactions CSV file."""
+def load_transactions(csv_path: str, use_cache: bool = True) -> pd.DataFrame:
+    """Load and validate a bank transactions CSV file.
+
+    `use_cache=False` skips the persistent CSV cache even when it is enabled;
+    the web API passes it so uploaded statements are never kept on disk.
+    """
     if csv_path is None:
         raise ValueError("csv_path cannot be None")
 
@@ -65,23 +101,40 @@ def load_transactions(csv_path: str) -> pd.DataFrame:
             "Provide a valid CSV path with --csv"
         )
 
+    cache_key = _transactions_cache_key(csv_path) if use_cache and _transactions_cache_enabled() else None
+    if cache_key:
+        cached = _load_cached_transactions(cache_key)
+        if cached is not None:
+            logger.info(
+                "csv_cache_hit | path=%s | rows=%s | key=%s",
+                csv_path,
+                len(cached),
+                cache_key[:12],
+            )
+            # Stored after prepare_transactions_df, so the normalized columns
+            # and date order come back with it.
+            return cached
+
     try:
-        df = pd.read_csv(csv_path, encoding="utf-8-sig")
+        df = _read_csv(csv_path, encoding="utf-8-sig")
     except UnicodeDecodeError:
         logger.warning(
             "csv_encoding_warning | path=%s | reason='utf-8 decode failed' | fallback=latin-1",
             csv_path,
         )
-        df = pd.read_csv(csv_path, encoding="latin-1")
+        df = _read_csv(csv_path, encoding="latin-1")
     except Exception as exc:
         raise ValueError(f"Failed to read CSV '{csv_path}': {exc}") from exc
 
     if df is None:
         raise ValueError(f"Failed to read CSV '{csv_path}' - no DataFrame returned")
 
-    # Normalize column names and remove fully empty rows.
+    # Normalize column names and remove fully empty rows. read_csv already
+    # skips blank lines, so the filtered copy is usually not needed.
     df.columns = [str(col).strip().lower() for col in df.columns]
-    df = df.dropna(how="all").copy()
+    empty_rows = df.isna().all(axis=1).to_numpy()
+    if empty_rows.any():
+        df = df[~empty_rows].copy()
 
     if df.empty:
         raise ValueError(f"Transactions CSV is empty: {csv_path}")
@@ -100,19 +153,18 @@ def load_transactions(csv_path: str) -> pd.DataFrame:
         if optional not in df.columns:
             df[optional] = None
 
-    # Clean merchant/date strings for stability.
-    df["merchant"] = df["merchant"].astype(str).str.strip()
+    # Clean merchant/date strings for stability. Merchant names repeat heavily
+    # in bank exports, so the column is stored as a categorical.
+    df["merchant"] = df["merchant"].astype(str).str.strip().astype("category")
     df["date"] = df["date"].astype(str).str.strip()
 
-    # Coerce amount safely while preserving pipeline continuity.
-    amount_clean = (
-        df["amount"]
-        .astype(str)
-        .str.replace("$", "", regex=False)
-        .str.replace(",", "", regex=False)
-        .str.strip()
-    )
-    amount_numeric = pd.to_numeric(amount_clean, errors="coerce")
+    # Coerce amount safely while preserving pipeline continuity. A column the
+    # CSV reader already parsed as numbers skips the string round trip.
+    if df["amount"].dtype.kind in "iuf":
+        amount_numeric = pd.to_numeric(df["amount"], errors="coerce")
+    else:
+        amount_clean = df["amount"].astype(str).str.replace(_AMOUNT_SYMBOLS, "", regex=True).str.strip()
+        amount_numeric = pd.to_numeric(amount_clean, errors="coerce")
     invalid_amounts = int(amount_numeric.isna().sum())
     if invalid_amounts > 0:
         logger.warning(
@@ -128,9 +180,13 @@ def load_transactions(csv_path: str) -> pd.DataFrame:
         list(df.columns),
     )
 
+    # Normalize once here so every receipt matched against this frame reuses it.
+    df = prepare_transactions_df(df)
+
     try:
-        dates = pd.to_datetime(df["date"], errors="coerce")
-        valid_dates = dates.dropna()
+        # Reuse the dates prepare_transactions_df already parsed rather than
+        # letting pd.to_datetime infer a format for every row again.
+        valid_dates = df[DATE_PARSED_COLUMN].dropna()
         if not valid_dates.empty:
             logger.info(
                 "csv_date_range | min=%s | max=%s",
@@ -143,9 +199,184 @@ def load_transactions(csv_path: str) -> pd.DataFrame:
             exc,
         )
 
+    if cache_key:
+        _store_cached_transactions(cache_key, df)
     return df
 
 
+def _read_csv(csv_path: str, encoding: str) -> pd.DataFrame:
+    """Read a transactions CSV, using pandas' Arrow engine when pyarrow is installed.
+
+    The Arrow reader parses with multiple threads but infers a few types the C
+    engine does not (timestamps, booleans) and returns None for missing text.
+    Those frames, and CSVs Arrow rejects outright (e.g. ragged rows), are
+    re-read with the C engine so downstream cleaning sees the same values.
+    """
+    if pyarrow is not None:
+        try:
+            df = pd.read_csv(csv_path, encoding=encoding, engine="pyarrow")
+        except (pyarrow.ArrowException, pd.errors.ParserError) as exc:
+            logger.debug(
+                "csv_arrow_fallback | path=%s | error=%s | fallback='c engine'",
+                csv_path,
+                exc,
+            )
+        else:
+            if all(dtype.kind in "Ofi" for dtype in df.dtypes):
+                for column in df.columns:
+                    if df[column].dtype == object and df[column].isna().any():
+                        df[column] = df[column].where(df[column].notna(), np.nan)
+                return df
+            logger.debug(
+                "csv_arrow_fallback | path=%s | reason='inferred dtypes %s' | fallback='c engine'",
+                csv_path,
+                sorted({str(dtype) for dtype in df.dtypes if dtype.kind not in "Ofi"}),
+            )
+    return pd.read_csv(csv_path, encoding=encoding)
+
+
+def use_cache_dir(cache_dir: str) -> None:
+    """Enable the persistent caches under `cache_dir` (the --cache-dir option).
+
+    Both caches are off by default. ADE extraction results go to
+    `<cache_dir>/ade` and parsed CSVs to `<cache_dir>/transactions`. An empty
+    string disables both, including directories set through the environment.
+    """
+    global TRANSACTIONS_CACHE_DIR
+    cache_dir = str(cache_dir).strip()
+    if not cache_dir:
+        extract.ADE_CACHE_DIR = ""
+        TRANSACTIONS_CACHE_DIR = ""
+        return
+    root = Path(cache_dir).expanduser()
+    extract.ADE_CACHE_DIR = str(root / "ade")
+    TRANSACTIONS_CACHE_DIR = str(root / "transactions")
+    logger.info("cache_dir_configured | root=%s", root)
+
+
+def _transactions_cache_dir() -> str:
+    """Active CSV cache directory: the --cache-dir override, else the config."""
+    if TRANSACTIONS_CACHE_DIR is not None:
+        return TRANSACTIONS_CACHE_DIR
+    return load_config().transactions_cache_dir
+
+
+def _transactions_cache_enabled() -> bool:
+    return bool(_transactions_cache_dir()) and not load_config().cache_disabled
+
+
+def _transactions_cache_key(csv_path: str) -> str | None:
+    """Build the cache key: sha256 of the CSV bytes."""
+    try:
+        return file_sha256(Path(csv_path))
+    except OSError as exc:
+        logger.warning(
+            "csv_cache_key_warning | path=%s | error=%s | fallback='no cache'",
+            csv_path,
+            exc,
+        )
+        return None
+
+
+def _transactions_cache_prefix() -> str:
+    """File name prefix shared by every entry of the current cache version."""
+    return f"v{TRANSACTIONS_CACHE_VERSION}-pandas{pd.__version__}-"
+
+
+def _transactions_cache_file(cache_key: str) -> Path:
+    return Path(_transactions_cache_dir()) / f"{_transactions_cache_prefix()}{cache_key}.pkl"
+
+
+def _load_cached_transactions(cache_key: str) -> pd.DataFrame | None:
+    """Return the cached DataFrame for `cache_key`, or None on a miss."""
+    cache_file = _transactions_cache_file(cache_key)
+    try:
+        cached = pd.read_pickle(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning(
+            "csv_cache_read_warning | key=%s | error_type=%s | error=%s | fallback='cache miss'",
+            cache_key[:12],
+            type(exc).__name__,
+            exc,
+        )
+        return None
+    if not isinstance(cached, pd.DataFrame):
+        return None
+    try:
+        # Refresh the mtime so pruning evicts the least recently used entries.
+        os.utime(cache_file)
+    except OSError:
+        pass
+    return cached
+
+
+def _store_cached_transactions(cache_key: str, df: pd.DataFrame) -> None:
+    """Atomically pickle `df` into the cache via temp-file + replace, then prune."""
+    cache_dir = Path(_transactions_cache_dir())
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=str(cache_dir),
+            delete=False,
+            prefix=f"{cache_key[:12]}-",
+            suffix=".tmp",
+        ) as tmp_file:
+            df.to_pickle(tmp_file)
+            tmp_path = Path(tmp_file.name)
+        os.replace(tmp_path, _transactions_cache_file(cache_key))
+    except (OSError, pickle.PicklingError) as exc:
+        logger.warning(
+            "csv_cache_write_warning | key=%s | error=%s | fallback='not cached'",
+            cache_key[:12],
+            exc,
+        )
+        return
+    _prune_transactions_cache(cache_dir)
+
+
+def _prune_transactions_cache(cache_dir: Path) -> None:
+    """Delete entries from other cache/pandas versions and all but the newest
+    TRANSACTIONS_CACHE_MAX_ENTRIES current ones.
+
+    Only files named like cache entries are touched, so a cache directory that
+    also holds other files is safe.
+    """
+    prefix = _transactions_cache_prefix()
+    current: list[tuple[float, Path]] = []
+    stale: list[Path] = []
+    try:
+        for entry in cache_dir.iterdir():
+            if not _CACHE_ENTRY_NAME.fullmatch(entry.name):
+                continue
+            if entry.name.startswith(prefix):
+                current.append((entry.stat().st_mtime, entry))
+            else:
+                stale.append(entry)
+    except OSError as exc:
+        logger.warning(
+            "csv_cache_prune_warning | dir=%s | error=%s | fallback='entries kept'",
+            cache_dir,
+            exc,
+        )
+        return
+
+    current.sort(reverse=True)
+    evicted = [entry for _, entry in current[TRANSACTIONS_CACHE_MAX_ENTRIES:]]
+    for entry in stale + evicted:
+        try:
+            entry.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning(
+                "csv_cache_prune_warning | file=%s | error=%s | fallback='entry kept'",
+                entry.name,
+                exc,
+            )
+    if stale or evicted:
+        logger.debug("csv_cache_pruned | stale=%s | evicted=%s", len(stale), len(evicted))
+
+
 def run_pipeline(
     receipt_path: str,
     csv_path: str,
@@ -218,25 +449,28 @@ def run_pipeline(
 
 def _print_summary_table(results: list[tuple[str, str, float, str]]) -> None:
     """Print a formatted summary table for batch mode results."""
-    print(f"\n{BOX_CHAR * 60}")
-    print(f"  SUMMARY - {len(results)} receipt(s) processed")
-    print(f"{BOX_CHAR * 60}")
-    print()
-    print(f"  {'Receipt':<35} {'Diagnosis':<25} {'Conf':>5}")
-    print(f"  {'─' * 35} {'─' * 25} {'─' * 5}")
+    lines = [
+        f"\n{BOX_CHAR * 60}",
+        f"  SUMMARY - {len(results)} receipt(s) processed",
+        f"{BOX_CHAR * 60}",
+        "",
+        f"  {'Receipt':<35} {'Diagnosis':<25} {'Conf':>5}",
+        f"  {'─' * 35} {'─' * 25} {'─' * 5}",
+    ]
 
     for filename, summary, confidence, _matched_merchant in results:
         short_name = filename[:33] + ".." if len(filename) > 35 else filename
         short_summary = summary[:23] + ".." if len(summary) > 25 else summary
-        print(f"  {short_name:<35} {short_summary:<25} {confidence:>4.0f}%")
+        lines.append(f"  {short_name:<35} {short_summary:<25} {confidence:>4.0f}%")
 
-    print()
-    print(f"{BOX_CHAR * 60}")
+    lines.extend(["", f"{BOX_CHAR * 60}", ""])
+    sys.stdout.write("\n".join(lines))
 
 
-def run_all_test_receipts(csv_path: str) -> None:
+def run_all_test_receipts(csv_path: str, transactions_df: pd.DataFrame | None = None) -> None:
     """Run the diagnostic pipeline on all files in test_data/receipts/."""
-    transactions_df = load_transactions(csv_path)
+    if transactions_df is None:
+        transactions_df = load_transactions(csv_path)
 
     receipts_dir = Path("test_data/receipts")
     if not receipts_dir.is_dir():
@@ -258,22 +492,28 @@ def run_all_test_receipts(csv_path: str) -> None:
     logger.info("batch_start | receipt_count=%s | directory=%s", len(receipt_files), receipts_dir)
     results: list[tuple[str, str, float, str]] = []
 
-    for index, filename in enumerate(receipt_files, start=1):
-        receipt_path = str(receipts_dir / filename)
-        print(f"\n{BOX_CHAR * 60}")
-        print(f"  Receipt {index}/{len(receipt_files)}: {filename}")
-        print(f"{BOX_CHAR * 60}")
+    # Receipts are independent, so every extraction is queued on the shared
+    # extract pool at once. Results stream back in filename order, and the
+    # match/diagnose/explain stages for one receipt run while later receipts
+    # are still being extracted.
+    receipts = iter_extract_receipts([str(receipts_dir / filename) for filename in receipt_files])
+
+    # Each receipt's block is written to stdout in one call rather than a
+    # print (and flush) per line.
+    for index, (filename, receipt) in enumerate(zip(receipt_files, receipts), start=1):
+        header = f"\n{BOX_CHAR * 60}\n  Receipt {index}/{len(receipt_files)}: {filename}\n{BOX_CHAR * 60}\n"
 
         try:
+            if isinstance(receipt, BaseException):
+                raise receipt
             start = time.time()
-            receipt = extract_receipt(receipt_path)
             matches = find_matches(receipt, transactions_df)
             diagnosis = diagnose(matches, receipt)
             explanation = format_explanation(diagnosis)
             diagnosis.explanation = explanation
             elapsed = time.time() - start
 
-            print(explanation)
+            sys.stdout.write(f"{header}{explanation}\n")
             logger.info(
                 "batch_receipt_complete | file=%s | diagnosis=%r | confidence=%.1f%% | duration_s=%.2f",
                 filename,
@@ -297,7 +537,7 @@ def run_all_test_receipts(csv_path: str) -> None:
                 exc,
                 exc_info=True,
             )
-            print(f"\n  {FAIL_CHAR} Error processing {filename}: {exc}\n")
+            sys.stdout.write(f"{header}\n  {FAIL_CHAR} Error processing {filename}: {exc}\n\n")
             results.append((filename, "ERROR", 0.0, str(exc)[:40]))
 
     _print_summary_table(results)
@@ -353,6 +593,15 @@ def main() -> None:
         action="store_true",
         help="Output results as JSON instead of formatted text (single receipt mode)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=(
+            "Enable the extraction and CSV caches under this directory "
+            "(default: off; pass '' to also ignore ADE_CACHE_DIR/TRANSACTIONS_CACHE_DIR)"
+        ),
+    )
     parser.add_argument(
         "--log-json",
         action="store_true",
@@ -365,27 +614,32 @@ def main() -> None:
         json_format=args.log_json,
     )
 
+    if args.cache_dir is not None:
+        use_cache_dir(args.cache_dir)
+
     if not args.receipt and not args.all:
         parser.error("Provide either --receipt PATH or --all")
     if args.receipt and args.all:
         parser.error("Use --receipt OR --all, not both")
 
     try:
+        # Every mode works from the same frame, loaded once per invocation.
+        transactions_df = load_transactions(args.csv)
+
         if args.all:
             logger.info("cli_mode | mode=batch | csv=%s", args.csv)
-            run_all_test_receipts(args.csv)
+            run_all_test_receipts(args.csv, transactions_df)
             return
 
         logger.info("cli_mode | mode=single | receipt=%s | csv=%s", args.receipt, args.csv)
         if args.json:
-            transactions_df = load_transactions(args.csv)
             receipt = extract_receipt(args.receipt)
             matches = find_matches(receipt, transactions_df)
             diagnosis = diagnose(matches, receipt)
             result = format_explanation_json(diagnosis)
             print(json.dumps(result, indent=2))
         else:
-            explanation = run_pipeline(args.receipt, args.csv)
+            explanation = run_pipeline(args.receipt, args.csv, transactions_df)
             print(explanation)
     except FileNotFoundError as exc:
         logger.error("cli_error | type=FileNotFoundError | error=%s", exc)
@@ -14,11 +14,13 @@ why each score was assigned.
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Iterator, Sequence
 
+import numpy as np
 import pandas as pd
 
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError:
     from difflib import SequenceMatcher
 
@@ -30,6 +32,7 @@ except ImportError:
             return SequenceMatcher(None, s1, s2).ratio() * 100.0
 
     fuzz = _FuzzFallback()
+    process = None
 
 from logging_config import get_logger
 from models import MatchCandidate, ReceiptData, Transaction
@@ -49,77 +52,81 @@ MAX_DATE_DIFF_DAYS = 3
 MIN_CONFIDENCE_THRESHOLD = 30.0
 MAX_RESULTS = 3
 
+# Hidden columns attached by prepare_transactions_df so a DataFrame shared by
+# many receipts is normalized once instead of once per receipt.
+MERCHANT_NORM_COLUMN = "_merchant_norm"
+DATE_NORM_COLUMN = "_date_norm"
+DATE_PARSED_COLUMN = "_date_parsed"
+AMOUNT_NORM_COLUMN = "_amount_norm"
+_NORMALIZED_COLUMNS = (
+    MERCHANT_NORM_COLUMN,
+    DATE_NORM_COLUMN,
+    DATE_PARSED_COLUMN,
+    AMOUNT_NORM_COLUMN,
+)
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+_NS_PER_DAY = 86_400 * 10**9
+
+# Slack, in vendor-score points, for the threshold pruning in find_matches; it
+# covers rounding of the overall confidence to one decimal.
+_VENDOR_CUTOFF_MARGIN = 1.0
+
+# Relative band around .5 ties where _round_array defers to round(); far wider
+# than the one-ulp error of scaling by a power of ten.
+_TIE_TOLERANCE = 1e-9
+
+# df.attrs key for the date-sorted row order built by prepare_transactions_df.
+DATE_ORDER_ATTR = "date_order"
+
 
 def score_vendor(receipt_vendor: str, transaction_merchant: str) -> tuple[float, str]:
     """Score vendor name similarity between receipt and transaction."""
-    rv = normalize_vendor(receipt_vendor)
-    tm = normalize_vendor(transaction_merchant)
+    return _score_vendor_normalized(
+        normalize_vendor(receipt_vendor),
+        normalize_vendor(transaction_merchant),
+        receipt_vendor,
+        transaction_merchant,
+    )
+
+
+def _score_vendor_normalized(
+    rv: str,
+    tm: str,
+    receipt_vendor: str,
+    transaction_merchant: str,
+) -> tuple[float, str]:
+    """Body of score_vendor for names already run through normalize_vendor.
 
+    The raw names are only used for the debug log.
+    """
     if not rv and not tm:
         score = 0.0
         evidence = "Both vendor names are empty - cannot compare"
-        logger.debug(
-            "vendor_scoring | receipt_raw=%r | receipt_norm=%r | bank_raw=%r | bank_norm=%r | score=%.1f",
-            receipt_vendor,
-            rv,
-            transaction_merchant,
-            tm,
-            score,
-        )
-        return score, evidence
-
-    if not rv:
+    elif not rv:
         score = 0.0
         evidence = f"Receipt vendor name is empty (bank: '{tm}')"
-        logger.debug(
-            "vendor_scoring | receipt_raw=%r | receipt_norm=%r | bank_raw=%r | bank_norm=%r | score=%.1f",
-            receipt_vendor,
-            rv,
-            transaction_merchant,
-            tm,
-            score,
-        )
-        return score, evidence
-
-    if not tm:
+    elif not tm:
         score = 0.0
         evidence = f"Bank merchant name is empty (receipt: '{rv}')"
-        logger.debug(
-            "vendor_scoring | receipt_raw=%r | receipt_norm=%r | bank_raw=%r | bank_norm=%r | score=%.1f",
-            receipt_vendor,
-            rv,
-            transaction_merchant,
-            tm,
-            score,
-        )
-        return score, evidence
-
-    if rv == tm:
+    elif rv == tm:
         score = 100.0
         evidence = f"Vendor names match exactly: '{rv}'"
-        logger.debug(
-            "vendor_scoring | receipt_raw=%r | receipt_norm=%r | bank_raw=%r | bank_norm=%r | score=%.1f",
-            receipt_vendor,
-            rv,
-            transaction_merchant,
-            tm,
-            score,
-        )
-        return score, evidence
-
-    score = round(float(fuzz.ratio(rv, tm)), 1)
-    score = max(0.0, min(100.0, score))
-
-    if score >= 95:
-        evidence = f"Vendor names match: '{rv}' ~ '{tm}' (score: {score})"
-    elif score >= 80:
-        evidence = f"Vendor names similar: '{rv}' ~ '{tm}' (score: {score})"
-    elif score >= 60:
-        evidence = f"Vendor names differ: '{rv}' vs '{tm}' (score: {score})"
-    elif score >= 40:
-        evidence = f"Vendor names weakly similar: '{rv}' vs '{tm}' (score: {score})"
     else:
-        evidence = f"Vendor names unrelated: '{rv}' vs '{tm}' (score: {score})"
+        score = round(float(fuzz.ratio(rv, tm)), 1)
+        score = max(0.0, min(100.0, score))
+
+        if score >= 95:
+            evidence = f"Vendor names match: '{rv}' ~ '{tm}' (score: {score})"
+        elif score >= 80:
+            evidence = f"Vendor names similar: '{rv}' ~ '{tm}' (score: {score})"
+        elif score >= 60:
+            evidence = f"Vendor names differ: '{rv}' vs '{tm}' (score: {score})"
+        elif score >= 40:
+            evidence = f"Vendor names weakly similar: '{rv}' vs '{tm}' (score: {score})"
+        else:
+            evidence = f"Vendor names unrelated: '{rv}' vs '{tm}' (score: {score})"
 
     logger.debug(
         "vendor_scoring | receipt_raw=%r | receipt_norm=%r | bank_raw=%r | bank_norm=%r | score=%.1f",
@@ -207,9 +214,11 @@ def score_amount(receipt_total: float, transaction_amount: float) -> tuple[float
 
 def score_date(receipt_date: str, transaction_date: str) -> tuple[float, int, str]:
     """Score date proximity between receipt and transaction."""
-    rd = normalize_date(receipt_date)
-    td = normalize_date(transaction_date)
+    return _score_date_normalized(normalize_date(receipt_date), normalize_date(transaction_date))
+
 
+def _score_date_normalized(rd: str, td: str) -> tuple[float, int, str]:
+    """Body of score_date for dates already run through normalize_date."""
     if not rd and not td:
         score = 0.0
         days_apart = 999
@@ -290,6 +299,382 @@ def score_date(receipt_date: str, transaction_date: str) -> tuple[float, int, st
     return score, days_apart, evidence
 
 
+def _normalize_merchants(values: pd.Series) -> pd.Categorical:
+    """Normalize merchant names, running normalize_vendor once per distinct name."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        distinct = values.cat.categories.tolist()
+    else:
+        codes, distinct_index = pd.factorize(values)
+        distinct = distinct_index.tolist()
+    # Missing values carry code -1, which picks up the trailing "".
+    normalized = [normalize_vendor(str(value)) for value in distinct] + [""]
+    normalized_codes, normalized_distinct = pd.factorize(np.asarray(normalized, dtype=object))
+    return pd.Categorical.from_codes(normalized_codes[codes], categories=normalized_distinct)
+
+
+def _normalize_dates(values: pd.Series) -> tuple[list[str], np.ndarray]:
+    """Normalize and parse dates, running normalize_date once per distinct value.
+
+    Bank exports carry many rows per day, and normalize_date falls back to
+    dateutil, so the per-value work is by far the slowest part of preparing
+    a frame.
+    """
+    codes, distinct = pd.factorize(values)
+    # Missing values carry code -1, which picks up the trailing "".
+    normalized = np.asarray(
+        [normalize_date(str(value)) for value in distinct.tolist()] + [""],
+        dtype=object,
+    )
+    parsed = pd.to_datetime(
+        pd.Series(normalized, dtype=object),
+        format="%Y-%m-%d",
+        errors="coerce",
+    ).to_numpy(dtype="datetime64[ns]")
+    return normalized[codes].tolist(), parsed[codes]
+
+
+def _normalize_amounts(values: pd.Series) -> np.ndarray:
+    return np.fromiter(
+        (normalize_amount(value if pd.notna(value) else 0.0) for value in values.tolist()),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+class _DateOrder:
+    """Row positions of a prepared frame sorted by transaction date.
+
+    Lets find_matches cut the settlement window with two binary searches
+    instead of a pass over every row. The frame itself keeps its CSV order
+    because ranking ties and session intake rely on it. Equality is identity,
+    so pandas never tries to compare the arrays when combining attrs.
+    """
+
+    __slots__ = ("index", "positions", "days", "undated")
+
+    def __init__(self, index: pd.Index, positions: np.ndarray, days: np.ndarray, undated: np.ndarray):
+        # Index of the frame the positions refer to; a re-ordered or filtered
+        # frame no longer matches it.
+        self.index = index
+        # Positions of rows with a parsed date, ordered by that date.
+        self.positions = positions
+        # Days since 1970-01-01 for `positions`, ascending.
+        self.days = days
+        # Positions of rows pd.to_datetime could not parse (missing or out of range).
+        self.undated = undated
+
+    def __deepcopy__(self, memo: dict) -> _DateOrder:
+        # pandas deep-copies attrs onto every Series or frame derived from a
+        # prepared frame. Nothing here is mutated after construction, so the
+        # copies can share it instead of duplicating four row-sized arrays.
+        return self
+
+
+def _epoch_days(dates_parsed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (days since 1970-01-01, mask of non-NaT entries) for datetime64[ns] values.
+
+    Integer floor division on the raw nanoseconds: numpy's own ns -> D cast
+    wraps around for dates near the 1677 end of the range.
+    """
+    dated = ~np.isnat(dates_parsed)
+    return dates_parsed.view(np.int64) // _NS_PER_DAY, dated
+
+
+def _build_date_order(index: pd.Index, dates_parsed: np.ndarray) -> _DateOrder:
+    day_numbers, dated = _epoch_days(dates_parsed)
+    positions = np.flatnonzero(dated)
+    days = day_numbers[dated]
+    order = np.argsort(days, kind="stable")
+    return _DateOrder(index.copy(), positions[order], days[order], np.flatnonzero(~dated))
+
+
+def _is_prepared(df: pd.DataFrame) -> bool:
+    return bool(df.attrs.get("normalized")) and all(
+        column in df.columns for column in _NORMALIZED_COLUMNS
+    )
+
+
+def prepare_transactions_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Attach normalized merchant/date/amount columns to a transactions DataFrame.
+
+    find_matches reuses these columns instead of re-normalizing every row for
+    every receipt. The frame is modified in place and returned. Every call
+    recomputes the columns and the date order, so re-run it after editing the
+    raw merchant/date/amount columns of a prepared frame.
+    """
+    dates_norm, dates_parsed = _normalize_dates(df["date"])
+    # Categorical, so each distinct merchant name is stored (and fuzz-scored
+    # per receipt) once however many rows repeat it.
+    df[MERCHANT_NORM_COLUMN] = _normalize_merchants(df["merchant"])
+    df[DATE_NORM_COLUMN] = dates_norm
+    df[DATE_PARSED_COLUMN] = dates_parsed
+    df[AMOUNT_NORM_COLUMN] = _normalize_amounts(df["amount"])
+    df.attrs[DATE_ORDER_ATTR] = _build_date_order(df.index, dates_parsed)
+    df.attrs["normalized"] = True
+    logger.debug("transactions_prepared | rows=%s", len(df))
+    return df
+
+
+def _round_array(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Round each element exactly like Python's round() so scores match the scalar scorers.
+
+    np.rint on the scaled value picks the same digit as round() unless the
+    scaled value sits within float error of a .5 tie; only those few elements
+    go through round() itself.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0**ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    with np.errstate(invalid="ignore"):
+        distance_to_tie = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = np.flatnonzero(distance_to_tie <= _TIE_TOLERANCE * np.maximum(1.0, np.abs(scaled)))
+    for position in near_tie.tolist():
+        rounded[position] = round(float(values[position]), ndigits)
+    return rounded
+
+
+def _days_apart_array(
+    receipt_date: str,
+    dates_norm: list[str],
+    dates_parsed: np.ndarray,
+) -> np.ndarray:
+    """Vectorized counterpart of score_date's day gap (999 when not comparable).
+
+    `dates_parsed` holds `dates_norm` parsed once by pd.to_datetime. Dates
+    outside the datetime64[ns] range come back as NaT there and are parsed
+    with strptime instead, so far-off years still count as a date mismatch.
+    """
+    days = np.full(len(dates_norm), 999, dtype=np.int64)
+    rd = normalize_date(receipt_date)
+    if not rd:
+        return days
+    try:
+        r_ordinal = datetime.strptime(rd, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return days
+
+    # Day resolution keeps the subtraction in int64, free of ns overflow.
+    parsed_days, valid = _epoch_days(dates_parsed)
+    days[valid] = np.abs(parsed_days[valid] - (r_ordinal - _EPOCH_ORDINAL))
+
+    ordinals: dict[str, int | None] = {}
+    for position in np.flatnonzero(~valid).tolist():
+        td = dates_norm[position]
+        if not td:
+            continue
+        if td not in ordinals:
+            try:
+                ordinals[td] = datetime.strptime(td, "%Y-%m-%d").toordinal()
+            except ValueError:
+                ordinals[td] = None
+        t_ordinal = ordinals[td]
+        if t_ordinal is not None:
+            days[position] = abs(t_ordinal - r_ordinal)
+    return days
+
+
+def _date_window(
+    df: pd.DataFrame,
+    receipt_date: str,
+) -> tuple[np.ndarray, np.ndarray, int] | None:
+    """Find the rows inside the settlement window via the frame's date order.
+
+    Returns (positions in CSV order, their day gaps, rows skipped on date), or
+    None when the frame has no usable date order or the receipt has no
+    comparable date; the caller then scans every row.
+    """
+    order = df.attrs.get(DATE_ORDER_ATTR)
+    if not isinstance(order, _DateOrder) or not order.index.equals(df.index):
+        return None
+    rd = normalize_date(receipt_date)
+    if not rd:
+        return None
+    try:
+        r_days = datetime.strptime(rd, "%Y-%m-%d").toordinal() - _EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+    lo = int(np.searchsorted(order.days, r_days - MAX_DATE_DIFF_DAYS, side="left"))
+    hi = int(np.searchsorted(order.days, r_days + MAX_DATE_DIFF_DAYS, side="right"))
+
+    # Undated rows are few: missing dates (999, always kept) and years outside
+    # the datetime64[ns] range, which score_date still compares via strptime.
+    undated_days = _days_apart_array(
+        receipt_date,
+        df[DATE_NORM_COLUMN].to_numpy(dtype=object)[order.undated].tolist(),
+        df[DATE_PARSED_COLUMN].to_numpy(dtype="datetime64[ns]")[order.undated],
+    )
+    undated_kept = (undated_days <= MAX_DATE_DIFF_DAYS) | (undated_days == 999)
+
+    positions = np.concatenate([order.positions[lo:hi], order.undated[undated_kept]])
+    days = np.concatenate([np.abs(order.days[lo:hi] - r_days), undated_days[undated_kept]])
+    skipped = (len(order.days) - (hi - lo)) + int((~undated_kept).sum())
+    csv_order = np.argsort(positions, kind="stable")
+    return positions[csv_order], days[csv_order], skipped
+
+
+def _vendor_score_array(
+    receipt_vendor: str,
+    merchants_norm: Sequence[str] | pd.Categorical,
+    score_cutoff: float = 0.0,
+) -> np.ndarray:
+    """Vectorized counterpart of score_vendor's numeric score.
+
+    Ratios below `score_cutoff` may come back as 0.0: rapidfuzz abandons a
+    pair as soon as its bounds show the cutoff is out of reach.
+
+    Each distinct merchant is scored once and the scores are scattered back
+    to the rows. A Categorical (prepared frames) is deduplicated by its
+    integer codes; plain strings are hashed with pd.factorize.
+    """
+    rv = normalize_vendor(receipt_vendor)
+    if not rv:
+        return np.zeros(len(merchants_norm), dtype=np.float64)
+
+    if isinstance(merchants_norm, pd.Categorical):
+        # Only the categories present in this window are scored. A narrow
+        # window sorts its few codes; a wide one renumbers them through a
+        # lookup table sized to the categories instead.
+        window_codes = merchants_norm.codes
+        categories = merchants_norm.categories
+        if len(window_codes) < len(categories):
+            used, codes = np.unique(window_codes, return_inverse=True)
+        else:
+            present = np.zeros(len(categories), dtype=bool)
+            present[window_codes] = True
+            used = np.flatnonzero(present)
+            codes = (np.cumsum(present) - 1)[window_codes]
+        uniques = categories.take(used).tolist()
+    else:
+        codes, unique_index = pd.factorize(np.asarray(merchants_norm, dtype=object))
+        uniques = unique_index.tolist()
+    return _score_unique_merchants(rv, uniques, score_cutoff)[codes]
+
+
+def _score_unique_merchants(rv: str, merchants_norm: list[str], score_cutoff: float) -> np.ndarray:
+    """Score the normalized receipt vendor `rv` against distinct merchants."""
+    if process is not None:
+        # One cdist call scores every merchant in C (multi-threaded) instead of
+        # one fuzz.ratio round trip per row. float64 keeps the scores identical
+        # to the scalar fuzz.ratio path before rounding.
+        ratios = process.cdist(
+            [rv],
+            merchants_norm,
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+            workers=-1,
+            score_cutoff=score_cutoff or None,
+        )[0]
+    else:
+        ratios = [float(fuzz.ratio(rv, tm)) for tm in merchants_norm]
+
+    scores = np.clip(_round_array(np.asarray(ratios, dtype=np.float64), 1), 0.0, 100.0)
+    merchants = np.asarray(merchants_norm, dtype=object)
+    scores[merchants == rv] = 100.0
+    scores[merchants == ""] = 0.0
+    return scores
+
+
+def _amount_score_array(receipt_total: float, amounts: np.ndarray) -> np.ndarray:
+    """Vectorized counterpart of score_amount's numeric score."""
+    receipt_value = normalize_amount(receipt_total)
+    if receipt_value <= 0.0:
+        return np.zeros(len(amounts), dtype=np.float64)
+    abs_diff = _round_array(np.abs(receipt_value - amounts), 2)
+    scores = np.maximum(0.0, 1.0 - (abs_diff / receipt_value) / 0.25) * 100.0
+    return _round_array(np.minimum(100.0, scores), 1)
+
+
+def _ranked_batches(overall: np.ndarray, above: np.ndarray) -> Iterator[np.ndarray]:
+    """Yield `above` in descending `overall` order, ties kept in CSV order.
+
+    np.partition finds the MAX_RESULTS-th best score in O(n), so only the
+    shortlist scoring at least that much (ties included) is sorted up front.
+    The rest is sorted only if a shortlisted row fails to build.
+    """
+    if len(above) > MAX_RESULTS:
+        scores = overall[above]
+        kth_best = np.partition(scores, len(scores) - MAX_RESULTS)[len(scores) - MAX_RESULTS]
+        in_shortlist = scores >= kth_best
+        batches = (above[in_shortlist], above[~in_shortlist])
+    else:
+        batches = (above,)
+    for batch in batches:
+        # Stable descending order so tied confidences keep their CSV order.
+        yield batch[np.argsort(-overall[batch], kind="stable")]
+
+
+def _build_candidate(
+    valid_df: pd.DataFrame,
+    position: int,
+    receipt_vendor: str,
+    receipt_total: float,
+    rv: str,
+    rd: str,
+    prepared: bool,
+) -> MatchCandidate | None:
+    """Materialize one MatchCandidate, with evidence, for a ranked row.
+
+    `rv` and `rd` are the receipt vendor and date already normalized once by
+    find_matches. A prepared frame also supplies the row's normalized
+    merchant and date, so no string is normalized twice.
+    """
+    idx = valid_df.index[position]
+    # Scalar lookups on the few columns used; iloc would box the whole row.
+    row = {
+        column: valid_df[column].iat[position]
+        for column in ("merchant", "amount", "date", "description", "transaction_id")
+        if column in valid_df.columns
+    }
+    try:
+        raw_date = str(row["date"]) if pd.notna(row["date"]) else ""
+        td = valid_df[DATE_NORM_COLUMN].iat[position] if prepared else normalize_date(raw_date)
+        d_score, days_apart, d_evidence = _score_date_normalized(rd, td)
+
+        raw_merchant = str(row["merchant"]) if pd.notna(row["merchant"]) else ""
+        amount_value = normalize_amount(row["amount"] if pd.notna(row["amount"]) else 0.0)
+
+        tm = valid_df[MERCHANT_NORM_COLUMN].iat[position] if prepared else normalize_vendor(raw_merchant)
+        v_score, v_evidence = _score_vendor_normalized(rv, tm, receipt_vendor, raw_merchant)
+        a_score, abs_diff, pct_diff, a_evidence = score_amount(receipt_total, amount_value)
+
+        overall = round(
+            v_score * VENDOR_WEIGHT
+            + a_score * AMOUNT_WEIGHT
+            + d_score * DATE_WEIGHT,
+            1,
+        )
+
+        description_raw = row.get("description", None)
+        transaction_id_raw = row.get("transaction_id", None)
+
+        return MatchCandidate(
+            transaction=Transaction(
+                merchant=raw_merchant,
+                amount=amount_value,
+                date=raw_date,
+                description=str(description_raw) if pd.notna(description_raw) else None,
+                transaction_id=str(transaction_id_raw) if pd.notna(transaction_id_raw) else None,
+            ),
+            vendor_score=v_score,
+            amount_diff=abs_diff,
+            amount_pct_diff=pct_diff,
+            date_diff=days_apart,
+            overall_confidence=overall,
+            evidence=[v_evidence, a_evidence, d_evidence],
+        )
+    except Exception as exc:
+        logger.warning(
+            "matching_row_error | row_index=%s | merchant=%r | error=%s | fallback='skip row'",
+            idx,
+            row.get("merchant", "?"),
+            exc,
+        )
+        return None
+
+
 def find_matches(receipt: ReceiptData, transactions_df: pd.DataFrame) -> list[MatchCandidate]:
     """Find best matching transactions for a receipt."""
     if receipt is None:
@@ -335,7 +720,10 @@ def find_matches(receipt: ReceiptData, transactions_df: pd.DataFrame) -> list[Ma
         )
 
     original_len = len(transactions_df)
-    valid_df = transactions_df.dropna(subset=["merchant", "amount"]).copy()
+    # valid_df is only read below, so skip the copy when no row is dropped;
+    # that also keeps the frame's date order usable.
+    missing = transactions_df["merchant"].isna().to_numpy() | transactions_df["amount"].isna().to_numpy()
+    valid_df = transactions_df[~missing] if missing.any() else transactions_df
     dropped_rows = original_len - len(valid_df)
     if dropped_rows > 0:
         logger.warning(
@@ -348,69 +736,79 @@ def find_matches(receipt: ReceiptData, transactions_df: pd.DataFrame) -> list[Ma
         logger.warning("matching_input_warning | no_valid_rows_after_dropna=True | fallback=[]")
         return []
 
-    candidates: list[MatchCandidate] = []
-    skipped_date = 0
-
-    for idx, row in valid_df.iterrows():
-        try:
-            raw_date = str(row["date"]) if pd.notna(row["date"]) else ""
-            d_score, days_apart, d_evidence = score_date(receipt_date, raw_date)
-            if days_apart > MAX_DATE_DIFF_DAYS and days_apart != 999:
-                skipped_date += 1
-                continue
-
-            raw_merchant = str(row["merchant"]) if pd.notna(row["merchant"]) else ""
-            amount_value = normalize_amount(row["amount"] if pd.notna(row["amount"]) else 0.0)
-
-            v_score, v_evidence = score_vendor(receipt_vendor, raw_merchant)
-            a_score, abs_diff, pct_diff, a_evidence = score_amount(receipt_total, amount_value)
+    prepared = _is_prepared(valid_df)
+    date_window = _date_window(valid_df, receipt_date) if prepared else None
+    if date_window is not None:
+        window, window_days, skipped_date = date_window
+    else:
+        if prepared:
+            dates_norm = valid_df[DATE_NORM_COLUMN].tolist()
+            dates_parsed = valid_df[DATE_PARSED_COLUMN].to_numpy(dtype="datetime64[ns]")
+        else:
+            dates_norm, dates_parsed = _normalize_dates(valid_df["date"])
+
+        days_apart = _days_apart_array(receipt_date, dates_norm, dates_parsed)
+        date_skipped = (days_apart > MAX_DATE_DIFF_DAYS) & (days_apart != 999)
+        skipped_date = int(date_skipped.sum())
+        window = np.flatnonzero(~date_skipped)
+        window_days = days_apart[window]
+
+    # Cheap date filter first: vendor fuzz and amount scoring only run on the
+    # rows inside the settlement window (or with no comparable date).
+    if prepared:
+        merchants_norm = valid_df[MERCHANT_NORM_COLUMN].array[window]
+        amounts = valid_df[AMOUNT_NORM_COLUMN].to_numpy(dtype=np.float64)[window]
+    else:
+        window_df = valid_df.iloc[window]
+        merchants_norm = _normalize_merchants(window_df["merchant"])
+        amounts = _normalize_amounts(window_df["amount"])
+
+    a_scores = _amount_score_array(receipt_total, amounts)
+    d_scores = _round_array(np.maximum(0.0, 1.0 - window_days / 5.0) * 100.0, 1)
+
+    # Smallest vendor score any row still needs to reach the threshold. A
+    # ratio more than a point below it can only belong to a below-threshold
+    # row, so rapidfuzz may give up on it early and report 0.0.
+    needed = (MIN_CONFIDENCE_THRESHOLD - (a_scores * AMOUNT_WEIGHT + d_scores * DATE_WEIGHT)) / VENDOR_WEIGHT
+    score_cutoff = max(0.0, float(needed.min()) - _VENDOR_CUTOFF_MARGIN) if len(needed) else 0.0
+    v_scores = _vendor_score_array(receipt_vendor, merchants_norm, score_cutoff)
+
+    overall = _round_array(
+        v_scores * VENDOR_WEIGHT + a_scores * AMOUNT_WEIGHT + d_scores * DATE_WEIGHT,
+        1,
+    )
 
-            overall = round(
-                v_score * VENDOR_WEIGHT
-                + a_score * AMOUNT_WEIGHT
-                + d_score * DATE_WEIGHT,
-                1,
-            )
+    scored_count = len(window)
+    above_local = np.flatnonzero(overall >= MIN_CONFIDENCE_THRESHOLD)
 
-            description_raw = row.get("description", None)
-            transaction_id_raw = row.get("transaction_id", None)
-
-            candidate = MatchCandidate(
-                transaction=Transaction(
-                    merchant=raw_merchant,
-                    amount=amount_value,
-                    date=raw_date,
-                    description=str(description_raw) if pd.notna(description_raw) else None,
-                    transaction_id=str(transaction_id_raw) if pd.notna(transaction_id_raw) else None,
-                ),
-                vendor_score=v_score,
-                amount_diff=abs_diff,
-                amount_pct_diff=pct_diff,
-                date_diff=days_apart,
-                overall_confidence=overall,
-                evidence=[v_evidence, a_evidence, d_evidence],
-            )
-            candidates.append(candidate)
-        except Exception as exc:
-            logger.warning(
-                "matching_row_error | row_index=%s | merchant=%r | error=%s | fallback='skip row'",
-                idx,
-                row.get("merchant", "?"),
-                exc,
+    # Evidence strings and models are only built for the rows that can make
+    # the final cut; a row that fails to build hands its slot to the next one.
+    rv = normalize_vendor(receipt_vendor)
+    rd = normalize_date(receipt_date)
+    result: list[MatchCandidate] = []
+    for batch in _ranked_batches(overall, above_local):
+        for position in window[batch].tolist():
+            if len(result) >= MAX_RESULTS:
+                break
+            candidate = _build_candidate(
+                valid_df,
+                position,
+                receipt_vendor,
+                receipt_total,
+                rv,
+                rd,
+                prepared,
             )
-            continue
-
-    above_threshold = [
-        candidate for candidate in candidates if candidate.overall_confidence >= MIN_CONFIDENCE_THRESHOLD
-    ]
-    below_threshold = len(candidates) - len(above_threshold)
-    above_threshold.sort(key=lambda candidate: candidate.overall_confidence, reverse=True)
-    result = above_threshold[:MAX_RESULTS]
+            if candidate is not None:
+                result.append(candidate)
+        if len(result) >= MAX_RESULTS:
+            break
+    below_threshold = scored_count - len(above_local)
 
     top_conf = result[0].overall_confidence if result else 0.0
     logger.info(
         "matching_complete | candidates_scored=%s | above_threshold=%s | skipped_date=%s | filtered_below_threshold=%s | top_confidence=%.1f%% | receipt_vendor=%r",
-        len(candidates),
+        scored_count,
         len(result),
         skipped_date,
         below_threshold,
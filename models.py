@@ -27,9 +27,10 @@ Schema relationships:
 from __future__ import annotations
 
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class MismatchType(str, Enum):
@@ -65,6 +66,67 @@ class MismatchType(str, Enum):
     NO_MATCH = "no_match"
 
 
+# Display names for each archetype. Shared by Diagnosis.label_names and the
+# explanation layer so the mapping is built once, not per property access.
+LABEL_NAMES: dict[MismatchType, str] = {
+    MismatchType.VENDOR_MISMATCH: "Vendor Descriptor Mismatch",
+    MismatchType.SETTLEMENT_DELAY: "Settlement Delay",
+    MismatchType.TIP_TAX_VARIANCE: "Tip/Tax Variance",
+    MismatchType.PARTIAL_MATCH: "Partial Match",
+    MismatchType.NO_MATCH: "No Match Found",
+}
+
+
+@lru_cache(maxsize=128)
+def _label_display(labels: tuple[MismatchType, ...]) -> tuple[tuple[str, ...], str]:
+    """Display names and ' + ' summary for a label sequence, built once per sequence.
+
+    Keyed on the labels themselves rather than cached on the Diagnosis, so a
+    reassigned `labels` list can never serve a stale summary.
+    """
+    names = tuple(LABEL_NAMES.get(label, label.value) for label in labels)
+    return names, " + ".join(names) if names else "Clean Match"
+
+
+# Core wording of the low-extraction-confidence warning. diagnose.py and both
+# explain.py formatters extend this same sentence instead of rebuilding it.
+LOW_CONFIDENCE_WARNING_TEMPLATE = "Low extraction confidence ({confidence:.0%})"
+
+
+def _lazy_examples(build: Callable[[], list[dict]]) -> Callable[[dict], None]:
+    """json_schema_extra hook that builds a model's examples on schema generation.
+
+    The example payloads are only read by docs/OpenAPI export, so they are not
+    materialized at import time.
+    """
+
+    def add_examples(schema: dict) -> None:
+        schema["examples"] = build()
+
+    return add_examples
+
+
+def _receipt_data_examples() -> list[dict]:
+    """Schema examples for ReceiptData."""
+    return [
+        {
+            "vendor": "El Agave Mexican Restaurant",
+            "total": 47.50,
+            "date": "2026-01-12",
+            "tax": 3.50,
+            "tip": 7.00,
+            "subtotal": 37.00,
+            "currency": "USD",
+            "confidence": 0.95,
+            "chunk_ids": ["chunk_010", "chunk_011", "chunk_012"],
+            "raw_text": (
+                "El Agave Mexican Restaurant\n1847 Rossville Blvd\n"
+                "Subtotal: $37.00\nTax: $3.50\nTip: $7.00\nTotal: $47.50"
+            ),
+        }
+    ]
+
+
 class ReceiptData(BaseModel):
     """Validated output from ADE receipt extraction.
 
@@ -203,27 +265,20 @@ class ReceiptData(BaseModel):
         """Sum of tax and tip if known, for diagnosing amount variances."""
         return (self.tax or 0.0) + (self.tip or 0.0)
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "examples": [
-                {
-                    "vendor": "El Agave Mexican Restaurant",
-                    "total": 47.50,
-                    "date": "2026-01-12",
-                    "tax": 3.50,
-                    "tip": 7.00,
-                    "subtotal": 37.00,
-                    "currency": "USD",
-                    "confidence": 0.95,
-                    "chunk_ids": ["chunk_010", "chunk_011", "chunk_012"],
-                    "raw_text": (
-                        "El Agave Mexican Restaurant\n1847 Rossville Blvd\n"
-                        "Subtotal: $37.00\nTax: $3.50\nTip: $7.00\nTotal: $47.50"
-                    ),
-                }
-            ]
+    model_config = ConfigDict(json_schema_extra=_lazy_examples(_receipt_data_examples))
+
+
+def _transaction_examples() -> list[dict]:
+    """Schema examples for Transaction."""
+    return [
+        {
+            "merchant": "ELAGAVE*1847 CHATT TN",
+            "amount": 47.50,
+            "date": "2026-01-12",
+            "description": "Restaurant",
+            "transaction_id": "TXN002",
         }
-    )
+    ]
 
 
 class Transaction(BaseModel):
@@ -298,19 +353,32 @@ class Transaction(BaseModel):
         ),
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "examples": [
-                {
-                    "merchant": "ELAGAVE*1847 CHATT TN",
-                    "amount": 47.50,
-                    "date": "2026-01-12",
-                    "description": "Restaurant",
-                    "transaction_id": "TXN002",
-                }
-            ]
+    model_config = ConfigDict(json_schema_extra=_lazy_examples(_transaction_examples))
+
+
+def _match_candidate_examples() -> list[dict]:
+    """Schema examples for MatchCandidate."""
+    return [
+        {
+            "transaction": {
+                "merchant": "ELAGAVE*1847 CHATT TN",
+                "amount": 47.50,
+                "date": "2026-01-12",
+                "description": "Restaurant",
+                "transaction_id": "TXN002",
+            },
+            "vendor_score": 60.9,
+            "amount_diff": 0.0,
+            "amount_pct_diff": 0.0,
+            "date_diff": 0,
+            "overall_confidence": 84.3,
+            "evidence": [
+                "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
+                "Exact amount match: $47.50",
+                "Same date: 2026-01-12",
+            ],
         }
-    )
+    ]
 
 
 class MatchCandidate(BaseModel):
@@ -415,31 +483,58 @@ class MatchCandidate(BaseModel):
         ),
     )
 
-    model_config = ConfigDict(
-        json_schema_extra={
-            "examples": [
-                {
-                    "transaction": {
-                        "merchant": "ELAGAVE*1847 CHATT TN",
-                        "amount": 47.50,
-                        "date": "2026-01-12",
-                        "description": "Restaurant",
-                        "transaction_id": "TXN002",
-                    },
-                    "vendor_score": 60.9,
-                    "amount_diff": 0.0,
-                    "amount_pct_diff": 0.0,
-                    "date_diff": 0,
-                    "overall_confidence": 84.3,
-                    "evidence": [
-                        "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
-                        "Exact amount match: $47.50",
-                        "Same date: 2026-01-12",
-                    ],
-                }
-            ]
+    model_config = ConfigDict(json_schema_extra=_lazy_examples(_match_candidate_examples))
+
+    @field_validator("vendor_score", "amount_pct_diff", "overall_confidence")
+    @classmethod
+    def _quantize_score(cls, value: float) -> float:
+        """Round percentage-style scores to 1 decimal once, at construction."""
+        return round(value, 1)
+
+    @field_validator("amount_diff")
+    @classmethod
+    def _quantize_amount(cls, value: float) -> float:
+        """Round the dollar difference to cents once, at construction."""
+        return round(value, 2)
+
+
+def _diagnosis_examples() -> list[dict]:
+    """Schema examples for Diagnosis."""
+    return [
+        {
+            "labels": ["vendor_descriptor_mismatch"],
+            "confidence": 84.3,
+            "evidence": [
+                "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
+                "Exact amount match: $47.50",
+                "Same date: 2026-01-12",
+                "Vendor descriptor mismatch: score 60.9 below threshold 80",
+            ],
+            "top_match": {
+                "transaction": {
+                    "merchant": "ELAGAVE*1847 CHATT TN",
+                    "amount": 47.50,
+                    "date": "2026-01-12",
+                },
+                "vendor_score": 60.9,
+                "amount_diff": 0.0,
+                "amount_pct_diff": 0.0,
+                "date_diff": 0,
+                "overall_confidence": 84.3,
+                "evidence": [
+                    "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
+                    "Exact amount match: $47.50",
+                    "Same date: 2026-01-12",
+                ],
+            },
+            "receipt": {
+                "vendor": "El Agave Mexican Restaurant",
+                "total": 47.50,
+                "date": "2026-01-12",
+            },
+            "explanation": "",
         }
-    )
+    ]
 
 
 class Diagnosis(BaseModel):
@@ -551,80 +646,53 @@ class Diagnosis(BaseModel):
             "object is complete and ready for display."
         ),
     )
-
+    has_close_runner_up: bool = Field(
+        default=False,
+        description=(
+            "Whether a second candidate scored within 15 points of the top "
+            "match. Set by diagnose.py alongside the runner-up evidence note "
+            "so explain.py can show the multiple-candidates warning without "
+            "re-scanning the evidence text."
+        ),
+    )
     @property
     def is_match(self) -> bool:
         """Whether any match was found (vs NO_MATCH or no candidates)."""
-        return MismatchType.NO_MATCH not in self.labels and self.top_match is not None
+        return self.top_match is not None and MismatchType.NO_MATCH not in self.labels
 
     @property
     def is_clean_match(self) -> bool:
         """Whether this is a clean match with no mismatch labels."""
         return len(self.labels) == 0 and self.top_match is not None
 
+    @property
+    def low_confidence_warning(self) -> Optional[str]:
+        """Low-extraction-confidence warning text, or None when the receipt is fine."""
+        if self.receipt is None or not self.receipt.is_low_confidence:
+            return None
+        return LOW_CONFIDENCE_WARNING_TEMPLATE.format(confidence=self.receipt.confidence)
+
     @property
     def is_compound(self) -> bool:
         """Whether multiple mismatch types were detected simultaneously."""
         return len(self.labels) > 1
 
+    @property
+    def label_values(self) -> list[str]:
+        """Machine-readable label values (e.g. 'settlement_delay') for serialization."""
+        return [label.value for label in self.labels]
+
     @property
     def label_names(self) -> list[str]:
         """Human-readable label names for display."""
-        names = {
-            MismatchType.VENDOR_MISMATCH: "Vendor Descriptor Mismatch",
-            MismatchType.SETTLEMENT_DELAY: "Settlement Delay",
-            MismatchType.TIP_TAX_VARIANCE: "Tip/Tax Variance",
-            MismatchType.PARTIAL_MATCH: "Partial Match",
-            MismatchType.NO_MATCH: "No Match Found",
-        }
-        return [names.get(label, label.value) for label in self.labels]
+        return list(_label_display(tuple(self.labels))[0])
 
     @property
     def label_summary(self) -> str:
         """Single-line summary of all labels, joined with ' + '."""
-        if not self.labels:
-            return "Clean Match"
-        return " + ".join(self.label_names)
-
-    model_config = ConfigDict(
-        json_schema_extra={
-            "examples": [
-                {
-                    "labels": ["vendor_descriptor_mismatch"],
-                    "confidence": 84.3,
-                    "evidence": [
-                        "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
-                        "Exact amount match: $47.50",
-                        "Same date: 2026-01-12",
-                        "Vendor descriptor mismatch: score 60.9 below threshold 80",
-                    ],
-                    "top_match": {
-                        "transaction": {
-                            "merchant": "ELAGAVE*1847 CHATT TN",
-                            "amount": 47.50,
-                            "date": "2026-01-12",
-                        },
-                        "vendor_score": 60.9,
-                        "amount_diff": 0.0,
-                        "amount_pct_diff": 0.0,
-                        "date_diff": 0,
-                        "overall_confidence": 84.3,
-                        "evidence": [
-                            "Vendor names differ: 'el agave mexican' vs 'elagave' (score: 60.9)",
-                            "Exact amount match: $47.50",
-                            "Same date: 2026-01-12",
-                        ],
-                    },
-                    "receipt": {
-                        "vendor": "El Agave Mexican Restaurant",
-                        "total": 47.50,
-                        "date": "2026-01-12",
-                    },
-                    "explanation": "",
-                }
-            ]
-        }
-    )
+        return _label_display(tuple(self.labels))[1]
+
+    model_config = ConfigDict(json_schema_extra=_lazy_examples(_diagnosis_examples))
 
 
 if __name__ == "__main__":
@@ -721,6 +789,20 @@ if __name__ == "__main__":
     check("Evidence has 3 items", len(candidate.evidence) == 3)
     check("Nested transaction access", candidate.transaction.merchant == "ELAGAVE*1847 CHATT TN")
 
+    unrounded = MatchCandidate(
+        transaction=txn,
+        vendor_score=60.94,
+        amount_diff=2.504,
+        amount_pct_diff=5.27,
+        date_diff=1,
+        overall_confidence=84.26,
+    )
+    check(
+        "Scores quantized at construction",
+        (unrounded.vendor_score, unrounded.amount_diff, unrounded.amount_pct_diff, unrounded.overall_confidence)
+        == (60.9, 2.5, 5.3, 84.3),
+    )
+
     # -- Diagnosis (vendor mismatch) --
     print("\n  Diagnosis:")
     diag_vendor = Diagnosis(
@@ -751,6 +833,10 @@ if __name__ == "__main__":
     check("is_compound = True", diag_compound.is_compound is True)
     check("3 labels stored", len(diag_compound.labels) == 3)
     check("label_summary has +", "+" in diag_compound.label_summary)
+    check(
+        "label_values are enum values",
+        diag_compound.label_values == ["vendor_descriptor_mismatch", "settlement_delay", "tip_tax_variance"],
+    )
 
     # -- Diagnosis (no match) --
     diag_none = Diagnosis(
@@ -780,6 +866,18 @@ if __name__ == "__main__":
     dict_data = diag_vendor.model_dump()
     check("Dict conversion works", isinstance(dict_data, dict))
     check("Nested dict access", dict_data["top_match"]["transaction"]["merchant"] == "ELAGAVE*1847 CHATT TN")
+    check(
+        "JSON schema carries examples",
+        all(
+            len(model.model_json_schema()["examples"]) == 1
+            for model in (ReceiptData, Transaction, MatchCandidate, Diagnosis)
+        ),
+    )
+    check(
+        "Schema examples validate",
+        Diagnosis.model_validate(Diagnosis.model_json_schema()["examples"][0]).label_summary
+        == "Vendor Descriptor Mismatch",
+    )
 
     # -- Validation --
     print("\n  Validation:")
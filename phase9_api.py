@@ -32,7 +32,7 @@ from pydantic import ValidationError
 
 from diagnose import diagnose
 from explain import format_explanation_json
-from extract import extract_receipt
+from extract import extract_receipt, load_config
 from inbox import InboxScanner
 from logging_config import get_logger, setup_logging
 from main import load_transactions
@@ -40,6 +40,9 @@ from match import find_matches
 from models import ReceiptData
 from workspace_store import PostgresWorkspaceStore, WorkspaceState, WorkspaceStore
 
+# Load .env before the module-level settings below read the environment.
+load_config()
+
 logger = get_logger("phase9-api")
 
 app = FastAPI(
@@ -102,6 +105,7 @@ RECON_INBOX_PATH = os.getenv("RECON_INBOX_PATH", "./recon_inbox")
 INBOX_ARCHIVE_PATH = os.getenv("INBOX_ARCHIVE_PATH", "./recon_inbox/_processed")
 INBOX_MAX_FILES_PER_RUN = max(1, _env_int("INBOX_MAX_FILES_PER_RUN", 50))
 INBOX_POLL_ON_START = _env_bool("INBOX_POLL_ON_START", True)
+INBOX_DURABLE_MANIFEST = _env_bool("INBOX_DURABLE_MANIFEST", False)
 
 
 class ExceptionQueue:
@@ -371,6 +375,7 @@ inbox_scanner = InboxScanner(
     inbox_path=RECON_INBOX_PATH,
     archive_path=INBOX_ARCHIVE_PATH,
     max_files_per_run=INBOX_MAX_FILES_PER_RUN,
+    durable=INBOX_DURABLE_MANIFEST,
 )
 
 
@@ -652,12 +657,10 @@ def _generate_session_id() -> str:
     return f"sess_{secrets.token_hex(2)}"
 
 
-def _build_no_match_payload_from_row(row: pd.Series) -> dict[str, Any]:
+def _build_no_match_payload_from_row(merchant_value: Any, amount_raw: Any, date_value: Any) -> dict[str, Any]:
     """Build a deterministic NO_MATCH diagnosis payload for a transaction row."""
-    merchant = str(row.get("merchant", "") or "Unknown Merchant")
-    date_value = row.get("date")
+    merchant = str(merchant_value or "Unknown Merchant")
     date_str = str(date_value) if pd.notna(date_value) else None
-    amount_raw = row.get("amount")
     try:
         amount = float(amount_raw) if pd.notna(amount_raw) else 0.0
     except (TypeError, ValueError):
@@ -731,7 +734,15 @@ def _run_session_intake_from_dataframe(
     total_processed = 0
     exceptions_added = 0
 
-    for row_position, (idx, row) in enumerate(transactions_df.iterrows()):
+    # Plain column lists instead of iterrows(), which boxes every row into a Series.
+    row_count = len(transactions_df)
+    merchants, amounts, dates = (
+        transactions_df[column].tolist() if column in transactions_df.columns else [None] * row_count
+        for column in ("merchant", "amount", "date")
+    )
+    rows = zip(transactions_df.index.tolist(), merchants, amounts, dates)
+
+    for row_position, (idx, merchant_value, amount_raw, date_value) in enumerate(rows):
         total_processed += 1
         try:
             if row_position < len(receipt_paths):
@@ -742,7 +753,7 @@ def _run_session_intake_from_dataframe(
                     receipt_preview=_default_receipt_preview(),
                 )
             else:
-                payload = _build_no_match_payload_from_row(row)
+                payload = _build_no_match_payload_from_row(merchant_value, amount_raw, date_value)
         except Exception as exc:
             raise HTTPException(
                 status_code=400,
@@ -795,7 +806,7 @@ def _ingest_recon_inbox() -> dict[str, Any]:
             detail=f"Inbox batch CSV not found: {csv_path}",
         )
 
-    transactions_df = load_transactions(str(csv_path))
+    transactions_df = load_transactions(str(csv_path), use_cache=False)
     result = _run_session_intake_from_dataframe(
         transactions_df=transactions_df,
         receipt_paths=receipt_paths,
@@ -937,7 +948,7 @@ async def workbench_session_intake(
 
         try:
             await _save_upload(transactions_csv, csv_path)
-            transactions_df = load_transactions(str(csv_path))
+            transactions_df = load_transactions(str(csv_path), use_cache=False)
         except HTTPException:
             raise
         except Exception as exc:
@@ -1052,7 +1063,7 @@ async def diagnose_endpoint(
                 manual_total=manual_total,
             )
 
-            transactions_df = load_transactions(str(csv_path))
+            transactions_df = load_transactions(str(csv_path), use_cache=False)
             payload, matches = _run_pipeline_for_receipt(
                 receipt=prepared_receipt,
                 transactions_df=transactions_df,
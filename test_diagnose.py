@@ -22,10 +22,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import pandas as pd
 
-from diagnose import diagnose
-from extract import extract_receipt
+from diagnose import diagnose, diagnose_batch
+from extract import extract_receipt, reload_config
 from match import find_matches
-from models import MatchCandidate, MismatchType, ReceiptData, Transaction
+from models import Diagnosis, MatchCandidate, MismatchType, ReceiptData, Transaction
 
 
 def _configure_output_symbols() -> tuple[str, str, str]:
@@ -179,6 +179,30 @@ def main() -> None:
         and d_all_three.is_compound is True,
     )
 
+    # Category 2b: Batch diagnosis.
+    print("\n  Batch Diagnosis:")
+    batch_inputs = [
+        [make_candidate(vendor_score=55.0, amount_diff=0, amount_pct_diff=0, date_diff=0, overall_confidence=75.0)],
+        [make_candidate(vendor_score=59.0, amount_diff=4.36, amount_pct_diff=2.4, date_diff=2, overall_confidence=70.0)],
+        [make_candidate(vendor_score=100.0, amount_diff=0, amount_pct_diff=0, date_diff=0, overall_confidence=92.0)],
+        [],
+    ]
+    batch_receipts = [None, ReceiptData(vendor="Fast3nal", total=178.23, confidence=0.65), None, None]
+    batch_results = diagnose_batch(batch_inputs, batch_receipts)
+    check(
+        "diagnose_batch matches per-receipt diagnose",
+        len(batch_results) == 4
+        and all(
+            batch.model_dump() == diagnose(matches, receipt).model_dump()
+            for batch, matches, receipt in zip(batch_results, batch_inputs, batch_receipts)
+        ),
+    )
+    try:
+        diagnose_batch(batch_inputs, batch_receipts[:1])
+        check("diagnose_batch rejects mismatched receipts length", False)
+    except ValueError:
+        check("diagnose_batch rejects mismatched receipts length", True)
+
     # Category 3: Threshold boundaries.
     print("\n  Threshold Boundaries:")
     check(
@@ -254,6 +278,24 @@ def main() -> None:
         d_vendor_delay.is_compound is True and "+" in d_vendor_delay.label_summary,
     )
     check("label_summary correct", diagnose([]).label_summary == "No Match Found")
+    d_relabel = diagnose([])
+    first_summary = d_relabel.label_summary
+    d_relabel.labels = [MismatchType.VENDOR_MISMATCH]
+    check(
+        "label_summary follows reassigned labels",
+        first_summary == "No Match Found"
+        and d_relabel.label_summary == "Vendor Descriptor Mismatch"
+        and d_relabel.label_names == ["Vendor Descriptor Mismatch"],
+    )
+    diag_close = diagnose(
+        [make_candidate(overall_confidence=85.0), make_candidate(merchant="Runner Up", overall_confidence=80.0)]
+    )
+    check(
+        "has_close_runner_up set with runner-up note",
+        diag_close.has_close_runner_up is True
+        and any("second candidate" in e.lower() for e in diag_close.evidence)
+        and diag_clean.has_close_runner_up is False,
+    )
 
     # Category 6: Receipt context.
     print("\n  Receipt Context:")
@@ -266,6 +308,18 @@ def main() -> None:
         "Low confidence warning present",
         any(("confidence" in e.lower()) or ("⚠" in e) for e in diag_low.evidence),
     )
+    check(
+        "Low confidence warning derived on Diagnosis",
+        diag_low.low_confidence_warning == "Low extraction confidence (65%)"
+        and any(diag_low.low_confidence_warning in e for e in diag_low.evidence)
+        and diag_clean.low_confidence_warning is None,
+    )
+    check(
+        "Low confidence warning follows the receipt and is not serialized",
+        diag_low.model_copy(update={"receipt": None}).low_confidence_warning is None
+        and "low_confidence_warning" not in diag_low.model_dump()
+        and "low_confidence_warning" not in Diagnosis.model_json_schema()["properties"],
+    )
 
     receipt_tip = ReceiptData(vendor="El Agave", total=47.50, tip=7.00, tax=3.50)
     diag_tip_ctx = diagnose(
@@ -285,6 +339,7 @@ def main() -> None:
     df = pd.read_csv(csv_path)
 
     original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     try:
         r01 = extract_receipt(str(base_dir / "test_data" / "receipts" / "receipt_01_clean_match.png"))
         d01 = diagnose(find_matches(r01, df), r01)
@@ -315,6 +370,7 @@ def main() -> None:
     finally:
         if original_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
@@ -24,7 +24,7 @@ import pandas as pd
 
 from diagnose import diagnose
 from explain import format_explanation, format_explanation_json
-from extract import extract_receipt
+from extract import extract_receipt, reload_config
 from match import find_matches
 from models import Diagnosis, MatchCandidate, MismatchType, ReceiptData, Transaction
 
@@ -311,6 +311,11 @@ def main() -> None:
         "84%" in format_explanation(make_diagnosis(confidence=84.3))
         and "84.3%" not in format_explanation(make_diagnosis(confidence=84.3)),
     )
+    check(
+        "Runner-up warning follows has_close_runner_up flag",
+        "Multiple close candidates" in format_explanation(vendor_diag.model_copy(update={"has_close_runner_up": True}))
+        and "Multiple close candidates" not in format_explanation(vendor_diag),
+    )
     check(
         "Edge case: no receipt data handled",
         "(no receipt data available)"
@@ -378,6 +383,17 @@ def main() -> None:
     check("Warnings populated for low confidence", len(nested_warn["warnings"]) >= 1 and any("confidence" in w.lower() for w in nested_warn["warnings"]))
     nested_ok_warn = format_explanation_json(make_diagnosis(receipt_confidence=0.95))
     check("Warnings empty for normal confidence", nested_ok_warn["warnings"] == [])
+    copy_diag = make_diagnosis(has_receipt=True, has_match=True)
+    copy_payload = format_explanation_json(copy_diag)
+    copy_payload["evidence"].append("extra")
+    copy_payload["receipt"]["chunk_ids"].append("extra")
+    copy_payload["top_match"]["evidence"].append("extra")
+    check(
+        "Payload lists do not alias the Diagnosis",
+        "extra" not in copy_diag.evidence
+        and "extra" not in copy_diag.receipt.chunk_ids
+        and "extra" not in copy_diag.top_match.evidence,
+    )
     check(
         "Labels are enum values (strings)",
         isinstance(status_compound["diagnosis"]["labels"], list)
@@ -398,6 +414,7 @@ def main() -> None:
     ]
 
     original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     try:
         for path_str, display_name in integration_receipts:
             receipt = extract_receipt(str(base_dir / path_str))
@@ -416,6 +433,7 @@ def main() -> None:
     finally:
         if original_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
@@ -11,14 +11,19 @@ Requires: No API key needed (uses mock extraction).
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 import sys
+import tempfile
+from pathlib import Path
 from typing import Any
 
 # Ensure we can import from project root
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from extract import _extract_mock, extract_receipt
+import extract
+from extract import _extract_mock, extract_receipt, reload_config
 from models import ReceiptData
 
 
@@ -46,11 +51,13 @@ def main() -> None:
 
     def call_router_without_api_key(path: str) -> ReceiptData:
         original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+        reload_config()
         try:
             return extract_receipt(path)
         finally:
             if original_key is not None:
                 os.environ["VISION_AGENT_API_KEY"] = original_key
+            reload_config()
 
     print("══════════════════════════════════════════")
     print("  Phase 2: Extraction Module Tests")
@@ -158,6 +165,11 @@ def main() -> None:
             and receipt.date == "2026-01-12",
         )
 
+    check(
+        "Several keys: earliest registry key wins, not the longest",
+        _extract_mock("receipt_01_vendor_mismatch.png").vendor == "Amazon.com",
+    )
+
     # Category 3: Mock Extraction - Unknown Filename
     print("\n  Mock Extraction — Unknown Filename:")
     unknown = _extract_mock("random_unknown_file.png")
@@ -210,7 +222,144 @@ def main() -> None:
     check("partial grounding count is 1 (receipt_05)", len(r05.chunk_ids) == 1)
     check("has_tip false (receipt_06)", r06.has_tip is False)
 
-    # Category 7: Serialization
+    # Category 7: Batch Extraction
+    print("\n  Batch Extraction:")
+    original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
+    try:
+        batch = asyncio.run(
+            extract.extract_receipts_async(
+                [
+                    "test_data/receipts/receipt_02_vendor_mismatch.png",
+                    "nonexistent_receipt.png",
+                    "test_data/receipts/receipt_05_combined_mismatch.png",
+                ]
+            )
+        )
+        streamed = list(
+            extract.iter_extract_receipts(
+                [
+                    "test_data/receipts/receipt_02_vendor_mismatch.png",
+                    "nonexistent_receipt.png",
+                    "test_data/receipts/receipt_05_combined_mismatch.png",
+                ]
+            )
+        )
+    finally:
+        if original_key is not None:
+            os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
+    check(
+        "Batch results keep input order",
+        isinstance(batch[0], ReceiptData)
+        and batch[0].vendor == "El Agave Mexican Restaurant"
+        and isinstance(batch[2], ReceiptData)
+        and batch[2].vendor == "Fastenal",
+    )
+    check("Batch returns errors in place", isinstance(batch[1], FileNotFoundError))
+    check(
+        "Streamed batch matches the async batch",
+        len(streamed) == 3
+        and streamed[0] == batch[0]
+        and isinstance(streamed[1], FileNotFoundError)
+        and streamed[2] == batch[2],
+    )
+
+    # Category 8: ADE Result Cache
+    print("\n  ADE Result Cache:")
+    original_cache_dir = extract.ADE_CACHE_DIR
+    with tempfile.TemporaryDirectory() as cache_dir:
+        extract.ADE_CACHE_DIR = cache_dir
+        try:
+            receipt_path = Path("test_data/receipts/receipt_02_vendor_mismatch.png").resolve()
+            key = extract._ade_cache_key(receipt_path)
+            check("Cache key is stable for same content", key is not None and key == extract._ade_cache_key(receipt_path))
+            check(
+                "file_sha256 matches hashlib on the whole file",
+                extract.file_sha256(receipt_path) == hashlib.sha256(receipt_path.read_bytes()).hexdigest(),
+            )
+            check("Cache miss before store", extract._load_cached_extraction(key) is None)
+            extract._store_cached_extraction(key, r02)
+            cached = extract._load_cached_extraction(key)
+            check("Cache roundtrip preserves receipt", cached is not None and cached.model_dump() == r02.model_dump())
+            original_orjson = extract.orjson
+            extract.orjson = None
+            try:
+                stdlib_schema_json = extract._json_dumps(dict(extract._RECEIPT_SCHEMA))
+            finally:
+                extract.orjson = original_orjson
+            check(
+                "Schema JSON is the same with or without orjson",
+                stdlib_schema_json == extract._json_dumps(dict(extract._RECEIPT_SCHEMA)),
+            )
+        finally:
+            extract.ADE_CACHE_DIR = original_cache_dir
+
+    original_env_cache_dir = os.environ.get("ADE_CACHE_DIR")
+    with tempfile.TemporaryDirectory() as env_cache_dir:
+        os.environ["ADE_CACHE_DIR"] = env_cache_dir
+        reload_config()
+        try:
+            check(
+                "ADE_CACHE_DIR set after import is honored",
+                extract.ADE_CACHE_DIR is None and extract._ade_cache_dir() == env_cache_dir,
+            )
+        finally:
+            if original_env_cache_dir is None:
+                os.environ.pop("ADE_CACHE_DIR", None)
+            else:
+                os.environ["ADE_CACHE_DIR"] = original_env_cache_dir
+            reload_config()
+
+    # Category 9: In-Memory Result Cache
+    print("\n  In-Memory Result Cache:")
+    first = call_router_without_api_key("test_data/receipts/receipt_03_tip_tax_variance.png")
+    second = call_router_without_api_key("test_data/receipts/receipt_03_tip_tax_variance.png")
+    check("Repeated extraction returns same data", first.model_dump() == second.model_dump())
+    check("Cached result is a fresh copy", first is not second and first.chunk_ids is not second.chunk_ids)
+    check("Missing file bypasses the cache", extract._memory_cache_key("nonexistent_receipt.png") is None)
+
+    worker_calls: list[str] = []
+    original_worker = extract._extract_receipt
+
+    def counting_worker(image_path: str, prefetched: Any = None) -> ReceiptData:
+        worker_calls.append(image_path)
+        return original_worker(image_path, prefetched)
+
+    original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
+    extract._extract_receipt = counting_worker
+    try:
+        extract._MEMORY_CACHE.clear()
+        repeated = "test_data/receipts/receipt_03_tip_tax_variance.png"
+        streamed = list(extract.iter_extract_receipts([repeated, repeated]))
+        calls_after_first_batch = len(worker_calls)
+        again = list(extract.iter_extract_receipts([repeated]))
+    finally:
+        extract._extract_receipt = original_worker
+        if original_key is not None:
+            os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
+    check("Batch path fills the memory cache", 1 <= calls_after_first_batch <= 2)
+    check(
+        "Repeated path in iter_extract_receipts is served from memory",
+        len(worker_calls) == calls_after_first_batch
+        and again[0].model_dump() == streamed[0].model_dump()
+        and again[0] is not streamed[0],
+    )
+
+    # Category 10: Tiered Extraction
+    print("\n  Tiered Extraction:")
+    cheap = extract._parse_cheap_text(
+        ["ACE HARDWARE #123", "01/15/2026", "Subtotal 40.00", "Tax 3.20", "TOTAL $43.20"],
+        0.93,
+    )
+    check("Cheap parser takes first text line as vendor", cheap.vendor == "ACE HARDWARE #123")
+    check("Cheap parser takes labelled total, not subtotal", nearly_equal(cheap.total, 43.20))
+    check("Cheap parser finds date", cheap.date == "01/15/2026")
+    check("Cheap parser without total returns 0", extract._parse_cheap_text(["Shop"], 0.95).total == 0.0)
+
+    # Category 11: Serialization
     print("\n  Serialization:")
     receipt = call_router_without_api_key("test_data/receipts/receipt_02_vendor_mismatch.png")
     json_str = receipt.model_dump_json()
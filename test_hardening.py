@@ -27,7 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from diagnose import _calibrate_confidence, diagnose
 from explain import format_explanation, format_explanation_json
-from extract import extract_receipt
+from extract import extract_receipt, reload_config
 from grounding import GroundingInfo, extract_grounding, grounding_coverage, has_grounding
 from logging_config import get_logger, setup_logging
 from match import find_matches, score_amount, score_date, score_vendor
@@ -74,6 +74,7 @@ def main() -> None:
     edge_csv = base_dir / "test_data" / "transactions_edge_cases.csv"
 
     original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     try:
         # ----------------------------------------------------------
         # Category 1: Input validation - None and empty inputs
@@ -227,6 +228,13 @@ def main() -> None:
                 break
         check("GroundingInfo serializes to JSON", serializable)
 
+        r02_edited = r02.model_copy(update={"vendor": "Edited Vendor"})
+        check(
+            "extract_grounding reflects edited receipt fields",
+            [item.value for item in extract_grounding(r02_edited)][0] == "Edited Vendor"
+            and [item.value for item in extract_grounding(r02)][0] == r02.vendor,
+        )
+
         check("Blurry receipt has no grounding", has_grounding(r08) is False)
         check("Blurry receipt coverage is 0.0", grounding_coverage(r08) == 0.0)
 
@@ -330,6 +338,7 @@ def main() -> None:
     finally:
         if original_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
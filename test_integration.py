@@ -19,9 +19,15 @@ from pathlib import Path
 # Ensure local imports resolve from project root.
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Never write the persistent caches into the real home directory from tests.
+os.environ["RECON_CACHE_DISABLE"] = "1"
+
+import pandas as pd
+
 from diagnose import diagnose
 from explain import format_explanation, format_explanation_json
-from extract import extract_receipt
+from extract import extract_receipt, reload_config
+import main as main_module
 from main import load_transactions
 from match import find_matches
 from models import MismatchType
@@ -76,6 +82,7 @@ def main() -> None:
     csv_path = str(base_dir / "test_data" / "transactions.csv")
 
     original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     try:
         df = load_transactions(csv_path)
 
@@ -224,6 +231,88 @@ def main() -> None:
                 os.unlink(temp_path)
         check("Wrong columns raises ValueError", bad_csv_ok)
 
+        check(
+            "CSV cache is off unless a directory is configured",
+            "TRANSACTIONS_CACHE_DIR" in os.environ or main_module._transactions_cache_enabled() is False,
+        )
+        original_cache_dir = main_module.TRANSACTIONS_CACHE_DIR
+        original_max_entries = main_module.TRANSACTIONS_CACHE_MAX_ENTRIES
+        with tempfile.TemporaryDirectory() as cache_dir:
+            main_module.TRANSACTIONS_CACHE_DIR = cache_dir
+            os.environ.pop("RECON_CACHE_DISABLE", None)
+            reload_config()
+            try:
+                first_load = load_transactions(csv_path)
+                cached_files = list(Path(cache_dir).glob("*.pkl"))
+                second_load = load_transactions(csv_path)
+                check(
+                    "Merchant column loads as a categorical",
+                    isinstance(first_load["merchant"].dtype, pd.CategoricalDtype),
+                )
+                check(
+                    "CSV cache stores one entry and replays it",
+                    len(cached_files) == 1
+                    and second_load.equals(first_load)
+                    and second_load.attrs.get("normalized") is True,
+                )
+
+                for entry in cached_files:
+                    entry.unlink()
+                load_transactions(csv_path, use_cache=False)
+                check("use_cache=False leaves the CSV cache untouched", not list(Path(cache_dir).glob("*.pkl")))
+
+                stale_entry = Path(cache_dir) / f"v0-pandas0.0-{'a' * 64}.pkl"
+                stale_entry.write_bytes(b"")
+                unrelated_file = Path(cache_dir) / "notes.pkl"
+                unrelated_file.write_bytes(b"")
+                main_module.TRANSACTIONS_CACHE_MAX_ENTRIES = 1
+                with tempfile.TemporaryDirectory() as csv_dir:
+                    other_csv = Path(csv_dir) / "other.csv"
+                    other_csv.write_text(Path(csv_path).read_text(encoding="utf-8") + "\n", encoding="utf-8")
+                    load_transactions(csv_path)
+                    load_transactions(str(other_csv))
+                kept = sorted(entry.name for entry in Path(cache_dir).glob("*.pkl"))
+                check(
+                    "CSV cache prunes old versions and caps its entries",
+                    len(kept) == 2
+                    and "notes.pkl" in kept
+                    and not stale_entry.exists()
+                    and any(name.startswith(main_module._transactions_cache_prefix()) for name in kept),
+                )
+
+                os.environ["RECON_CACHE_DISABLE"] = "1"
+                reload_config()
+                check("RECON_CACHE_DISABLE bypasses the CSV cache", main_module._transactions_cache_enabled() is False)
+            finally:
+                os.environ["RECON_CACHE_DISABLE"] = "1"
+                reload_config()
+                main_module.TRANSACTIONS_CACHE_DIR = original_cache_dir
+                main_module.TRANSACTIONS_CACHE_MAX_ENTRIES = original_max_entries
+
+        import extract as extract_module
+
+        check(
+            "ADE cache is off unless a directory is configured",
+            "ADE_CACHE_DIR" in os.environ or extract_module._ade_cache_dir() == "",
+        )
+        original_ade_dir = extract_module.ADE_CACHE_DIR
+        with tempfile.TemporaryDirectory() as cache_root:
+            os.environ.pop("RECON_CACHE_DISABLE", None)
+            reload_config()
+            try:
+                main_module.use_cache_dir(cache_root)
+                load_transactions(csv_path)
+                check(
+                    "--cache-dir roots the ADE and CSV caches",
+                    extract_module.ADE_CACHE_DIR == str(Path(cache_root) / "ade")
+                    and len(list((Path(cache_root) / "transactions").glob("*.pkl"))) == 1,
+                )
+            finally:
+                os.environ["RECON_CACHE_DISABLE"] = "1"
+                reload_config()
+                main_module.TRANSACTIONS_CACHE_DIR = original_cache_dir
+                extract_module.ADE_CACHE_DIR = original_ade_dir
+
         # Category 8: JSON completeness for all receipts.
         print("\n  JSON Completeness:")
         receipt_files = [
@@ -271,6 +360,7 @@ def main() -> None:
     finally:
         if original_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
@@ -22,7 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import pandas as pd
 
-from match import find_matches, score_amount, score_date, score_vendor
+from match import _vendor_score_array, find_matches, prepare_transactions_df, score_amount, score_date, score_vendor
 from models import ReceiptData
 from normalize import normalize_vendor
 
@@ -237,6 +237,68 @@ def main() -> None:
     matches_no_date = find_matches(r_no_date, df)
     check("No-date receipt still produces candidates", len(matches_no_date) > 0)
 
+    tie_df = pd.DataFrame(
+        {
+            "merchant": ["Starbucks"] * 5,
+            "amount": [5.25] * 5,
+            "date": ["2026-01-15"] * 5,
+            "transaction_id": ["T1", "T2", "T3", "T4", "T5"],
+        }
+    )
+    tie_matches = find_matches(
+        ReceiptData(vendor="Starbucks", total=5.25, date="2026-01-15"), tie_df
+    )
+    check(
+        "Tied candidates keep CSV order and cap at 3",
+        [c.transaction.transaction_id for c in tie_matches] == ["T1", "T2", "T3"],
+    )
+
+    prepared_df = prepare_transactions_df(df.copy())
+    check(
+        "Prepared DataFrame flags itself as normalized",
+        prepared_df.attrs.get("normalized") is True and "_merchant_norm" in prepared_df.columns,
+    )
+    check(
+        "Prepared DataFrame yields identical matches",
+        all(
+            [m.model_dump() for m in find_matches(r, prepared_df)]
+            == [m.model_dump() for m in find_matches(r, df)]
+            for r in (r01, r02, r03, r04, r05, r_no_date)
+        ),
+    )
+    check(
+        "Prepared DataFrames can still be concatenated",
+        len(pd.concat([prepared_df, prepared_df])) == 2 * len(prepared_df),
+    )
+    date_order = prepared_df.attrs["date_order"]
+    copied_df = prepared_df.copy(deep=True)
+    check(
+        "Derived columns and copies share the date index",
+        prepared_df["amount"].attrs["date_order"] is date_order
+        and copied_df.attrs["date_order"] is date_order
+        and [m.model_dump() for m in find_matches(r01, copied_df)]
+        == [m.model_dump() for m in find_matches(r01, prepared_df)],
+    )
+    edited_df = prepare_transactions_df(df.copy())
+    edited_df.loc[0, ["merchant", "amount", "date"]] = ["Home Depot", 12.0, "2026-02-20"]
+    raw_edited_df = df.copy()
+    raw_edited_df.loc[0, ["merchant", "amount", "date"]] = ["Home Depot", 12.0, "2026-02-20"]
+    prepare_transactions_df(edited_df)
+    check(
+        "Re-preparing an edited frame refreshes its normalized columns",
+        edited_df.at[0, "_merchant_norm"] == normalize_vendor("Home Depot")
+        and [m.model_dump() for m in find_matches(r01, edited_df)]
+        == [m.model_dump() for m in find_matches(r01, raw_edited_df)],
+    )
+    repeated_merchants = ["Starbucks", "AMZN Mktp US", "Starbucks", "", "AMZN Mktp US"]
+    repeated_norm = [normalize_vendor(name) for name in repeated_merchants]
+    dedup_scores = _vendor_score_array("Starbucks Coffee", pd.Categorical(repeated_norm))
+    check(
+        "Vendor scores for repeated merchants match the scalar scorer",
+        dedup_scores.tolist() == [score_vendor("Starbucks Coffee", name)[0] for name in repeated_merchants]
+        and dedup_scores.tolist() == _vendor_score_array("Starbucks Coffee", repeated_norm).tolist(),
+    )
+
     sorted_ok = True
     for grouped in [matches_01, matches_02, matches_03, matches_04, matches_05]:
         for i in range(len(grouped) - 1):
@@ -15,6 +15,10 @@ from fastapi.testclient import TestClient
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Never write the persistent caches into the real home directory from tests.
+os.environ["RECON_CACHE_DISABLE"] = "1"
+
+from extract import reload_config
 from phase9_api import app, exception_queue
 
 
@@ -57,6 +61,7 @@ def main() -> None:
     csv_path = base_dir / "test_data" / "transactions.csv"
 
     original_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     exception_queue.clear()
 
     try:
@@ -104,6 +109,7 @@ def main() -> None:
     finally:
         if original_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = original_key
+        reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
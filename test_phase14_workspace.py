@@ -16,6 +16,9 @@ from fastapi.testclient import TestClient
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Never write the persistent caches into the real home directory from tests.
+os.environ["RECON_CACHE_DISABLE"] = "1"
+
 import phase9_api
 from workspace_store import WorkspaceState, WorkspaceStore
 
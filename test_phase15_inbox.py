@@ -17,6 +17,10 @@ from fastapi.testclient import TestClient
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Never write the persistent caches into the real home directory from tests.
+os.environ["RECON_CACHE_DISABLE"] = "1"
+
+from extract import reload_config
 import phase9_api
 from inbox import InboxScanner
 from workspace_store import WorkspaceStore
@@ -139,6 +143,27 @@ def main() -> None:
         )
         check("receipt paths discovered", len(mixed_batch.get("receipt_paths") or []) >= 1)
 
+    print("\n  Processed Manifest:")
+    with tempfile.TemporaryDirectory(prefix="phase15-manifest-") as tmp:
+        root = Path(tmp)
+        inbox_path = root / "recon_inbox"
+        archive_path = inbox_path / "_processed"
+        scanner = InboxScanner(str(inbox_path), str(archive_path), max_files_per_run=50)
+
+        _copy_file(source_csv, inbox_path / "first.csv")
+        scanner.archive_processed_batch(scanner.scan_batch()["batch"])
+        _copy_file(source_csv, inbox_path / "second.csv")
+        scanner.archive_processed_batch(scanner.scan_batch()["batch"])
+        check("later archives append to manifest log", scanner.manifest_log_path.exists())
+        check("manifest replays snapshot + log", len(scanner.load_manifest()["processed"]) == 2)
+
+        with scanner.manifest_log_path.open("ab") as log_file:
+            log_file.write(b'{"signature": {"na')
+        _copy_file(source_csv, inbox_path / "third.csv")
+        scanner.archive_processed_batch(scanner.scan_batch()["batch"])
+        check("torn log line skipped without losing later entries", len(scanner.load_manifest()["processed"]) == 3)
+        check("processed files not rescanned", scanner.scan_batch().get("status") == "NO_BATCH")
+
     print("\n  Endpoint Integration:")
     with tempfile.TemporaryDirectory(prefix="phase15-intake-csv-only-") as tmp:
         root = Path(tmp)
@@ -170,6 +195,7 @@ def main() -> None:
 
         original_poll = phase9_api.INBOX_POLL_ON_START
         original_vision_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+        reload_config()
         phase9_api.INBOX_POLL_ON_START = False
         try:
             client = TestClient(phase9_api.app)
@@ -209,6 +235,7 @@ def main() -> None:
             phase9_api.INBOX_POLL_ON_START = original_poll
             if original_vision_key is not None:
                 os.environ["VISION_AGENT_API_KEY"] = original_vision_key
+            reload_config()
 
     print(f"\n{LINE * 62}")
     print(f"  Results: {passed}/{passed + failed} passed")
@@ -20,6 +20,10 @@ from fastapi.testclient import TestClient
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Never write the persistent caches into the real home directory from tests.
+os.environ["RECON_CACHE_DISABLE"] = "1"
+
+from extract import reload_config
 from phase9_api import _scale_bbox_for_display, app
 
 
@@ -96,6 +100,7 @@ def main() -> None:
     # --------------------------------------------------------------
     print("\n  API Grounding Payload:")
     previous_key = os.environ.pop("VISION_AGENT_API_KEY", None)
+    reload_config()
     try:
         client = TestClient(app)
         receipt_path = base_dir / "test_data" / "receipts" / "receipt_02_vendor_mismatch.png"
@@ -129,6 +134,7 @@ def main() -> None:
     finally:
         if previous_key is not None:
             os.environ["VISION_AGENT_API_KEY"] = previous_key
+        reload_config()
 
     # --------------------------------------------------------------
     # Category 3: UI containers/toggles for grounding viewer